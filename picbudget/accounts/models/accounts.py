@@ -24,6 +24,7 @@ class User(AbstractBaseUser):
     gender = models.CharField(max_length=10, choices=GENDER_CHOICES, default="other")
     age = models.PositiveIntegerField(blank=True, null=True)
     photo_url = models.ImageField(upload_to="profile", blank=True, null=True)
+    photo_variants = models.JSONField(default=dict, blank=True)
     email = models.EmailField(max_length=255, unique=True)
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     status = models.CharField(max_length=10, choices=USER_STATUS, default="unverified")
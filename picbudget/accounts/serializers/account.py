@@ -1,11 +1,16 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 import os
+from picbudget.core.utils.images import variant_paths, variant_urls
+from picbudget.core.utils.misc import apply_on_commit
+from picbudget.project.task import process_profile_photo
 
 User = get_user_model()
 
 
 class UserSerializer(serializers.ModelSerializer):
+    photo_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = User
         fields = [
@@ -16,6 +21,7 @@ class UserSerializer(serializers.ModelSerializer):
             "age",
             "phone_number",
             "photo_url",
+            "photo_variants",
         ]
         extra_kwargs = {
             "password": {"write_only": True},
@@ -31,13 +37,26 @@ class UserSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
+        stale_paths = []
         if photo_url:
-            if instance.photo_url and os.path.isfile(instance.photo_url.path):
-                os.remove(instance.photo_url.path)
+            # The old files are removed by the photo task, off the request.
+            if instance.photo_url:
+                stale_paths.append(instance.photo_url.name)
+            stale_paths.extend(variant_paths(instance.photo_variants))
 
             ext = os.path.splitext(photo_url.name)[1]
             new_filename = f"{instance.id}{ext}"
             instance.photo_url.save(new_filename, photo_url, save=False)
+            instance.photo_variants = {}
 
         instance.save()
+
+        if photo_url:
+            stale_paths = [path for path in stale_paths if path != instance.photo_url.name]
+            apply_on_commit(
+                lambda: process_profile_photo.delay(str(instance.id), stale_paths)
+            )
         return instance
+
+    def get_photo_variants(self, obj):
+        return variant_urls(obj.photo_variants, self.context.get("request"))
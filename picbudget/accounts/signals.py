@@ -1,9 +1,10 @@
 # accounts/signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from .models import User
+from picbudget.authentication.backends.jwt import invalidate_cached_user
 from picbudget.wallets.models import Wallet
-from picbudget.authentication.serializers.otp import OTPSerializer
 
 
 @receiver(post_save, sender=User)
@@ -11,19 +12,23 @@ def create_wallet_for_user(sender, instance, created, **kwargs):
     """
     Creates a wallet for a new user when the user is created.
     This does not create a wallet for admin or superuser.
+
+    A brand-new user has no wallets yet, so the default name cannot clash and
+    ``bulk_create`` skips ``Wallet.save``'s uniqueness lookup.
+    OTP creation and the verification email are handled by
+    ``picbudget.accounts.utils.onboarding`` instead of a signal.
     """
     if created and not instance.is_admin:
-        Wallet.objects.create(user=instance)
+        Wallet.objects.bulk_create([Wallet(user=instance)])
 
 
-# create OTP for user
 @receiver(post_save, sender=User)
-def create_otp_for_user(sender, instance, created, **kwargs):
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user(sender, instance, **kwargs):
     """
-    Creates an OTP for a new user when the user is created.
-    This does not create an OTP for admin or superuser.
+    Drop the user from the JWT authentication cache after any change, once it
+    is committed: dropped earlier, a concurrent request could cache the old row
+    again for the whole timeout.
     """
-    if created and not instance.is_admin:
-        serializer = OTPSerializer(data={"email": instance.email})
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from picbudget.authentication.backends.otp import get_otp_backend
+from picbudget.authentication.serializers.otp import send_otp_email
+
+User = get_user_model()
+
+
+def onboard_user(email, password, user=None):
+    """
+    Register ``email`` (or refresh an unverified account) and send its OTP.
+
+    The user row, its default wallet (``post_save`` signal) and the OTP are
+    written in one short transaction. The OTP email is not stored: a
+    ``send_secret_email`` task is only queued once that transaction commits,
+    so SMTP stays off the request's critical section and no email goes out
+    for a rolled-back signup.
+    """
+    with transaction.atomic():
+        if user is None:
+            user = User(email=email)
+        user.set_password(password)
+        user.status = "unverified"
+        user.save()
+        otp_code = get_otp_backend().generate(user)
+        send_otp_email(user.email, otp_code)
+
+    return user
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import OTP
+from .models import OTP, OutgoingEmail
 
 
 class OTPAdmin(admin.ModelAdmin):
@@ -15,3 +15,15 @@ class OTPAdmin(admin.ModelAdmin):
 
 
 admin.site.register(OTP, OTPAdmin)
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ["subject", "status", "attempts", "next_attempt_at", "sent_at"]
+    list_filter = ["status"]
+    search_fields = ["idempotency_key", "subject"]
+
+    class Meta:
+        model = OutgoingEmail
+
+
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+User = get_user_model()
+
+# The password hash is never cached, it is loaded like any deferred field.
+CACHED_USER_FIELDS = tuple(
+    field.attname
+    for field in User._meta.concrete_fields
+    if field.attname != "password"
+)
+
+
+def get_user_cache_key(user_id):
+    return f"jwt-user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    caches[settings.JWT_USER_CACHE_ALIAS].delete(get_user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that resolves the token's user from the cache.
+
+    The user's columns (minus the password) are cached for
+    ``JWT_USER_CACHE_TIMEOUT`` seconds and rebuilt with ``User.from_db``, so
+    ``request.user`` is a regular saved ``User`` and authenticated requests do
+    not query the user table. ``post_save``/``post_delete`` on ``User`` drop the
+    entry, so with a shared cache (Redis) deactivation and status changes apply
+    at once; the TTL bounds staleness for queryset ``update()`` calls that
+    bypass signals. A per-process cache such as LocMem is only invalidated in
+    the process that saved the user, so others serve the old entry until the
+    TTL runs out; the cache is therefore off by default without Redis.
+    A timeout of 0 disables the cache.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = caches[settings.JWT_USER_CACHE_ALIAS]
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def get_user_queryset(self, user_id):
+        return User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(
+            *CACHED_USER_FIELDS
+        )
+
+    @staticmethod
+    def build_user(values):
+        if values is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        user = User.from_db(router.db_for_read(User), CACHED_USER_FIELDS, values)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def get_user(self, validated_token):
+        timeout = settings.JWT_USER_CACHE_TIMEOUT
+        if not timeout:
+            return super().get_user(validated_token)
+
+        user_id = self.get_user_id(validated_token)
+        key = get_user_cache_key(user_id)
+        values = self.cache.get(key)
+        if values is None:
+            values = self.get_user_queryset(user_id).first()
+            if values is not None:
+                self.cache.set(key, values, timeout)
+
+        user = self.build_user(values)
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Loads the deferred password, as the parent class would.
+            self.check_revoked(user, validated_token)
+        return user
+
+    @staticmethod
+    def check_revoked(user, validated_token):
+        if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(
+            user.password
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+    async def aget_user(self, validated_token):
+        """Async variant of ``get_user`` for ``AsyncAPIView``."""
+        timeout = settings.JWT_USER_CACHE_TIMEOUT
+        user_id = self.get_user_id(validated_token)
+        key = get_user_cache_key(user_id)
+        values = await self.cache.aget(key) if timeout else None
+        if values is None:
+            values = await self.get_user_queryset(user_id).afirst()
+            if values is not None and timeout:
+                await self.cache.aset(key, values, timeout)
+
+        user = self.build_user(values)
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # check_revoked would load the deferred password synchronously.
+            await user.arefresh_from_db(fields=["password"])
+            self.check_revoked(user, validated_token)
+        return user
@@ -0,0 +1,78 @@
+import hmac
+import secrets
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from picbudget.authentication.models import OTP
+
+
+def generate_otp_code(length=None):
+    length = length or settings.OTP_LENGTH
+    return "".join(secrets.choice("0123456789") for _ in range(length))
+
+
+class BaseOTPBackend:
+    """Issue and check one-time codes for a user."""
+
+    def generate(self, user) -> str:
+        raise NotImplementedError
+
+    def verify(self, user, otp_code: str) -> bool:
+        """Return whether ``otp_code`` is valid for ``user``; valid codes are consumed."""
+        raise NotImplementedError
+
+
+class CacheOTPBackend(BaseOTPBackend):
+    """
+    Keep codes in the Django cache with a TTL.
+
+    Expired codes disappear on their own, so resends never touch the database.
+    The cache must be shared by all processes (Redis), otherwise a code issued
+    by one worker cannot be verified by another.
+    """
+
+    key_prefix = "otp"
+
+    def __init__(self):
+        self.cache = caches[settings.OTP_CACHE_ALIAS]
+
+    def get_key(self, user):
+        return f"{self.key_prefix}:{user.pk}"
+
+    def generate(self, user):
+        otp_code = generate_otp_code()
+        self.cache.set(self.get_key(user), otp_code, timeout=settings.OTP_TTL_SECONDS)
+        return otp_code
+
+    def verify(self, user, otp_code):
+        key = self.get_key(user)
+        stored = self.cache.get(key)
+        if stored is None or not hmac.compare_digest(stored, str(otp_code)):
+            return False
+        # Only the request whose delete removed the code redeems it, so two
+        # concurrent requests cannot both use one code.
+        return self.cache.delete(key)
+
+
+class ModelOTPBackend(BaseOTPBackend):
+    """Original database-backed storage using one ``OTP`` row per user."""
+
+    def generate(self, user):
+        otp_instance, _ = OTP.objects.get_or_create(user=user)
+        return otp_instance.generate_otp()
+
+    def verify(self, user, otp_code):
+        otp_instance = OTP.objects.filter(user=user).first()
+        if otp_instance is None or not otp_instance.validate_otp(otp_code):
+            return False
+        otp_instance.otp = None
+        otp_instance.save(update_fields=["otp"])
+        return True
+
+
+@lru_cache(maxsize=None)
+def get_otp_backend() -> BaseOTPBackend:
+    return import_string(settings.OTP_BACKEND)()
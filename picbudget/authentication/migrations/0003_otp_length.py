@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='otp',
+            name='otp',
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+    ]
@@ -1 +1,2 @@
+from .email import OutgoingEmail
 from .otp import OTP
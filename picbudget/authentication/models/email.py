@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import models
+from django.utils import timezone
+
+
+class OutgoingEmail(models.Model):
+    """
+    Outbox row for one email, delivered in batches by ``flush_email_queue``.
+
+    ``idempotency_key`` is unique, so queueing a message twice under the same
+    key (e.g. a retried Celery task) stores and sends it only once. Rows are
+    deleted ``EMAIL_RETENTION_SECONDS`` after they are sent or abandoned.
+    """
+
+    STATUS = [
+        ("pending", "Pending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    recipient_list = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.recipient_list)}"
+
+    def as_message(self, connection):
+        return EmailMessage(
+            self.subject,
+            self.message,
+            settings.EMAIL_HOST_USER,
+            self.recipient_list,
+            connection=connection,
+        )
+
+    def mark_sent(self):
+        self.status = "sent"
+        self.sent_at = timezone.now()
+        self.last_error = ""
+        self.save(update_fields=["status", "sent_at", "last_error", "updated_at"])
+
+    def mark_failed(self, error):
+        """Schedule another attempt with exponential backoff, or give up."""
+        self.last_error = str(error)[:1000]
+        if self.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+            self.status = "failed"
+        else:
+            delay = settings.EMAIL_RETRY_BACKOFF_SECONDS * 2 ** (self.attempts - 1)
+            self.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        self.save(
+            update_fields=["status", "last_error", "next_attempt_at", "updated_at"]
+        )
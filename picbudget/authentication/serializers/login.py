@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth.models import update_last_login
+from picbudget.authentication.tokens import RefreshToken
+from picbudget.authentication.utils.login import update_last_login
 from django.utils.translation import gettext_lazy as _
 
 
@@ -44,7 +44,7 @@ class LoginSerializer(serializers.Serializer):
             else user.get_photo_url()
         )
 
-        update_last_login(None, user)
+        update_last_login(user)
 
         user_data = {
             "id": user.id,
@@ -1,51 +1,52 @@
 from rest_framework import serializers
-from picbudget.authentication.models import OTP
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from picbudget.project.task import send_email_task
+from picbudget.authentication.backends.otp import get_otp_backend
+from picbudget.core.utils.misc import apply_on_commit
+from picbudget.project.task import send_secret_email
 
 User = get_user_model()
 
 
+def send_otp_email(email, otp_code):
+    minutes = settings.OTP_TTL_SECONDS // 60
+    subject = "Your OTP Code"
+    message = f"Your OTP code is {otp_code}. It will expire in {minutes} minutes."
+    # Not queued in the outbox: the code would be stored, and every resend
+    # would write a row.
+    apply_on_commit(lambda: send_secret_email.delay(subject, message, [email]))
+
+
 class OTPSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
     def create(self, validated_data):
-        email = validated_data["email"]
-        user = User.objects.get(email=email)
-        otp_instance, _ = OTP.objects.get_or_create(user=user)
-        otp_code = otp_instance.generate_otp()
-
-        subject = "Your OTP Code"
-        message = f"Your OTP code is {otp_code}. It will expire in 5 minutes."
-        recipient_list = [user.email]
-        send_email_task.delay(subject, message, recipient_list)
-
-        return otp_instance
+        user = validated_data.get("user") or User.objects.get(
+            email=validated_data["email"]
+        )
+        otp_code = get_otp_backend().generate(user)
+        send_otp_email(user.email, otp_code)
+        return user
 
 
 class VerifyOTPSerializer(serializers.Serializer):
     email = serializers.EmailField()
-    otp_code = serializers.CharField(max_length=6)
+    otp_code = serializers.CharField(max_length=settings.OTP_LENGTH)
 
     def validate(self, data):
-        email = data.get("email")
-        otp_code = data.get("otp_code")
-
-        try:
-            user = User.objects.get(email=email)
-            otp_instance = OTP.objects.get(user=user)
-        except (User.DoesNotExist, OTP.DoesNotExist):
+        user = User.objects.filter(email=data.get("email")).first()
+        if user is None:
             raise ValidationError("Invalid email or OTP code.")
 
-        if not otp_instance.validate_otp(otp_code):
+        if not get_otp_backend().verify(user, data.get("otp_code")):
             raise ValidationError("Invalid or expired OTP code.")
 
+        data["user"] = user
         return data
 
     def create(self, validated_data):
-        email = validated_data["email"]
-        user = User.objects.get(email=email)
+        user = validated_data["user"]
         user.status = "verified"
-        user.save()
+        user.save(update_fields=["status", "updated_at"])
         return user
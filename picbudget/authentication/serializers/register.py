@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from picbudget.accounts.utils.onboarding import onboard_user
 
 User = get_user_model()
 
@@ -9,20 +10,18 @@ class RegisterSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
-    def validate_email(self, value):
-        user = User.objects.filter(email=value).first()
+    def validate(self, data):
+        user = User.objects.filter(email=data["email"]).first()
         if user and user.status == "verified":
             raise ValidationError(
                 "A user with this email already exists and is verified."
             )
-        return value
+        data["user"] = user
+        return data
 
     def create(self, validated_data):
-        email = validated_data["email"]
-        password = validated_data["password"]
-        user, created = User.objects.get_or_create(email=email)
-        if created or user.status == "unverified":
-            user.set_password(password)
-            user.status = "unverified"
-            user.save()
-        return user
+        return onboard_user(
+            validated_data["email"],
+            validated_data["password"],
+            user=validated_data["user"],
+        )
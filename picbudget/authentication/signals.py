@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .utils.blacklist import add_to_blacklist_filter
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_blacklisted_token(sender, instance, created, **kwargs):
+    """
+    Add every newly blacklisted JTI to the bloom filter, including tokens
+    blacklisted outside ``RefreshToken.blacklist()``, e.g. from the admin.
+    """
+    if created:
+        add_to_blacklist_filter(instance.token.jti)
@@ -0,0 +1,219 @@
+import socket
+from datetime import timedelta
+from unittest import mock
+
+import fakeredis
+from aiosmtpd.controller import Controller
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from redis.exceptions import ConnectionError
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from picbudget.accounts.models import User
+from picbudget.authentication.backends.otp import ModelOTPBackend
+from picbudget.authentication.models import OTP, OutgoingEmail
+from picbudget.authentication.tokens import RefreshToken
+from picbudget.authentication.utils import blacklist
+from picbudget.authentication.utils.email import (
+    deliver_pending_emails,
+    get_pooled_connection,
+)
+from picbudget.project.task import queue_email, send_secret_email, sweep_sent_emails
+
+
+class RecordingHandler:
+    """Collects the messages an SMTP server receives and refuses one address."""
+
+    refused = "bounce@example.com"
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == self.refused:
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        if session not in self.sessions:
+            self.sessions.append(session)
+        return "250 Message accepted for delivery"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class EmailDeliveryTest(TestCase):
+    def setUp(self):
+        self.handler = RecordingHandler()
+        self.controller = Controller(
+            self.handler, hostname="127.0.0.1", port=free_port()
+        )
+        self.controller.start()
+        self.addCleanup(self.controller.stop)
+        smtp = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.controller.port,
+            EMAIL_HOST_USER="noreply@example.com",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_USE_TLS=False,
+            EMAIL_BATCH_SIZE=10,
+        )
+        smtp.enable()
+        self.addCleanup(smtp.disable)
+        get_pooled_connection.cache_clear()
+        self.addCleanup(get_pooled_connection.cache_clear)
+
+    def test_delivers_batch_over_one_connection(self):
+        for i in range(5):
+            queue_email(f"Subject {i}", "Body", [f"user{i}@example.com"])
+
+        metrics = deliver_pending_emails()
+
+        self.assertEqual(metrics["sent"], 5)
+        self.assertEqual(len(self.handler.messages), 5)
+        self.assertEqual(len(self.handler.sessions), 1)
+        self.assertFalse(OutgoingEmail.objects.exclude(status="sent").exists())
+
+    def test_refused_message_is_retried_later(self):
+        queue_email("Welcome", "Body", ["user@example.com"])
+        bounced = queue_email("Welcome", "Body", [RecordingHandler.refused])
+
+        metrics = deliver_pending_emails()
+
+        self.assertEqual((metrics["sent"], metrics["failed"]), (1, 1))
+        bounced.refresh_from_db()
+        self.assertEqual((bounced.status, bounced.attempts), ("pending", 1))
+        self.assertGreater(bounced.next_attempt_at, timezone.now())
+
+    def test_identical_emails_are_not_deduplicated(self):
+        queue_email("Reminder", "Body", ["user@example.com"])
+        queue_email("Reminder", "Body", ["user@example.com"])
+        queue_email("Reset", "Body", ["user@example.com"], idempotency_key="key")
+        queue_email("Reset", "Body", ["user@example.com"], idempotency_key="key")
+
+        deliver_pending_emails()
+
+        self.assertEqual(len(self.handler.messages), 3)
+
+    def test_secret_emails_share_a_pooled_connection(self):
+        for i in range(3):
+            send_secret_email(f"Your OTP Code {i}", "Code", ["user@example.com"])
+
+        self.assertEqual(len(self.handler.messages), 3)
+        self.assertEqual(len(self.handler.sessions), 1)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_reset_link_is_not_stored(self):
+        User.objects.create_user(
+            email="ani@example.com", password="password", full_name="Ani"
+        )
+        with mock.patch.object(send_secret_email, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = APIClient().post(
+                    reverse("password_reset"), {"email": "ani@example.com"}
+                )
+
+        self.assertEqual(response.status_code, 200)
+        (subject, message, recipient_list), _ = delay.call_args
+        self.assertIn("/password-reset-confirm/", message)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_sweep_deletes_sent_emails_after_retention(self):
+        queue_email("Old", "Body", ["user@example.com"])
+        queue_email("New", "Body", ["user@example.com"])
+        deliver_pending_emails()
+        OutgoingEmail.objects.filter(subject="Old").update(
+            updated_at=timezone.now() - timedelta(days=2)
+        )
+
+        sweep_sent_emails()
+
+        self.assertQuerySetEqual(
+            OutgoingEmail.objects.values_list("subject", flat=True), ["New"]
+        )
+
+
+class BlacklistFilterTest(TestCase):
+    def setUp(self):
+        redis = mock.patch.object(
+            blacklist, "get_redis_client", return_value=fakeredis.FakeRedis()
+        )
+        redis.start()
+        self.addCleanup(redis.stop)
+        blacklist.get_blacklist_filter.cache_clear()
+        self.addCleanup(blacklist.get_blacklist_filter.cache_clear)
+        self.bloom = blacklist.get_blacklist_filter()
+        self.user = User.objects.create_user(
+            email="ani@example.com", password="password", full_name="Ani"
+        )
+
+    def blacklisted_jti(self):
+        jti = RefreshToken.for_user(self.user)["jti"]
+        token = OutstandingToken.objects.get(jti=jti)
+        with self.captureOnCommitCallbacks(execute=True):
+            BlacklistedToken.objects.create(token=token)
+        return jti
+
+    def test_lost_bits_are_rebuilt_from_the_database(self):
+        jti = self.blacklisted_jti()
+        self.assertTrue(blacklist.is_blacklisted(jti))
+
+        self.bloom.client.delete(self.bloom.key)
+        # Recreates the bit string with this token's bits only.
+        self.blacklisted_jti()
+
+        self.assertIsNone(self.bloom.lookup(jti))
+        self.assertTrue(blacklist.is_blacklisted(jti))
+        self.assertTrue(self.bloom.lookup(jti))
+
+    def test_redis_errors_fall_back_to_the_database(self):
+        jti = self.blacklisted_jti()
+        client = self.bloom.client
+        with mock.patch.object(client, "pipeline", side_effect=ConnectionError):
+            self.assertTrue(blacklist.is_blacklisted(jti))
+
+    def test_failed_add_drops_the_filter(self):
+        # Builds the filter.
+        self.assertTrue(blacklist.is_blacklisted(self.blacklisted_jti()))
+        with mock.patch.object(self.bloom, "add", side_effect=ConnectionError):
+            jti = self.blacklisted_jti()
+
+        self.assertFalse(self.bloom.is_ready())
+        self.assertTrue(blacklist.is_blacklisted(jti))
+
+
+@override_settings(OTP_LENGTH=8, OTP_TTL_SECONDS=60)
+class ModelOTPBackendTest(TestCase):
+    def setUp(self):
+        self.backend = ModelOTPBackend()
+        self.user = User.objects.create_user(
+            email="ani@example.com", password="password", full_name="Ani"
+        )
+
+    def test_codes_follow_the_otp_settings(self):
+        otp_code = self.backend.generate(self.user)
+
+        self.assertEqual(len(otp_code), 8)
+        expired_at = OTP.objects.get(user=self.user).expired_at
+        self.assertLessEqual(expired_at, timezone.now() + timedelta(seconds=60))
+        self.assertTrue(self.backend.verify(self.user, otp_code))
+        self.assertFalse(self.backend.verify(self.user, otp_code))
+
+    def test_expired_codes_are_rejected(self):
+        otp_code = self.backend.generate(self.user)
+        OTP.objects.filter(user=self.user).update(expired_at=timezone.now())
+
+        self.assertFalse(self.backend.verify(self.user, otp_code))
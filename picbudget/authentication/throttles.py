@@ -0,0 +1,53 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class EmailRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window limit on requests naming one email address.
+
+    ``SimpleRateThrottle`` keeps a per-key request history in the cache and
+    drops entries older than the window, so the limit slides with time.
+    """
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not email:
+            return None
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": str(email).strip().lower(),
+        }
+
+
+class IPRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window limit on requests from one client IP, as resolved with
+    ``REST_FRAMEWORK["NUM_PROXIES"]``.
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class OTPEmailRateThrottle(EmailRateThrottle):
+    scope = "otp_email"
+
+
+class OTPIPRateThrottle(IPRateThrottle):
+    scope = "otp_ip"
+
+
+class LoginEmailRateThrottle(EmailRateThrottle):
+    """
+    Login attempts per account. Throttles run before the serializer, so a
+    rejected attempt never reaches the password hasher.
+    """
+
+    scope = "login_email"
+
+
+class LoginIPRateThrottle(IPRateThrottle):
+    scope = "login_ip"
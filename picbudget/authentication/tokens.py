@@ -0,0 +1,14 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from picbudget.authentication.utils.blacklist import is_blacklisted
+
+
+class RefreshToken(BaseRefreshToken):
+    """Refresh token whose blacklist check goes through the bloom filter."""
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
@@ -0,0 +1,118 @@
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from picbudget.core.utils.collections import RedisBloomFilter
+from picbudget.core.utils.db import delete_in_batches
+from picbudget.core.utils.misc import apply_on_commit
+from picbudget.core.utils.redis_client import get_redis_client
+
+BLOOM_FILTER_KEY = "token-blacklist:bloom"
+REBUILD_LOCK_KEY = "token-blacklist:rebuild"
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def get_blacklist_filter():
+    """
+    Bloom filter of blacklisted refresh token JTIs, kept in Redis and shared
+    by all workers, or None without ``CACHE_REDIS_URL``.
+
+    A per-process filter would miss tokens blacklisted by other processes
+    after it was built, and a miss skips the database check.
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+    return RedisBloomFilter(
+        client,
+        BLOOM_FILTER_KEY,
+        settings.TOKEN_BLACKLIST_BLOOM_BITS,
+        settings.TOKEN_BLACKLIST_BLOOM_HASHES,
+    )
+
+
+def rebuild_blacklist_filter():
+    bloom = get_blacklist_filter()
+    if bloom is None:
+        return
+    jtis = BlacklistedToken.objects.values_list("token__jti", flat=True)
+    bloom.rebuild(
+        jtis.iterator(chunk_size=settings.TOKEN_FLUSH_BATCH_SIZE)
+    )
+
+
+def is_blacklisted_in_db(jti):
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def is_blacklisted(jti):
+    """
+    Check ``jti`` against the bloom filter and only query the database when
+    the filter reports a (possibly false) positive.
+
+    Fails closed: without a filter, while it is not built (or its bits were
+    lost) and on any Redis error the database is queried instead.
+    """
+    bloom = get_blacklist_filter()
+    if bloom is None:
+        return is_blacklisted_in_db(jti)
+    try:
+        found = bloom.lookup(jti)
+        if found is None:
+            # Build once; other requests keep using the database until it is ready.
+            if not cache.add(REBUILD_LOCK_KEY, 1, timeout=600):
+                return is_blacklisted_in_db(jti)
+            try:
+                rebuild_blacklist_filter()
+            finally:
+                cache.delete(REBUILD_LOCK_KEY)
+            found = bloom.lookup(jti)
+    except RedisError as exc:
+        logger.warning("Token blacklist filter unavailable, using the DB: %s", exc)
+        return is_blacklisted_in_db(jti)
+
+    return found is not False and is_blacklisted_in_db(jti)
+
+
+def _add_to_filter(bloom, jti):
+    try:
+        bloom.add(jti)
+    except RedisError:
+        # A filter without the JTI would accept the token: drop it so the next
+        # check rebuilds it from the database.
+        logger.exception("Could not add token %s to the blacklist filter", jti)
+        try:
+            bloom.invalidate()
+        except RedisError:
+            logger.exception("Could not invalidate the token blacklist filter")
+
+
+def add_to_blacklist_filter(jti):
+    bloom = get_blacklist_filter()
+    if bloom is not None:
+        # After commit, so the rebuild query always sees rows it was not told about.
+        apply_on_commit(lambda: _add_to_filter(bloom, jti))
+
+
+def delete_expired_tokens(batch_size=None):
+    """
+    Delete expired outstanding tokens (and, by cascade, their blacklist
+    entries) in batches, then rebuild the bloom filter without them.
+    """
+    expired = OutstandingToken.objects.filter(expires_at__lte=aware_utcnow())
+    metrics = delete_in_batches(
+        expired, batch_size or settings.TOKEN_FLUSH_BATCH_SIZE
+    )
+    if metrics["deleted"]:
+        rebuild_blacklist_filter()
+    return metrics
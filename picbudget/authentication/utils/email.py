@@ -0,0 +1,165 @@
+import logging
+import os
+import smtplib
+import threading
+import time
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from picbudget.authentication.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+def claim_email_batch(batch_size):
+    """
+    Lease up to ``batch_size`` due messages to this worker.
+
+    Rows are locked with ``SKIP LOCKED`` only while their attempt is recorded,
+    and ``next_attempt_at`` is pushed past the lease so concurrent workers skip
+    them while they are being sent. A worker that dies mid-batch leaves its
+    messages to be picked up again when the lease runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if batch:
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + timedelta(seconds=settings.EMAIL_LEASE_SECONDS),
+            )
+    for email in batch:
+        email.attempts += 1
+    return batch
+
+
+def send_email_batch(batch):
+    """Send ``batch`` over one SMTP connection, reopening it after a failure."""
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        for email in batch:
+            try:
+                # No-op while the connection is open, so only a failed send
+                # (which closes it below) costs a reconnect.
+                connection.open()
+                connection.send_messages([email.as_message(connection)])
+            except Exception as exc:
+                logger.warning("Sending email %s failed: %s", email.pk, exc)
+                email.mark_failed(exc)
+                failed += 1
+                connection.close()
+            else:
+                email.mark_sent()
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def deliver_pending_emails(batch_size=None):
+    """Drain due messages batch by batch and return throughput metrics."""
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    sent = failed = batches = 0
+    started = time.perf_counter()
+    while batch := claim_email_batch(batch_size):
+        batch_sent, batch_failed = send_email_batch(batch)
+        sent += batch_sent
+        failed += batch_failed
+        batches += 1
+    elapsed = time.perf_counter() - started
+
+    metrics = {
+        "batches": batches,
+        "sent": sent,
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "per_second": round(sent / elapsed, 1) if sent else 0.0,
+    }
+    if batches:
+        logger.info("Email queue drained: %s", metrics)
+    return metrics
+
+
+class PooledConnection:
+    """
+    One email connection per worker process, reused by every message sent
+    through it, so a burst of emails costs one SMTP handshake like an outbox
+    batch.
+
+    The connection is reopened after a fork, after ``EMAIL_POOL_IDLE_SECONDS``
+    without use (the server has usually dropped it by then) and after a
+    failed send. A send on a connection the server closed is retried once on
+    a fresh one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._used_at = 0.0
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _open(self):
+        if self._pid != os.getpid():
+            # A forked worker must not use the parent's socket.
+            self._connection = None
+            self._pid = os.getpid()
+        elif time.monotonic() - self._used_at > settings.EMAIL_POOL_IDLE_SECONDS:
+            self._close()
+        if self._connection is None:
+            self._connection = get_connection(fail_silently=False)
+        self._connection.open()
+        return self._connection
+
+    def send(self, message):
+        with self._lock:
+            try:
+                try:
+                    self._open().send_messages([message])
+                except smtplib.SMTPServerDisconnected:
+                    self._close()
+                    self._open().send_messages([message])
+            except Exception:
+                self._close()
+                raise
+            self._used_at = time.monotonic()
+
+
+@lru_cache
+def get_pooled_connection():
+    return PooledConnection()
+
+
+def send_secret_email_now(subject, message, recipient_list):
+    """Send an email over the pooled connection, without storing it anywhere."""
+    get_pooled_connection().send(
+        EmailMessage(subject, message, settings.EMAIL_HOST_USER, recipient_list)
+    )
+
+
+def next_retry_delay():
+    """Seconds until the earliest pending message is due, or None."""
+    next_attempt_at = (
+        OutgoingEmail.objects.filter(status="pending")
+        .order_by("next_attempt_at")
+        .values_list("next_attempt_at", flat=True)
+        .first()
+    )
+    if next_attempt_at is None:
+        return None
+    return max(0, (next_attempt_at - timezone.now()).total_seconds())
@@ -2,12 +2,16 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from ..serializers.login import LoginSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from ..throttles import LoginEmailRateThrottle, LoginIPRateThrottle
+from picbudget.authentication.tokens import RefreshToken
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
 
 class LoginViewSet(viewsets.ViewSet):
     permission_classes_by_action = {"login": [AllowAny], "logout": [IsAuthenticated]}
+    throttle_classes_by_action = {
+        "login": [LoginIPRateThrottle, LoginEmailRateThrottle],
+    }
 
     def get_permissions(self):
         try:
@@ -18,6 +22,12 @@ class LoginViewSet(viewsets.ViewSet):
         except KeyError:
             return [permission() for permission in self.permission_classes]
 
+    def get_throttles(self):
+        throttle_classes = self.throttle_classes_by_action.get(
+            self.action, self.throttle_classes
+        )
+        return [throttle() for throttle in throttle_classes]
+
     @action(detail=False, methods=["post"])
     def login(self, request):
         serializer = LoginSerializer(data=request.data, context={"request": request})
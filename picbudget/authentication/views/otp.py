@@ -3,16 +3,18 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from ..serializers.otp import OTPSerializer, VerifyOTPSerializer
+from ..throttles import OTPEmailRateThrottle, OTPIPRateThrottle
 
 
 class OTPViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
+    throttle_classes = [OTPIPRateThrottle, OTPEmailRateThrottle]
 
     @action(detail=False, methods=["post"], url_path="resend-otp")
     def resend_otp(self, request):
         serializer = OTPSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        otp_instance = serializer.save()
+        serializer.save()
         return Response({"message": "OTP sent to email."}, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=["post"], url_path="verify-otp")
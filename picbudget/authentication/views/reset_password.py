@@ -13,7 +13,8 @@ from django.contrib.auth.forms import SetPasswordForm
 from django.utils.encoding import force_str
 from ..serializers.reset_password import PasswordResetSerializer
 from django.http import HttpResponse
-from picbudget.project.task import send_email_task
+from picbudget.core.utils.misc import apply_on_commit
+from picbudget.project.task import send_secret_email
 
 User = get_user_model()
 
@@ -44,8 +45,9 @@ class PasswordResetRequestView(APIView):
         subject = "Password Reset Request"
         message = f"Click the link to reset your password: {reset_link}"
         recipient_list = [email]
-        send_email_task.delay(
-            subject=subject, message=message, recipient_list=recipient_list
+        # The link is a bearer secret, so it is not stored in the outbox.
+        apply_on_commit(
+            lambda: send_secret_email.delay(subject, message, recipient_list)
         )
 
 
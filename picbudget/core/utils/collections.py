@@ -1,3 +1,8 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
 def deep_update(base_dict, update_with):
     for key, value in update_with.items():
         if isinstance(value, dict):
@@ -11,3 +16,155 @@ def deep_update(base_dict, update_with):
             base_dict[key] = value
 
     return base_dict
+
+
+class LRUCache:
+    """Small in-process least-recently-used mapping with batch lookups."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = self._data[key]
+        return found
+
+    def set_many(self, mapping):
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class BloomFilter:
+    """
+    In-process bloom filter over strings: no false negatives, tunable false
+    positives (``size`` bits, ``hashes`` probes per value).
+
+    ``rebuild`` swaps in a freshly filled bit array. Values added while it runs
+    are written to both arrays, so concurrent ``add`` calls are never lost.
+    """
+
+    def __init__(self, size, hashes):
+        self.size = size
+        self.hashes = hashes
+        self._bits = None
+        self._next = None
+        self._lock = threading.Lock()
+
+    def positions(self, value):
+        # Double hashing: all probes come from a single 128-bit digest.
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        step = int.from_bytes(digest[8:], "big") | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def is_ready(self):
+        return self._bits is not None
+
+    def lookup(self, value):
+        """Whether ``value`` may be in the filter, or None when it is not built."""
+        return value in self if self.is_ready() else None
+
+    @staticmethod
+    def _set(bits, positions):
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def add(self, value):
+        positions = self.positions(value)
+        with self._lock:
+            for bits in (self._bits, self._next):
+                if bits is not None:
+                    self._set(bits, positions)
+
+    def __contains__(self, value):
+        bits = self._bits
+        return bits is not None and all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(value)
+        )
+
+    def rebuild(self, values):
+        with self._lock:
+            self._next = bytearray((self.size + 7) // 8)
+        for value in values:
+            self.add(value)
+        with self._lock:
+            self._bits, self._next = self._next, None
+
+
+class RedisBloomFilter(BloomFilter):
+    """
+    ``BloomFilter`` stored as a Redis bit string, shared by every process.
+
+    A rebuild fills ``<key>:next`` and renames it over ``<key>``; ``add`` writes
+    to both keys so values added meanwhile survive the rename.
+
+    Only a rebuild sets the sentinel bit after the ``size`` value bits, and it
+    is read with every lookup. A bit string that was evicted, or recreated by
+    an ``add`` after that, has no sentinel and counts as not built, so lost
+    bits never read as "not present".
+    """
+
+    def __init__(self, client, key, size, hashes, batch_size=10000):
+        super().__init__(size, hashes)
+        self.client = client
+        self.key = key
+        self.next_key = f"{key}:next"
+        self.sentinel = size
+        self.batch_size = batch_size
+
+    def is_ready(self):
+        return bool(self.client.getbit(self.key, self.sentinel))
+
+    def lookup(self, value):
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.getbit(self.key, self.sentinel)
+            for position in self.positions(value):
+                pipe.getbit(self.key, position)
+            ready, *bits = pipe.execute()
+        return all(bits) if ready else None
+
+    def invalidate(self):
+        """Drop the bit string, so the filter counts as not built until a rebuild."""
+        self.client.delete(self.key)
+
+    def add(self, value):
+        positions = self.positions(value)
+        with self.client.pipeline(transaction=False) as pipe:
+            for key in (self.key, self.next_key):
+                for position in positions:
+                    pipe.setbit(key, position, 1)
+            pipe.execute()
+
+    def __contains__(self, value):
+        return bool(self.lookup(value))
+
+    def rebuild(self, values):
+        self.client.delete(self.next_key)
+        # Allocates the full bit string up front, so the rename below always
+        # has a source key, even when there are no values.
+        self.client.setbit(self.next_key, self.sentinel, 1)
+
+        pipe = self.client.pipeline(transaction=False)
+        for count, value in enumerate(values, start=1):
+            for position in self.positions(value):
+                pipe.setbit(self.next_key, position, 1)
+            if count % self.batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+
+        self.client.rename(self.next_key, self.key)
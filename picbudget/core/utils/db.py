@@ -0,0 +1,32 @@
+import logging
+import time
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Delete the rows of ``queryset`` at most ``batch_size`` primary keys at a
+    time, each batch in its own short transaction, so a large sweep never
+    holds long locks on the table. Returns metrics for the task result.
+    """
+    model = queryset.model
+    pks = queryset.order_by().values_list("pk", flat=True)
+    deleted = batches = 0
+    started = time.perf_counter()
+    while batch := list(pks[:batch_size]):
+        with transaction.atomic():
+            deleted += model.objects.filter(pk__in=batch).delete()[0]
+        batches += 1
+
+    metrics = {
+        "model": model._meta.label,
+        "deleted": deleted,
+        "batches": batches,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    if batches:
+        logger.info("Sweep finished: %s", metrics)
+    return metrics
@@ -0,0 +1,72 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Pillow encoder and options per variant file extension
+VARIANT_ENCODERS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def render_variants(source, sizes):
+    """
+    Yield ``(name, extension, content)`` for every size in ``sizes`` (name to
+    longest side in pixels) and every format in ``IMAGE_VARIANT_FORMATS``.
+
+    Images are re-encoded from pixel data only, so EXIF (GPS, camera) and other
+    metadata are dropped; the EXIF orientation is applied first.
+    """
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for name, longest_side in sizes.items():
+            resized = image.copy()
+            resized.thumbnail((longest_side, longest_side), Image.LANCZOS)
+            for extension in settings.IMAGE_VARIANT_FORMATS:
+                encoder, options = VARIANT_ENCODERS[extension]
+                buffer = BytesIO()
+                resized.save(buffer, encoder, **options)
+                yield name, extension, buffer.getvalue()
+
+
+def store_image_variants(field_file, prefix, sizes):
+    """
+    Save the variants of ``field_file`` under ``prefix`` with content-hashed
+    names and return ``{name: {extension: path}}``.
+
+    Identical output maps to the same path, so re-running is idempotent and
+    unchanged variants keep their (cacheable) URLs.
+    """
+    variants = {}
+    with field_file.open("rb") as source:
+        for name, extension, content in render_variants(source, sizes):
+            digest = hashlib.sha256(content).hexdigest()[:16]
+            path = f"{prefix}/{name}-{digest}.{extension}"
+            if not default_storage.exists(path):
+                path = default_storage.save(path, ContentFile(content))
+            variants.setdefault(name, {})[extension] = path
+    return variants
+
+
+def variant_paths(variants):
+    return [path for formats in (variants or {}).values() for path in formats.values()]
+
+
+def variant_urls(variants, request=None):
+    def to_url(path):
+        url = default_storage.url(path)
+        return request.build_absolute_uri(url) if request else url
+
+    return {
+        name: {extension: to_url(path) for extension, path in formats.items()}
+        for name, formats in (variants or {}).items()
+    }
+
+
+def delete_files(paths):
+    for path in paths:
+        default_storage.delete(path)
@@ -0,0 +1,204 @@
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    In-process token buckets, one per key.
+
+    Each bucket holds up to ``capacity`` tokens and regains ``rate`` tokens per
+    second. ``consume`` returns ``(allowed, retry_after_seconds)``.
+
+    A full bucket is the same as a missing one, so buckets that have refilled
+    are dropped every ``prune_interval`` seconds; memory stays bounded by the
+    keys seen within one refill time, not by every client ever seen.
+    """
+
+    def __init__(self, prune_interval=60):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.prune_interval = prune_interval
+        self._pruned_at = time.monotonic()
+
+    def _prune(self, now):
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if bucket[2] > now
+        }
+        self._pruned_at = now
+
+    def _store(self, key, tokens, now, capacity, rate):
+        # The bucket is kept with the time it will be full again.
+        self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+
+    def consume(self, key, capacity, rate, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._pruned_at >= self.prune_interval:
+                self._prune(now)
+            tokens, updated_at, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            if tokens >= cost:
+                self._store(key, tokens - cost, now, capacity, rate)
+                return True, 0.0
+            self._store(key, tokens, now, capacity, rate)
+        return False, (cost - tokens) / rate
+
+
+class RedisTokenBucket(TokenBucket):
+    """``TokenBucket`` whose refill-and-take step is one atomic Lua script."""
+
+    SCRIPT = """
+    local now_parts = redis.call("TIME")
+    local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+
+    local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry_after = (cost - tokens) / rate
+    end
+
+    redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+    redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, client):
+        self.script = client.register_script(self.SCRIPT)
+
+    def consume(self, key, capacity, rate, cost=1):
+        allowed, retry_after = self.script(keys=[key], args=[capacity, rate, cost])
+        return bool(allowed), float(retry_after)
+
+
+class ConcurrencyLimiter:
+    """
+    Non-blocking semaphore: ``slot()`` yields False instead of waiting when
+    ``limit`` holders are already inside.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._active >= self.limit:
+                return None
+            self._active += 1
+            return True
+
+    def release(self, token):
+        with self._lock:
+            self._active -= 1
+
+    @contextmanager
+    def held(self, token):
+        """Keep ``token`` valid while the block runs; nothing to do in-process."""
+        yield
+
+    @contextmanager
+    def slot(self):
+        token = self.acquire()
+        if token is None:
+            yield False
+            return
+        try:
+            with self.held(token):
+                yield True
+        finally:
+            self.release(token)
+
+
+class RedisConcurrencyLimiter(ConcurrencyLimiter):
+    """
+    ``ConcurrencyLimiter`` shared by every process, kept as a Redis sorted set
+    of holders scored by the time their lease was last renewed. Holders older
+    than ``lease_seconds`` (a crashed worker) are dropped before counting.
+
+    While a slot is held, a background thread renews its lease every third of
+    ``lease_seconds``, so long batches keep their slot however long they run.
+    """
+
+    SCRIPT = """
+    local now_parts = redis.call("TIME")
+    local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+    local limit = tonumber(ARGV[1])
+    local lease = tonumber(ARGV[2])
+
+    redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - lease)
+    if redis.call("ZCARD", KEYS[1]) >= limit then
+        return 0
+    end
+    redis.call("ZADD", KEYS[1], now, ARGV[3])
+    redis.call("EXPIRE", KEYS[1], math.ceil(lease))
+    return 1
+    """
+
+    # Only renews holders that are still in the set (ZADD XX).
+    RENEW_SCRIPT = """
+    local now_parts = redis.call("TIME")
+    local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+    local renewed = redis.call("ZADD", KEYS[1], "XX", "CH", now, ARGV[2])
+    redis.call("EXPIRE", KEYS[1], math.ceil(tonumber(ARGV[1])))
+    return renewed
+    """
+
+    def __init__(self, client, key, limit, lease_seconds):
+        super().__init__(limit)
+        self.client = client
+        self.key = key
+        self.lease_seconds = lease_seconds
+        self.script = client.register_script(self.SCRIPT)
+        self.renew_script = client.register_script(self.RENEW_SCRIPT)
+
+    def acquire(self):
+        token = uuid.uuid4().hex
+        acquired = self.script(
+            keys=[self.key], args=[self.limit, self.lease_seconds, token]
+        )
+        return token if acquired else None
+
+    def release(self, token):
+        self.client.zrem(self.key, token)
+
+    def renew(self, token):
+        self.renew_script(keys=[self.key], args=[self.lease_seconds, token])
+
+    @contextmanager
+    def held(self, token):
+        stopped = threading.Event()
+
+        def renew_until_stopped():
+            while not stopped.wait(self.lease_seconds / 3):
+                try:
+                    self.renew(token)
+                except Exception as exc:
+                    # Retried on the next tick, well within the lease.
+                    logger.warning("Could not renew scan slot lease: %s", exc)
+
+        thread = threading.Thread(
+            target=renew_until_stopped, name="scan-slot-lease", daemon=True
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
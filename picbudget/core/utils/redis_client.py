@@ -0,0 +1,12 @@
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+
+
+@lru_cache
+def get_redis_client():
+    """Shared client for ``CACHE_REDIS_URL``, or None when Redis is not configured."""
+    if not settings.CACHE_REDIS_URL:
+        return None
+    return redis.Redis.from_url(settings.CACHE_REDIS_URL)
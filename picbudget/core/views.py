@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.utils.encoders import JSONEncoder
+
+from picbudget.authentication.backends.jwt import CachedJWTAuthentication
+
+
+class AsyncAPIView(View):
+    """
+    Async-native counterpart of ``APIView`` for read-heavy endpoints.
+
+    GET and HEAD run on the event loop with the async ORM and are excluded from
+    ``ATOMIC_REQUESTS``. Any other method is handed to ``write_view_class`` (the
+    regular DRF view) inside a transaction, so writes behave exactly as before.
+    """
+
+    write_view_class = None
+    authenticator = CachedJWTAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        return transaction.non_atomic_requests(csrf_exempt(view))
+
+    def get_write_view(self):
+        if self.write_view_class is None:
+            return None
+        return self.write_view_class.as_view()
+
+    def handle_write(self, view, request, *args, **kwargs):
+        with transaction.atomic():
+            return view(request, *args, **kwargs)
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method.lower() not in ("get", "head"):
+            write_view = self.get_write_view()
+            if write_view is None:
+                return await self.http_method_not_allowed(request, *args, **kwargs)
+            return await sync_to_async(self.handle_write)(
+                write_view, request, *args, **kwargs
+            )
+
+        try:
+            request.user = await self.authenticate(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        header = self.authenticator.get_header(request)
+        raw_token = self.authenticator.get_raw_token(header) if header else None
+        if raw_token is None:
+            raise NotAuthenticated()
+
+        validated_token = self.authenticator.get_validated_token(raw_token)
+        return await self.authenticator.aget_user(validated_token)
+
+    def handle_exception(self, exc):
+        response = self.render({"errors": exc.get_full_details()}, exc.status_code)
+        if exc.status_code == 401:
+            response["WWW-Authenticate"] = self.authenticator.authenticate_header(None)
+        return response
+
+    @staticmethod
+    def render(data, status=200):
+        return JsonResponse(
+            data,
+            status=status,
+            encoder=JSONEncoder,
+            safe=False,
+            json_dumps_params={"ensure_ascii": False, "separators": (",", ":")},
+        )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MembershipsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "picbudget.memberships"
+
+    def ready(self):
+        import picbudget.memberships.signals
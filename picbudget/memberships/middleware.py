@@ -0,0 +1,33 @@
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+
+from .utils.membership import get_membership_status
+
+
+def get_request_membership(request):
+    # DRF copies the authenticated user onto the underlying HttpRequest, so
+    # this sees the JWT user when evaluated inside a view.
+    return get_membership_status(getattr(request, "user", None))
+
+
+class MembershipMiddleware:
+    """
+    Attach ``request.membership``, a lazily resolved ``MembershipStatus``.
+
+    Nothing is looked up unless a view reads the attribute, and then only the
+    cache is hit in the common case.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.membership = SimpleLazyObject(partial(get_request_membership, request))
+        return self.get_response(request)
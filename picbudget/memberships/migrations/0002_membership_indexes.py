@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memberships', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['user', 'status', 'end_date'], name='memberships_user_id_24d1a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['membership', 'status'], name='memberships_members_085afd_idx'),
+        ),
+    ]
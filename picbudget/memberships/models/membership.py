@@ -22,5 +22,8 @@ class Membership(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "status", "end_date"])]
+
     def __str__(self):
-        return f"{self.user.fullname} - {self.status}"
+        return f"{self.user.full_name} - {self.status}"
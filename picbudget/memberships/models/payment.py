@@ -27,5 +27,8 @@ class Payment(models.Model):
     status = models.CharField(max_length=10, choices=PAYMENT_STATUS, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["membership", "status"])]
+
     def __str__(self):
-        return f"{self.user.fullname} - {self.status}"
+        return f"{self.user.full_name} - {self.status}"
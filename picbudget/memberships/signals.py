@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Membership, Payment
+from .utils.membership import invalidate_membership
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_membership_status(sender, instance, **kwargs):
+    """
+    Drop the cached membership status of the user whose records changed, once
+    the change is committed so a concurrent request cannot cache the old one.
+    """
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_membership(user_id))
@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from picbudget.memberships.models import Membership, Payment
+
+
+@dataclass(frozen=True)
+class MembershipStatus:
+    status: str = "inactive"
+    type: Optional[str] = None
+    membership_id: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @property
+    def is_active(self):
+        return self.status == "active"
+
+    @property
+    def tier(self):
+        return "premium" if self.is_active else "free"
+
+
+INACTIVE = MembershipStatus()
+
+
+def get_cache_key(user_id):
+    return f"membership:{user_id}"
+
+
+def invalidate_membership(user_id):
+    cache.delete(get_cache_key(user_id))
+
+
+def resolve_membership(user_id, today=None):
+    """
+    Return the user's effective membership with one indexed query.
+
+    A membership counts when it is marked active, today falls inside its date
+    range and at least one of its payments is paid. The longest running one
+    wins when several overlap.
+    """
+    today = today or timezone.localdate()
+    row = (
+        Membership.objects.filter(
+            user_id=user_id,
+            status="active",
+            start_date__lte=today,
+            end_date__gte=today,
+        )
+        .filter(
+            Exists(
+                Payment.objects.filter(membership_id=OuterRef("pk"), status="paid")
+            )
+        )
+        .order_by("-end_date")
+        .values_list("id", "type", "start_date", "end_date")
+        .first()
+    )
+    if row is None:
+        return INACTIVE
+
+    membership_id, type, start_date, end_date = row
+    return MembershipStatus("active", type, str(membership_id), start_date, end_date)
+
+
+def seconds_until_tomorrow():
+    now = timezone.localtime()
+    midnight = timezone.make_aware(
+        datetime.combine(now.date() + timedelta(days=1), time.min)
+    )
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def get_membership_status(user):
+    """
+    Cached ``resolve_membership`` for ``user``.
+
+    Entries live for ``MEMBERSHIP_CACHE_TIMEOUT`` seconds but never past local
+    midnight, since membership ranges are whole days. Membership and payment
+    writes drop the entry (see ``picbudget.memberships.signals``).
+    """
+    if not user or not user.is_authenticated:
+        return INACTIVE
+
+    key = get_cache_key(user.pk)
+    status = cache.get(key)
+    if status is None:
+        status = resolve_membership(user.pk)
+        timeout = min(settings.MEMBERSHIP_CACHE_TIMEOUT, seconds_until_tomorrow())
+        cache.set(key, status, timeout)
+    return status
@@ -42,7 +42,7 @@ class Plan(models.Model):
         if not self.labels.exists():
             self.labels.set(Label.objects.all())
 
-    def calculate_progress(self):
+    def get_period_range(self):
         now_date = now().date()
         start_date, end_date = None, None
 
@@ -56,6 +56,10 @@ class Plan(models.Model):
             start_date = now_date.replace(month=1, day=1)
             end_date = now_date.replace(month=12, day=31)
 
+        return start_date, end_date
+
+    def get_period_transactions(self):
+        start_date, end_date = self.get_period_range()
         transactions = Transaction.objects.filter(
             wallet__in=self.wallets.all(),
             labels__in=self.labels.all(),
@@ -64,13 +68,27 @@ class Plan(models.Model):
             transactions = transactions.filter(
                 transaction_date__range=(start_date, end_date)
             )
+        return transactions
 
-        total_spent = (
-            transactions.aggregate(total_spent=Sum("amount"))["total_spent"] or 0
-        )
+    def get_progress(self, total_spent):
         progress = (total_spent / self.amount) * 100 if self.amount > 0 else 0
         return round(progress, 2)
 
+    def calculate_progress(self):
+        total_spent = (
+            self.get_period_transactions().aggregate(total_spent=Sum("amount"))[
+                "total_spent"
+            ]
+            or 0
+        )
+        return self.get_progress(total_spent)
+
+    async def acalculate_progress(self):
+        total_spent = (
+            await self.get_period_transactions().aaggregate(total_spent=Sum("amount"))
+        )["total_spent"] or 0
+        return self.get_progress(total_spent)
+
     def is_overspent(self):
         return self.calculate_progress() > 100
 
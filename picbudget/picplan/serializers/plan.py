@@ -100,16 +100,26 @@ class PlanListSerializer(serializers.ModelSerializer):
         model = Plan
         fields = ["id", "name", "remaining", "progress", "is_overspent"]
 
+    def _get_plan_progress(self, obj):
+        """
+        Compute each plan's progress once per response. Async views pass the
+        values precomputed in ``context["progress"]``.
+        """
+        progress = self.context.setdefault("progress", {})
+        if obj.id not in progress:
+            progress[obj.id] = obj.calculate_progress()
+        return progress[obj.id]
+
     def get_progress(self, obj):
-        return obj.calculate_progress()
+        return self._get_plan_progress(obj)
 
     def get_remaining(self, obj):
-        progress = obj.calculate_progress()
+        progress = self._get_plan_progress(obj)
         total_spent = (progress / 100) * obj.amount if progress else 0
         return round(obj.amount - total_spent, 2)
 
     def get_is_overspent(self, obj):
-        return obj.is_overspent()
+        return self._get_plan_progress(obj) > 100
 
 
 class PlanDetailSerializer(serializers.ModelSerializer):
@@ -1,12 +1,14 @@
+from django.conf import settings
 from django.urls import path
-from .views.plan import PlanViewSet
+from .views.plan import PlanViewSet, AsyncPlanListView
+
+if settings.ASYNC_READ_VIEWS:
+    plan_list_view = AsyncPlanListView.as_view()
+else:
+    plan_list_view = PlanViewSet.as_view({"get": "list", "post": "create"})
 
 urlpatterns = [
-    path(
-        "plans/",
-        PlanViewSet.as_view({"get": "list", "post": "create"}),
-        name="plan-list",
-    ),
+    path("plans/", plan_list_view, name="plan-list"),
     path(
         "plans/<uuid:pk>/",
         PlanViewSet.as_view(
@@ -10,6 +10,9 @@ from ..serializers.plan import (
 from ..models.plan import Plan
 from picbudget.transactions.models import Transaction
 from picbudget.transactions.serializers.transaction import TransactionSerializer
+from picbudget.transactions.serializers.export import TransactionExportSerializer
+from picbudget.transactions.views.export import is_export_request, export_csv_response
+from picbudget.core.views import AsyncAPIView
 
 # Create your views here.
 class PlanViewSet(viewsets.ModelViewSet):
@@ -52,5 +55,22 @@ class PlanViewSet(viewsets.ModelViewSet):
             wallet__in=plan.wallets.all(),
             labels__in=plan.labels.all(),
         ).distinct()
+        if is_export_request(request):
+            return export_csv_response(
+                TransactionExportSerializer(transactions), f"plan-{plan.id}.csv"
+            )
         serializer = TransactionSerializer(transactions, many=True)
         return Response({"data": serializer.data})
+
+
+class AsyncPlanListView(AsyncAPIView):
+    def get_write_view(self):
+        return PlanViewSet.as_view({"post": "create"})
+
+    async def get(self, request, *args, **kwargs):
+        plans = [plan async for plan in Plan.objects.filter(user=request.user)]
+        progress = {plan.id: await plan.acalculate_progress() for plan in plans}
+        serializer = PlanListSerializer(
+            plans, many=True, context={"request": request, "progress": progress}
+        )
+        return self.render({"data": serializer.data})
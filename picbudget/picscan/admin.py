@@ -1,3 +1,19 @@
 from django.contrib import admin
 
+from .models import ReceiptScan
+
+
 # Register your models here.
+class ReceiptScanAdmin(admin.ModelAdmin):
+    list_display = [
+        "transaction",
+        "image_version",
+        "ocr_version",
+        "parser_version",
+        "updated_at",
+    ]
+    list_filter = ["image_version", "ocr_version", "parser_version"]
+    raw_id_fields = ["transaction"]
+
+
+admin.site.register(ReceiptScan, ReceiptScanAdmin)
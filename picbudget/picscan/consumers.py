@@ -0,0 +1,40 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.core.cache import cache
+
+from .utils.progress import progress_cache_key, progress_group
+
+
+class ScanProgressConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Stream the progress events of one scan job.
+
+    The job id is a random UUID handed out by ``ReceiptView`` and acts as the
+    subscription key. On connect the latest event is replayed, so nothing is
+    lost when the scan advanced before the socket opened; a stage may then
+    arrive twice. The socket is closed after the final event.
+    """
+
+    async def connect(self):
+        self.job_id = str(self.scope["url_route"]["kwargs"]["job_id"])
+        self.group_name = progress_group(self.job_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        event = await cache.aget(progress_cache_key(self.job_id))
+        if event is not None:
+            await self.send_event(event)
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Clients only listen.
+        pass
+
+    async def scan_progress(self, message):
+        await self.send_event(message["event"])
+
+    async def send_event(self, event):
+        await self.send_json(event)
+        if event["final"]:
+            await self.close()
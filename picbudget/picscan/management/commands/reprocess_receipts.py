@@ -0,0 +1,119 @@
+from collections import Counter
+from uuid import UUID
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from picbudget.picscan.utils.pipeline import STAGES
+from picbudget.picscan.utils.reprocess import (
+    backfill_scans,
+    count_stale_scans,
+    reprocess_scans,
+    stale_scans,
+    unscanned_transactions,
+)
+from picbudget.project.task import reprocess_receipt_scans
+
+
+def key_ranges(chains):
+    """Split the UUID key space into ``chains`` ``(after, before]`` ranges."""
+    bounds = [str(UUID(int=i * 2**128 // chains)) for i in range(1, chains)]
+    return list(zip([None] + bounds, bounds + [None]))
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run the PicScan stages whose version changed on stored receipts, "
+        "in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.PICSCAN_REPROCESS_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--from-stage",
+            choices=STAGES,
+            help="Reprocess every receipt from this stage, even if up to date.",
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help=(
+                "Scan the PicScan receipts stored without a scan from the image "
+                "stage instead."
+            ),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the receipts to reprocess per stage.",
+        )
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Reprocess in chains of Celery tasks instead of in this process.",
+        )
+        parser.add_argument(
+            "--chains",
+            type=int,
+            default=1,
+            help="Task chains to split the receipts between, with --background.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        from_stage = options["from_stage"]
+
+        if options["backfill"]:
+            self.backfill(batch_size, options["dry_run"])
+            return
+
+        if options["dry_run"]:
+            for stage, count in count_stale_scans().items():
+                self.stdout.write(f"{count} receipts to reprocess from {stage}")
+            return
+
+        if options["background"]:
+            ranges = key_ranges(max(1, options["chains"]))
+            for after, before in ranges:
+                reprocess_receipt_scans.delay(after, before, from_stage, batch_size)
+            self.stdout.write(
+                self.style.SUCCESS(f"Queued {len(ranges)} reprocessing chains.")
+            )
+            return
+
+        totals = Counter()
+        after = None
+        while scans := list(stale_scans(after, from_stage=from_stage)[:batch_size]):
+            totals.update(reprocess_scans(scans, from_stage))
+            after = scans[-1].pk
+            self.stdout.write(f"Reprocessed {totals['scans']} receipts")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done, {totals['rescanned']} receipts read again, "
+                f"{totals['reparsed']} parsed again, "
+                f"{totals['missing'] + totals['failed']} skipped."
+            )
+        )
+
+    def backfill(self, batch_size, dry_run):
+        if dry_run:
+            count = unscanned_transactions().count()
+            self.stdout.write(f"{count} receipts to backfill from image")
+            return
+
+        totals = Counter()
+        after = None
+        while transactions := list(unscanned_transactions(after)[:batch_size]):
+            totals.update(backfill_scans(transactions))
+            after = transactions[-1].pk
+            self.stdout.write(f"Backfilled {totals['scans']} receipts")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done, {totals['rescanned']} receipts scanned, "
+                f"{totals['missing'] + totals['failed']} skipped."
+            )
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:07
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('transactions', '0009_transaction_receipt_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptScan',
+            fields=[
+                ('transaction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='scan', serialize=False, to='transactions.transaction')),
+                ('image_version', models.CharField(max_length=32)),
+                ('ocr_version', models.CharField(max_length=32)),
+                ('parser_version', models.CharField(max_length=32)),
+                ('ocr_result', models.JSONField(blank=True, default=list)),
+                ('text', models.TextField(blank=True)),
+                ('result', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1 @@
+from .scan import ReceiptScan
@@ -0,0 +1,29 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class ReceiptScan(models.Model):
+    """
+    What the PicScan pipeline read from a transaction's receipt: the raw OCR
+    entries, the text built from them and the parsed result, with the stage
+    versions that produced each (see ``picscan.utils.pipeline``).
+    """
+
+    transaction = models.OneToOneField(
+        "transactions.Transaction",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="scan",
+    )
+    image_version = models.CharField(max_length=32)
+    ocr_version = models.CharField(max_length=32)
+    parser_version = models.CharField(max_length=32)
+    # PaddleOCR lines: [[[x, y] x 4], [text, confidence]]
+    ocr_result = models.JSONField(default=list, blank=True)
+    text = models.TextField(blank=True)
+    result = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Scan of {self.transaction_id} ({self.parser_version})"
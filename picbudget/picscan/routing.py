@@ -0,0 +1,12 @@
+from django.urls import path
+
+from .consumers import ScanProgressConsumer
+
+websocket_urlpatterns = [
+    path("ws/picscan/scans/<uuid:job_id>/", ScanProgressConsumer.as_asgi()),
+]
+
+
+def scan_progress_url(request, job_id):
+    scheme = "wss" if request.is_secure() else "ws"
+    return f"{scheme}://{request.get_host()}/ws/picscan/scans/{job_id}/"
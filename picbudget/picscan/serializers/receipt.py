@@ -1,12 +1,96 @@
+import io
+
+from django.conf import settings
 from rest_framework import serializers
 
+from ..utils.pages import UnreadableReceipt, split_pages
+from ..utils.uploads import ImageHeader, read_image_header
+
+
+def check_upload_size(size: int):
+    limit = settings.PICSCAN_MAX_UPLOAD_SIZE
+    if size > limit:
+        raise UnreadableReceipt(
+            f"A receipt may be at most {limit // (1024 * 1024)} MB."
+        )
+
+
+def check_receipt_image(file) -> ImageHeader:
+    """
+    Format and size of a receipt image from its magic bytes and header,
+    rejecting images too small to read or with too many pixels to decode.
+    """
+    header = read_image_header(file)
+    if min(header.width, header.height) < settings.PICSCAN_MIN_IMAGE_SIDE:
+        raise UnreadableReceipt("The image is too small to read.")
+    if header.width * header.height > settings.PICSCAN_MAX_IMAGE_PIXELS:
+        raise UnreadableReceipt(
+            "The image may have at most "
+            f"{settings.PICSCAN_MAX_IMAGE_PIXELS // 1_000_000} megapixels."
+        )
+    return header
+
 
 class ReceiptSerializer(serializers.Serializer):
-    receipt = serializers.ImageField()
-
-    def validate_receipt_image(self, value):
-        if value is None:
-            raise serializers.ValidationError("Image is required")
-        if not value.name.endswith((".jpg", ".jpeg", ".png")):
-            raise serializers.ValidationError("Invalid image format")
-        return value
+    """
+    One receipt image. ``receipt`` validates to a ``(file extension, upload)``
+    pair after checking the file's magic bytes and image size from its header,
+    so the upload itself is never read into memory here.
+    """
+
+    receipt = serializers.FileField()
+    background = serializers.BooleanField(default=False)
+
+    def validate_receipt(self, value):
+        try:
+            check_upload_size(value.size)
+            header = check_receipt_image(value)
+        except UnreadableReceipt as exc:
+            raise serializers.ValidationError(str(exc))
+        return header.extension, value
+
+
+class ReceiptBatchSerializer(serializers.Serializer):
+    """
+    Several receipt images, or a PDF / multi-page TIFF with one receipt per
+    page. ``receipts`` validates to ``(file extension, image bytes)`` pairs,
+    one per receipt.
+
+    Every upload and every page split from it is checked like a single
+    receipt, and the extension comes from the detected format.
+    """
+
+    receipts = serializers.ListField(child=serializers.FileField(), allow_empty=False)
+    background = serializers.BooleanField(default=False)
+
+    def validate_receipts(self, files):
+        limit = settings.PICSCAN_BATCH_MAX_RECEIPTS
+        pages = []
+        for upload in files:
+            try:
+                check_upload_size(upload.size)
+                split = split_pages(
+                    upload.read(),
+                    settings.PICSCAN_PDF_DPI,
+                    limit,
+                    settings.PICSCAN_MAX_IMAGE_PIXELS,
+                )
+            except UnreadableReceipt as exc:
+                raise serializers.ValidationError(f"{upload.name}: {exc}")
+
+            for number, page in enumerate(split, start=1):
+                try:
+                    check_upload_size(len(page))
+                    header = check_receipt_image(io.BytesIO(page))
+                except UnreadableReceipt as exc:
+                    name = upload.name
+                    if len(split) > 1:
+                        name = f"{name}, page {number}"
+                    raise serializers.ValidationError(f"{name}: {exc}")
+                pages.append((header.extension, page))
+
+            if len(pages) > limit:
+                raise serializers.ValidationError(
+                    f"At most {limit} receipts can be scanned at once."
+                )
+        return pages
@@ -1,3 +1,227 @@
-from django.test import TestCase
+import io
+import time
+from datetime import date, datetime
+from unittest import mock
+from uuid import uuid4
 
-# Create your tests here.
+import fakeredis
+import pypdfium2 as pdfium
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from picbudget.core.utils.ratelimit import (
+    ConcurrencyLimiter,
+    RedisConcurrencyLimiter,
+    TokenBucket,
+)
+from picbudget.picscan import throttles
+from picbudget.picscan.routing import websocket_urlpatterns
+from picbudget.picscan.serializers.receipt import ReceiptBatchSerializer
+from picbudget.picscan.throttles import ScanRateThrottle, get_scan_bucket
+from picbudget.picscan.utils.processors.dates import parse_date
+from picbudget.picscan.utils.progress import (
+    COMPLETED,
+    OCR_DONE,
+    PREPROCESSED,
+    progress_cache_key,
+    publish_progress,
+)
+from picbudget.picscan.views import receipt as receipt_views
+
+
+def png_upload(name):
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 400)).save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class ScanRateThrottleTest(SimpleTestCase):
+    def setUp(self):
+        get_scan_bucket.cache_clear()
+        self.addCleanup(get_scan_bucket.cache_clear)
+
+    def scan_request(self, forwarded_for):
+        request = Request(
+            APIRequestFactory().post(
+                "/", REMOTE_ADDR="10.0.0.2", HTTP_X_FORWARDED_FOR=forwarded_for
+            )
+        )
+        request.user = AnonymousUser()
+        return request
+
+    def test_anonymous_bucket_ignores_forwarded_for(self):
+        allowed = [
+            ScanRateThrottle().allow_request(self.scan_request(f"203.0.113.{i}"), None)
+            for i in range(4)
+        ]
+
+        # Capacity of the anonymous tier, then throttled despite the new addresses.
+        self.assertEqual(allowed, [True, True, True, False])
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class ScanProgressConsumerTest(SimpleTestCase):
+    def setUp(self):
+        self.job_id = str(uuid4())
+
+    def communicator(self):
+        return WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f"/ws/picscan/scans/{self.job_id}/"
+        )
+
+    async def test_connect_without_progress_sends_nothing(self):
+        communicator = self.communicator()
+        connected, _ = await communicator.connect()
+
+        self.assertTrue(connected)
+        self.assertTrue(await communicator.receive_nothing())
+        await communicator.disconnect()
+
+    async def test_connect_replays_cached_progress(self):
+        event = {"job_id": self.job_id, "stage": PREPROCESSED, "final": False}
+        await cache.aset(progress_cache_key(self.job_id), event)
+
+        communicator = self.communicator()
+        await communicator.connect()
+
+        self.assertEqual(await communicator.receive_json_from(), event)
+        await communicator.disconnect()
+
+    async def test_published_stages_are_streamed_until_final(self):
+        communicator = self.communicator()
+        await communicator.connect()
+
+        publish_progress(self.job_id, OCR_DONE, entries=3)
+        event = await communicator.receive_json_from()
+        self.assertEqual((event["stage"], event["data"]), (OCR_DONE, {"entries": 3}))
+
+        publish_progress(self.job_id, COMPLETED)
+        event = await communicator.receive_json_from()
+        self.assertEqual((event["stage"], event["final"]), (COMPLETED, True))
+        closed = await communicator.receive_output()
+        self.assertEqual(closed["type"], "websocket.close")
+
+
+class ParseDateTest(SimpleTestCase):
+    today = date(2024, 9, 1)
+
+    def test_blank_separated_date(self):
+        for text in ("12 08 2024", "12\t08\t2024"):
+            with self.subTest(text=text):
+                parsed = parse_date(text, self.today)
+                self.assertEqual(parsed.date, datetime(2024, 8, 12))
+
+    def test_numbers_on_different_lines_are_not_a_date(self):
+        for text in ("Kasir 12\n08 2024", "No 12 08\n2024", "17\nAgustus 2024"):
+            with self.subTest(text=text):
+                self.assertIsNone(parse_date(text, self.today))
+
+
+class ScanLimiterTest(SimpleTestCase):
+    def test_held_slot_outlives_its_lease(self):
+        limiter = RedisConcurrencyLimiter(
+            fakeredis.FakeRedis(), "picscan:active-scans", 1, lease_seconds=0.3
+        )
+        with limiter.slot() as acquired:
+            time.sleep(1)
+            self.assertTrue(acquired)
+            self.assertIsNone(limiter.acquire())
+
+        self.assertIsNotNone(limiter.acquire())
+
+
+class TokenBucketTest(SimpleTestCase):
+    def test_refilled_buckets_are_dropped(self):
+        bucket = TokenBucket(prune_interval=0)
+        for i in range(100):
+            bucket.consume(f"203.0.113.{i}", capacity=3, rate=10)
+        self.assertEqual(len(bucket._buckets), 100)
+
+        time.sleep(0.2)
+        bucket.consume("198.51.100.1", capacity=3, rate=10)
+        self.assertEqual(list(bucket._buckets), ["198.51.100.1"])
+
+
+class ReceiptBatchSerializerTest(SimpleTestCase):
+    def validate(self, *uploads):
+        serializer = ReceiptBatchSerializer(data={"receipts": list(uploads)})
+        valid = serializer.is_valid()
+        return valid, serializer.validated_data if valid else serializer.errors
+
+    def test_extension_comes_from_the_detected_format(self):
+        valid, data = self.validate(png_upload("receipt.html"))
+
+        self.assertTrue(valid)
+        self.assertEqual(data["receipts"][0][0], ".png")
+
+    def test_files_must_be_images(self):
+        upload = SimpleUploadedFile("receipt.jpg", b"<html></html>")
+        valid, errors = self.validate(upload)
+
+        self.assertFalse(valid)
+        self.assertIn("receipt.jpg", str(errors["receipts"]))
+
+    @override_settings(PICSCAN_MAX_UPLOAD_SIZE=1024)
+    def test_upload_size_is_limited(self):
+        upload = SimpleUploadedFile("receipt.png", b"\0" * 2048)
+        valid, errors = self.validate(upload)
+
+        self.assertFalse(valid)
+        self.assertIn("at most", str(errors["receipts"]))
+
+    @override_settings(PICSCAN_MAX_IMAGE_PIXELS=1_000_000)
+    def test_large_pdf_pages_are_rendered_smaller(self):
+        document = pdfium.PdfDocument.new()
+        document.new_page(14400, 14400)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        document.close()
+
+        upload = SimpleUploadedFile("receipt.pdf", buffer.getvalue())
+        valid, data = self.validate(upload)
+
+        self.assertTrue(valid)
+        ((file_ext, page),) = data["receipts"]
+        with Image.open(io.BytesIO(page)) as image:
+            self.assertLessEqual(image.width * image.height, 1_000_000)
+        self.assertEqual(file_ext, ".png")
+
+
+class ScannerBusyTest(TestCase):
+    def setUp(self):
+        get_scan_bucket.cache_clear()
+        self.addCleanup(get_scan_bucket.cache_clear)
+        busy = mock.patch.object(
+            throttles, "get_scan_limiter", return_value=ConcurrencyLimiter(0)
+        )
+        busy.start()
+        self.addCleanup(busy.stop)
+
+    def test_refused_scans_save_nothing(self):
+        requests = [
+            ("receipt-upload", {"receipt": png_upload("receipt.png")}),
+            ("receipt-batch-upload", {"receipts": [png_upload("receipt.png")]}),
+        ]
+        for name, data in requests:
+            patched = mock.patch.multiple(
+                receipt_views,
+                default_storage=mock.DEFAULT,
+                publish_progress=mock.DEFAULT,
+            )
+            with self.subTest(name=name), patched as mocks:
+                response = APIClient().post(reverse(name), data)
+
+                self.assertEqual(response.status_code, 429)
+                mocks["default_storage"].save.assert_not_called()
+                mocks["publish_progress"].assert_not_called()
@@ -0,0 +1,96 @@
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from picbudget.core.utils.ratelimit import (
+    ConcurrencyLimiter,
+    RedisConcurrencyLimiter,
+    RedisTokenBucket,
+    TokenBucket,
+)
+from picbudget.core.utils.redis_client import get_redis_client
+
+
+@lru_cache
+def get_scan_bucket():
+    client = get_redis_client()
+    return RedisTokenBucket(client) if client is not None else TokenBucket()
+
+
+@lru_cache
+def get_scan_limiter():
+    """
+    Limit on receipts being scanned at once. Shared through Redis when it is
+    configured, otherwise per process.
+    """
+    limit = settings.PICSCAN_MAX_CONCURRENT_SCANS
+    client = get_redis_client()
+    if client is None:
+        return ConcurrencyLimiter(limit)
+    return RedisConcurrencyLimiter(
+        client, "picscan:active-scans", limit, settings.PICSCAN_SCAN_LEASE_SECONDS
+    )
+
+
+class ScannerBusy(Throttled):
+    default_detail = _("The receipt scanner is busy.")
+    extra_detail_singular = _("Try again in {wait} second.")
+    extra_detail_plural = _("Try again in {wait} seconds.")
+    default_code = "scanner_busy"
+
+
+@contextmanager
+def scanner_slot():
+    """
+    Hold a scanner slot for a scan run in the request, raising ``ScannerBusy``
+    instead of queueing when every slot is taken.
+    """
+    with get_scan_limiter().slot() as acquired:
+        if not acquired:
+            raise ScannerBusy(wait=settings.PICSCAN_BUSY_RETRY_AFTER)
+        yield
+
+
+class ScanRateThrottle(BaseThrottle):
+    """
+    Token bucket per user (or client IP when anonymous, as resolved with
+    ``REST_FRAMEWORK["NUM_PROXIES"]``), sized by membership tier through
+    ``PICSCAN_RATE_LIMITS``.
+    """
+
+    def allow_request(self, request, view):
+        if request.user and request.user.is_authenticated:
+            tier = request.membership.tier
+            ident = request.user.pk
+        else:
+            tier = "anonymous"
+            ident = self.get_ident(request)
+
+        limit = settings.PICSCAN_RATE_LIMITS[tier]
+        allowed, self.retry_after = get_scan_bucket().consume(
+            f"picscan:bucket:{tier}:{ident}",
+            limit["capacity"],
+            limit["refill_per_minute"] / 60,
+            min(self.get_cost(request), limit["capacity"]),
+        )
+        return allowed
+
+    def get_cost(self, request):
+        return 1
+
+    def wait(self):
+        return self.retry_after
+
+
+class BatchScanRateThrottle(ScanRateThrottle):
+    """
+    One token per uploaded file, so a batch drains the same bucket as single
+    scans. A batch never costs more than a full bucket.
+    """
+
+    def get_cost(self, request):
+        return max(1, len(request.FILES.getlist("receipts")))
@@ -1,8 +1,13 @@
 from django.urls import path
-from .views.receipt import ReceiptView, ConfirmTransactionView
+from .views.receipt import ReceiptView, ReceiptBatchView, ConfirmTransactionView
 
 urlpatterns = [
     path("picscan-receipt/", ReceiptView.as_view(), name="receipt-upload"),
+    path(
+        "picscan-receipt/batch/",
+        ReceiptBatchView.as_view(),
+        name="receipt-batch-upload",
+    ),
     path(
         "picscan-confirm/<uuid:pk>/",
         ConfirmTransactionView.as_view(),
@@ -0,0 +1,83 @@
+import io
+import math
+from typing import List
+
+import pypdfium2 as pdfium
+from PIL import Image, ImageSequence
+
+PDF_MAGIC = b"%PDF-"
+
+
+class UnreadableReceipt(ValueError):
+    pass
+
+
+def encode_png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_scale(page: pdfium.PdfPage, dpi: int, max_pixels: int) -> float:
+    """
+    Scale to render ``page`` at ``dpi``, lowered so that the bitmap has at most
+    ``max_pixels``: the page size comes from the PDF, and a large page at the
+    full resolution would need gigabytes.
+    """
+    width, height = page.get_size()
+    if width * height <= 0:
+        raise UnreadableReceipt("The PDF has an empty page.")
+    # Leaves room for the bitmap size being rounded up.
+    return min(dpi / 72, math.sqrt(max_pixels / (width * height)) * 0.99)
+
+
+def render_pdf_pages(
+    data: bytes, dpi: int, max_pages: int, max_pixels: int
+) -> List[bytes]:
+    try:
+        document = pdfium.PdfDocument(data)
+    except pdfium.PdfiumError as exc:
+        raise UnreadableReceipt("The PDF could not be opened.") from exc
+    try:
+        if len(document) > max_pages:
+            raise UnreadableReceipt(f"A PDF may have at most {max_pages} pages.")
+        return [
+            encode_png(page.render(scale=render_scale(page, dpi, max_pixels)).to_pil())
+            for page in document
+        ]
+    finally:
+        document.close()
+
+
+def encode_tiff_frames(image: Image.Image, max_pixels: int) -> List[bytes]:
+    pages = []
+    for frame in ImageSequence.Iterator(image):
+        # Checked before the frame is decoded.
+        if frame.width * frame.height > max_pixels:
+            raise UnreadableReceipt(
+                f"A TIFF page may have at most {max_pixels // 1_000_000} megapixels."
+            )
+        pages.append(encode_png(frame))
+    return pages
+
+
+def split_pages(data: bytes, dpi: int, max_pages: int, max_pixels: int) -> List[bytes]:
+    """
+    Split an upload into one encoded image per receipt.
+
+    PDF pages are rendered at ``dpi`` (less for pages that would exceed
+    ``max_pixels``) and TIFF frames are re-encoded, both as PNG. Any other
+    image is returned unchanged.
+    """
+    if data.startswith(PDF_MAGIC):
+        return render_pdf_pages(data, dpi, max_pages, max_pixels)
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.format != "TIFF":
+                return [data]
+            if getattr(image, "n_frames", 1) > max_pages:
+                raise UnreadableReceipt(f"A TIFF may have at most {max_pages} pages.")
+            return encode_tiff_frames(image, max_pixels)
+    except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise UnreadableReceipt("The file is not a supported image or PDF.") from exc
@@ -0,0 +1,70 @@
+"""
+Versions of the PicScan pipeline stages. They are stored with every
+``ReceiptScan`` so that ``reprocess_receipts`` can tell which stages of a
+stored receipt are out of date.
+
+Bump a version with any change that alters the output of its stage:
+
+* image: decoding and ``ImageProcessor``
+* ocr: ``TextExtractor`` OCR settings, box handling and PaddleOCR upgrades
+* parser: text formatting (``cluster_lines`` and ``TextExtractor`` cleaning),
+  ``ReceiptProcessor`` and ``parse_date``
+
+The parser version also carries a fingerprint of the NER model and tokenizer
+files, so a retrained model needs no bump.
+"""
+
+import hashlib
+from functools import lru_cache
+
+IMAGE_VERSION = "1"
+OCR_VERSION = "1"
+PARSER_VERSION = "1"
+
+# Where reprocessing of a receipt starts: the image stage re-runs everything
+# from the stored upload, the parse stage reuses the stored OCR entries.
+IMAGE = "image"
+PARSE = "parse"
+STAGES = (IMAGE, PARSE)
+
+
+@lru_cache
+def model_fingerprint():
+    from picbudget.picscan.apps import PicscanConfig
+
+    digest = hashlib.sha256()
+    for path in (
+        PicscanConfig.MODEL_PATH,
+        PicscanConfig.TOKENIZER_PATH,
+        PicscanConfig.LABEL_TOKENIZER_PATH,
+    ):
+        digest.update(path.name.encode())
+        if path.exists():
+            with open(path, "rb") as file:
+                for chunk in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+@lru_cache
+def current_versions():
+    """The ``ReceiptScan`` version fields for output of the running code."""
+    return {
+        "image_version": IMAGE_VERSION,
+        "ocr_version": OCR_VERSION,
+        "parser_version": f"{PARSER_VERSION}+{model_fingerprint()}",
+    }
+
+
+def stale_stage(scan, versions=None):
+    """The stage ``scan`` must be reprocessed from, or None when up to date."""
+    versions = versions or current_versions()
+    if (
+        scan.image_version != versions["image_version"]
+        or scan.ocr_version != versions["ocr_version"]
+    ):
+        # Preprocessed images are not stored, so OCR re-runs from the upload.
+        return IMAGE
+    if scan.parser_version != versions["parser_version"]:
+        return PARSE
+    return None
@@ -0,0 +1,153 @@
+import re
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+
+# Indonesian month names and the abbreviations printed on receipts, plus the
+# English ones some POS systems use.
+MONTHS = {
+    "jan": 1,
+    "januari": 1,
+    "january": 1,
+    "feb": 2,
+    "peb": 2,
+    "februari": 2,
+    "pebruari": 2,
+    "february": 2,
+    "mar": 3,
+    "maret": 3,
+    "march": 3,
+    "apr": 4,
+    "april": 4,
+    "mei": 5,
+    "may": 5,
+    "jun": 6,
+    "juni": 6,
+    "june": 6,
+    "jul": 7,
+    "juli": 7,
+    "july": 7,
+    "agu": 8,
+    "ags": 8,
+    "agt": 8,
+    "agus": 8,
+    "agustus": 8,
+    "aug": 8,
+    "august": 8,
+    "sep": 9,
+    "sept": 9,
+    "september": 9,
+    "okt": 10,
+    "oktober": 10,
+    "oct": 10,
+    "october": 10,
+    "nov": 11,
+    "nop": 11,
+    "nopember": 11,
+    "november": 11,
+    "des": 12,
+    "desember": 12,
+    "dec": 12,
+    "december": 12,
+}
+
+# Longest names first so "agustus" is not read as "agus".
+_MONTH_NAMES = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+# Separators inside a date. Blanks are spaces and tabs only, never newlines, so
+# a date is not assembled from numbers on different receipt lines.
+_BLANK = r"[ \t]"
+
+DATE_PATTERN = re.compile(
+    rf"""
+    (?<!\d)
+    (?:
+        (?P<iso_year>\d{{4}})(?P<iso_sep>[-/.])
+        (?P<iso_month>\d{{1,2}})(?P=iso_sep)(?P<iso_day>\d{{1,2}})
+      | (?P<day>\d{{1,2}})(?P<sep>[-/.]|{_BLANK})
+        (?P<month>\d{{1,2}})(?P=sep)(?P<year>\d{{4}}|\d{{2}})
+      | (?P<name_day>\d{{1,2}})(?:[-/.]|{_BLANK})*
+        (?P<month_name>{_MONTH_NAMES})(?![a-z])\.?(?:[-/.,]|{_BLANK})*
+        (?P<name_year>\d{{4}}|\d{{2}})
+    )
+    (?!\d)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Dates further back than this, or over a year ahead, are taken for OCR
+# misreads or other numbers.
+MAX_AGE_YEARS = 20
+
+
+class ParsedDate(NamedTuple):
+    date: datetime
+    confidence: float
+
+
+def _candidate(match: re.Match, today: date) -> Optional[ParsedDate]:
+    confidence = 1.0
+    if match.group("iso_year"):
+        year, month, day = (
+            int(match.group("iso_year")),
+            int(match.group("iso_month")),
+            int(match.group("iso_day")),
+        )
+        text_year = match.group("iso_year")
+    elif match.group("month_name"):
+        day = int(match.group("name_day"))
+        month = MONTHS[match.group("month_name").lower()]
+        text_year = match.group("name_year")
+    else:
+        day, month = int(match.group("day")), int(match.group("month"))
+        text_year = match.group("year")
+        confidence = 0.9
+        if match.group("sep") in " \t":
+            confidence -= 0.3
+        if month > 12 >= day:
+            # Month first, as on some imported POS systems.
+            day, month = month, day
+            confidence -= 0.3
+
+    year = int(text_year)
+    if len(text_year) == 2:
+        year += today.year // 100 * 100
+        confidence -= 0.1
+
+    try:
+        parsed = datetime(year, month, day)
+    except ValueError:
+        return None
+
+    days_ahead = (parsed.date() - today).days
+    if days_ahead > 366 or today.year - parsed.year > MAX_AGE_YEARS:
+        return None
+    if days_ahead > 1:
+        # A receipt cannot be from the future; a day is allowed for time zones.
+        confidence -= 0.4
+    return ParsedDate(parsed, round(max(confidence, 0.1), 2))
+
+
+def parse_date(text: str, today: Optional[date] = None) -> Optional[ParsedDate]:
+    """
+    Find the most plausible date in ``text`` in a single regex pass. Separators
+    never match a newline, so a whole receipt can be searched at once without
+    joining numbers from different lines.
+
+    Understands ``YYYY-MM-DD``, day-month-year with ``-``, ``/``, ``.``,
+    spaces or tabs between numbers, and day-month-year with Indonesian or
+    English month names (``17 Agustus 2024``, ``01-Des-24``). Two-digit years
+    are in the current century. Confidence is 1.0 for ISO dates and month
+    names with four-digit years, 0.9 for numeric day-month-year, and lower for
+    two-digit years, blank separators, month-first dates and dates up to a
+    year ahead.
+    Returns None when ``text`` has no valid date.
+    """
+    today = today or date.today()
+    best = None
+    for match in DATE_PATTERN.finditer(text):
+        candidate = _candidate(match, today)
+        if candidate and (best is None or candidate.confidence > best.confidence):
+            best = candidate
+            if best.confidence >= 1.0:
+                break
+    return best
@@ -1,7 +1,13 @@
 from paddleocr import PaddleOCR
+import logging
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
 from functools import lru_cache
+from .layout import cluster_lines
+
+logger = logging.getLogger(__name__)
 
 
 class TextExtractor:
@@ -17,18 +23,26 @@ class TextExtractor:
     EMPTY_LINE_PATTERN = re.compile(r"^\s*$\n", re.MULTILINE)
     WHITESPACE_PATTERN = re.compile(r"\s+")
 
-    def __init__(self, image: str):
-        """Initialize OCR with optimized settings."""
+    # Same cut-off PaddleOCR applies to recognised text in ``ocr()``
+    DROP_SCORE = 0.5
+
+    def __init__(self, image: str, ocr: Optional[PaddleOCR] = None):
+        """Initialize OCR with optimized settings, or reuse a loaded ``ocr``."""
         self.image = image
-        self.ocr = PaddleOCR(
+        self.ocr = ocr or self.create_ocr()
+        self.ocr_result: List[List] = []
+        self.extracted_text = self.extract_text(image)
+
+    @staticmethod
+    def create_ocr(cpu_threads: int = 4) -> PaddleOCR:
+        return PaddleOCR(
             use_angle_cls=False,
             lang="id",
             use_gpu=False,
             show_log=False,
             enable_mkldnn=True,  # Enable Intel MKL-DNN acceleration
-            cpu_threads=4,  # Adjust based on your CPU
+            cpu_threads=cpu_threads,
         )
-        self.extracted_text = self.extract_text(image)
 
     @staticmethod
     @lru_cache(maxsize=128)
@@ -55,39 +69,30 @@ class TextExtractor:
         return line
 
     @staticmethod
-    def _is_inline(
-        box1: List[Tuple[float, float]],
-        box2: List[Tuple[float, float]],
-        tolerance: int = 15,
-    ) -> bool:
-        """Check if two boxes are inline using vectorized operations."""
-        return (
-            abs(box1[0][1] - box2[0][1]) <= tolerance
-            and abs(box1[2][1] - box2[2][1]) <= tolerance
-        )
-
-    def _group_inline(self, ocr_result: List[Tuple], tolerance: int = 15) -> List[str]:
-        """Group inline text more efficiently."""
-        if not ocr_result:
-            return []
-
-        grouped_result = []
-        current_group = []
-
-        # Use enumerate for better performance than index lookups
-        for i, current in enumerate(ocr_result[:-1]):
-            current_group.append(current[1][0])
-
-            if not self._is_inline(current[0], ocr_result[i + 1][0], tolerance):
-                grouped_result.append(" ".join(current_group).lower())
-                current_group = []
+    def _group_inline(ocr_result: List[Tuple], min_overlap: float = 0.5) -> List[str]:
+        """Group OCR boxes into text lines by geometry (see ``cluster_lines``)."""
+        return cluster_lines(ocr_result, min_overlap)
+
+    @classmethod
+    def _format_lines(cls, ocr_result: List) -> str:
+        grouped_text = cls._group_inline(ocr_result)
+        cleaned_lines = [
+            cls._preprocess_text(line) for line in grouped_text if line.strip()
+        ]
+        return "\n".join(cleaned_lines)
 
-        # Add the last group
-        if ocr_result:
-            current_group.append(ocr_result[-1][1][0])
-            grouped_result.append(" ".join(current_group).lower())
-
-        return grouped_result
+    @staticmethod
+    def _to_entries(ocr_result: List) -> List[List]:
+        """PaddleOCR lines as JSON-ready ``[box, [text, score]]`` entries."""
+        return [
+            [np.asarray(box, dtype=float).tolist(), [str(text), float(score)]]
+            for box, (text, score) in ocr_result
+        ]
+
+    @classmethod
+    def format_text(cls, entries: List[List]) -> str:
+        """Receipt text from (stored) ``[box, [text, score]]`` OCR entries."""
+        return cls._format_lines(entries) if entries else ""
 
     def extract_text(self, image: str) -> str:
         """Extract text with improved error handling and performance."""
@@ -97,14 +102,86 @@ class TextExtractor:
                 print("OCR did not return any results.")
                 return ""
 
-            # Process results in a more streamlined way
-            grouped_text = self._group_inline(result[0])
-            cleaned_lines = [
-                self._preprocess_text(line) for line in grouped_text if line.strip()
-            ]
-
-            return "\n".join(cleaned_lines)
+            self.ocr_result = self._to_entries(result[0])
+            return self.format_text(self.ocr_result)
 
         except Exception as e:
             print(f"Error during text extraction: {str(e)}")
             return ""
+
+    @staticmethod
+    def _crop_box(image: np.ndarray, box: List) -> np.ndarray:
+        """Straighten one detected text box, as PaddleOCR does before recognition."""
+        points = np.asarray(box, dtype=np.float32)
+        width = int(
+            max(
+                np.linalg.norm(points[0] - points[1]),
+                np.linalg.norm(points[2] - points[3]),
+            )
+        )
+        height = int(
+            max(
+                np.linalg.norm(points[0] - points[3]),
+                np.linalg.norm(points[1] - points[2]),
+            )
+        )
+        target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+        crop = cv2.warpPerspective(
+            image,
+            cv2.getPerspectiveTransform(points, target),
+            (max(width, 1), max(height, 1)),
+            borderMode=cv2.BORDER_REPLICATE,
+            flags=cv2.INTER_CUBIC,
+        )
+        if crop.shape[0] >= crop.shape[1] * 1.5:
+            crop = np.rot90(crop)
+        return crop
+
+    @classmethod
+    def extract_batch(
+        cls, images: List[np.ndarray], ocr: Optional[PaddleOCR] = None
+    ) -> List[Optional[List[List]]]:
+        """
+        Run OCR on several receipts with one OCR model.
+
+        Text boxes are detected per image, then the crops of all images are
+        recognised together so the recognizer runs full batches. Returns the
+        ``[box, [text, score]]`` entries of each image (see ``format_text``),
+        or ``None`` when its detection fails.
+        """
+        ocr = ocr or cls.create_ocr()
+        boxes_per_image: List[Optional[List]] = []
+        crops = []
+        for index, image in enumerate(images):
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            try:
+                detected = ocr.ocr(image, rec=False, cls=False)
+            except Exception as exc:
+                logger.warning(
+                    "Could not detect text in receipt image %s: %s", index, exc
+                )
+                boxes_per_image.append(None)
+                continue
+            boxes = detected[0] if detected and detected[0] else []
+            boxes_per_image.append(boxes)
+            crops.extend(cls._crop_box(image, box) for box in boxes)
+
+        recognised = ocr.ocr(crops, det=False, cls=False)[0] if crops else []
+
+        results: List[Optional[List[List]]] = []
+        offset = 0
+        for boxes in boxes_per_image:
+            if boxes is None:
+                results.append(None)
+                continue
+            entries = [
+                [box, (text, score)]
+                for box, (text, score) in zip(
+                    boxes, recognised[offset : offset + len(boxes)]
+                )
+                if score >= cls.DROP_SCORE
+            ]
+            offset += len(boxes)
+            results.append(cls._to_entries(entries))
+        return results
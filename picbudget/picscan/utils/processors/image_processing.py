@@ -1,5 +1,8 @@
+import io
+
 import cv2
 import numpy as np
+from PIL import Image
 from functools import lru_cache
 from typing import Tuple, List, Optional
 import threading
@@ -220,3 +223,29 @@ class ImageProcessor:
         if self._preprocessed_image is None:
             self._preprocessed_image = self._preprocess_image()
         return self._preprocessed_image
+
+
+def decode_image(buffer) -> np.ndarray:
+    """
+    Decode an encoded image held in any buffer (bytes, memoryview or shared
+    memory) to BGR without copying the encoded data first.
+    """
+    image = cv2.imdecode(
+        np.frombuffer(buffer, dtype=np.uint8),
+        cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION,
+    )
+    if image is None:
+        # Formats OpenCV was built without (e.g. GIF) still go through Pillow.
+        with Image.open(io.BytesIO(buffer)) as pil_image:
+            image = cv2.cvtColor(np.array(pil_image.convert("RGB")), cv2.COLOR_RGB2BGR)
+    return image
+
+
+def preprocess_image_bytes(image_data, max_workers: int = 4) -> np.ndarray:
+    """
+    Decode an uploaded receipt and preprocess it.
+
+    Module-level and free of Django imports so it can run in a spawned
+    worker process.
+    """
+    return ImageProcessor(decode_image(image_data), max_workers).preprocess_image()
@@ -1,9 +1,11 @@
 import re
 from datetime import datetime
 from functools import lru_cache
+from itertools import chain
 from typing import List, Dict, Optional, Tuple
 import numpy as np
-from keras.utils import pad_sequences
+
+from .dates import parse_date
 
 
 class ReceiptProcessor:
@@ -25,6 +27,11 @@ class ReceiptProcessor:
     ADDRESS_INDICATORS = frozenset(["JL", "JALAN", "J1"])
     SKIP_ADDRESS = frozenset(["KEC", "KAB"])
 
+    # Token ids the model reads at once; longer receipts are read in windows
+    # that overlap by WINDOW_OVERLAP ids.
+    WINDOW = 150
+    WINDOW_OVERLAP = 30
+
     def __init__(self, model, tokenizer, label_tokenizer):
         self.model = model
         self.tokenizer = tokenizer
@@ -32,39 +39,28 @@ class ReceiptProcessor:
         self.index_to_label = {v: k for k, v in label_tokenizer.word_index.items()}
         self.index_to_label[0] = "O"
 
+        # Label of every index as one array, so a receipt decodes in a single
+        # take(); the extra last entry is "O" for indices the tokenizer lacks.
+        self.label_lookup = np.full(max(self.index_to_label) + 2, "O", dtype=object)
+        for index, label in self.index_to_label.items():
+            self.label_lookup[index] = label
+
+        # Receipts repeat many lines (store header, totals, footer); cache
+        # their tokenization per processor.
+        self._line_sequence = lru_cache(maxsize=4096)(self._tokenize_line)
+
         # Compile regex patterns once
         self._compile_regex_patterns()
-        self._initialize_date_formats()
 
     def _compile_regex_patterns(self) -> None:
         """Compile all regex patterns once during initialization."""
-        self.date_pattern = re.compile(
-            r"\b(\d{1,2}[-/\s]\d{1,2}[-/\s]\d{2,4}|\d{4}[-/\s]\d{1,2}[-/\s]\d{1,2}|\d{1,2}\s+\w+\s+\d{4})\b"
-        )
         self.qty_pattern = re.compile(r"^\d+X$")
         self.total_pattern = re.compile(r"\d+")
         self.price_pattern = re.compile(r"^\d+00$")
 
-    def _initialize_date_formats(self) -> None:
-        """Initialize date formats."""
-        self.formats = [
-            "%Y-%m-%d",
-            "%d/%m/%Y",
-            "%d %B %Y",
-            "%m-%d-%Y",
-            "%d %b %Y",
-            "%Y.%m.%d",
-            "%d-%m-%Y",
-            "%m/%d/%Y",
-            "%d %b %Y",
-            "%Y.%m.%d",
-            "%d-%m-%y",
-            "%d/%m/%y",
-            "%d.%m.%y",
-        ]
-
+    @staticmethod
     @lru_cache(maxsize=128)
-    def _is_valid_price(self, word: str) -> bool:
+    def _is_valid_price(word: str) -> bool:
         """Check if a word is a valid price with caching."""
         if not word.endswith("00"):
             return False
@@ -132,121 +128,148 @@ class ReceiptProcessor:
             return ["ADDRESS"] * len(words)
         return labels
 
-    @lru_cache(maxsize=64)
-    def extract_date(self, text: str) -> str:
-        """Extract date with caching."""
-        match = self.date_pattern.search(text)
-        if match:
-            date_str = match.group(0)
-            for date_format in self.formats:
-                try:
-                    date_obj = datetime.strptime(date_str, date_format)
-                    if (
-                        date_format in ["%d-%m-%y", "%d/%m/%y", "%d.%m.%y"]
-                        and date_obj.year < 100
-                    ):
-                        current_century = datetime.now().year // 100 * 100
-                        date_obj = date_obj.replace(
-                            year=current_century + date_obj.year
-                        )
-                    # Return date in datetime format
-                    return date_obj
-                except ValueError:
-                    continue
-        return datetime.now()
-
-    def extract_items(
-        self, text_lines: List[str], label_lines: List[List[str]], current_idx: int
-    ) -> Optional[Dict[str, any]]:
-        """Extract items more efficiently."""
-        line = text_lines[current_idx].split()
-        labels = label_lines[current_idx]
-
-        item_name = " ".join(
-            word for word, label in zip(line, labels) if label == "ITEM_NAME"
-        )
-
-        if not item_name:
-            return None
-
-        # Find price in current and next line
-        price = None
-        for i in range(2):  # Check current and next line
-            if current_idx + i >= len(text_lines):
-                break
-
-            check_line = text_lines[current_idx + i].split()
-            check_labels = label_lines[current_idx + i]
-
-            prices = [
-                int(word)
-                for word, label in zip(check_line, check_labels)
-                if label == "PRICE" and self._is_valid_price(word)
-            ]
-
-            if prices:
-                price = prices[-1]
-                break
-
-        if price is not None:
-            return {"item_name": item_name, "item_price": price}
-        return None
+    def _tokenize_line(self, line: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Token ids of a line, and how many of them each whitespace word yields."""
+        sequences = self.tokenizer.texts_to_sequences(self._clean_text(line).split())
+        return tuple(chain.from_iterable(sequences)), tuple(map(len, sequences))
+
+    def _sequence(self, text: str) -> Tuple[List[int], np.ndarray]:
+        """
+        Token ids of ``text`` and, for every whitespace word, the position of its
+        first token id, or -1 when the tokenizer drops the word (punctuation).
+        """
+        ids: List[int] = []
+        counts: List[int] = []
+        for line in text.split("\n"):
+            line_ids, line_counts = self._line_sequence(line)
+            ids.extend(line_ids)
+            counts.extend(line_counts)
+        lengths = np.asarray(counts, dtype=np.int64)
+        starts = np.cumsum(lengths) - lengths
+        return ids, np.where(lengths > 0, starts, -1)
+
+    def _window_starts(self, length: int) -> List[int]:
+        if length <= self.WINDOW:
+            return [0]
+        stride = self.WINDOW - self.WINDOW_OVERLAP
+        # The last window ends with the receipt instead of running into padding.
+        return list(range(0, length - self.WINDOW, stride)) + [length - self.WINDOW]
+
+    def _decode_labels(self, predicted_indices: np.ndarray) -> List[str]:
+        indices = np.minimum(predicted_indices, len(self.label_lookup) - 1)
+        return self.label_lookup.take(indices).tolist()
+
+    def _predict_labels(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Label index of every whitespace word of every text, from one model call.
+
+        Texts longer than ``WINDOW`` token ids are split into overlapping
+        windows. The windows of all texts are predicted as one batch, and where
+        windows overlap every label keeps its highest probability. A word takes
+        the label of its first token id.
+        """
+        sequences = [self._sequence(text) for text in texts]
+        windows = [
+            (text_index, start)
+            for text_index, (ids, _) in enumerate(sequences)
+            for start in self._window_starts(len(ids))
+        ]
+        batch = np.zeros((len(windows), self.WINDOW), dtype=np.int32)
+        for row, (text_index, start) in enumerate(windows):
+            ids = sequences[text_index][0][start : start + self.WINDOW]
+            batch[row, : len(ids)] = ids
+        predictions = self.model.predict(batch, verbose=0)
+
+        probabilities = [
+            np.zeros((len(ids), predictions.shape[-1]), dtype=predictions.dtype)
+            for ids, _ in sequences
+        ]
+        for row, (text_index, start) in enumerate(windows):
+            merged = probabilities[text_index][start : start + self.WINDOW]
+            np.maximum(merged, predictions[row, : len(merged)], out=merged)
+
+        word_labels = []
+        for (_, word_starts), text_probabilities in zip(sequences, probabilities):
+            # Label 0 ("O") is appended so words without tokens (-1) read it.
+            token_labels = np.append(text_probabilities.argmax(axis=-1), 0)
+            word_labels.append(token_labels[word_starts])
+        return word_labels
+
+    def process_receipts(self, texts: List[str]) -> List[Dict[str, any]]:
+        """Process several receipts with a single batched prediction."""
+        if not texts:
+            return []
+        return [
+            self._parse_receipt(text, predicted_indices)
+            for text, predicted_indices in zip(texts, self._predict_labels(texts))
+        ]
 
     def process_receipt(self, text: str) -> Dict[str, any]:
         """Process receipt more efficiently."""
-        # Clean and prepare text
+        return self.process_receipts([text])[0]
+
+    def _parse_receipt(
+        self, text: str, predicted_indices: np.ndarray
+    ) -> Dict[str, any]:
         clean_text = self._clean_text(text)
-        sequences = pad_sequences(
-            self.tokenizer.texts_to_sequences([clean_text]), maxlen=150, padding="post"
-        )
-
-        # Predict labels
-        predictions = self.model.predict(sequences, verbose=0)
-        predicted_indices = np.argmax(predictions, axis=-1)[0]
-
-        # Process text lines
-        text_lines = text.strip().split("\n")
-        token_index = 0
-        processed_lines = []
-
-        for line in text_lines:
-            tokens = line.split()
-            if not tokens:
-                continue
-
-            labels = [
-                self.index_to_label.get(idx, "O")
-                for idx in predicted_indices[token_index : token_index + len(tokens)]
-            ]
-            token_index += len(tokens)
-            processed_lines.append((line, tokens, labels))
 
-        # Extract information
+        # Whitespace tokens of all non-empty lines, with each line's offset
+        # into them, labelled and label-corrected in one go.
+        lines = []
+        line_words = []
+        for line in text.strip().split("\n"):
+            words = line.split()
+            if words:
+                lines.append(line)
+                line_words.append(words)
+        offsets = np.cumsum([0] + [len(words) for words in line_words]).tolist()
+        words = list(chain.from_iterable(line_words))
+        raw_labels = self._decode_labels(predicted_indices[: len(words)])
+        corrected_labels = self.correct_labels(words, raw_labels)
+
+        # Extract information in one pass; an item line without a price takes
+        # the last price of the next line.
         items = []
         address = None
-        date = None
+        pending_item = None
 
-        for i, (line, tokens, labels) in enumerate(processed_lines):
-            # Apply corrections
-            labels = self.correct_labels(tokens, labels)
-            labels = self.correct_address_labels(tokens, labels)
+        for i, line in enumerate(lines):
+            start, end = offsets[i], offsets[i + 1]
+            tokens, labels = line_words[i], raw_labels[start:end]
 
-            if "ITEM_NAME" in labels:
-                item = self.extract_items(
-                    [p[0] for p in processed_lines], [p[2] for p in processed_lines], i
+            prices = [
+                word
+                for word, label in zip(tokens, labels)
+                if label == "PRICE" and self._is_valid_price(word)
+            ]
+            price = int(prices[-1]) if prices else None
+            if pending_item is not None:
+                if price is not None:
+                    items.append({"item_name": pending_item, "item_price": price})
+                pending_item = None
+
+            corrected = self.correct_address_labels(
+                tokens, corrected_labels[start:end]
+            )
+            if "ITEM_NAME" in corrected:
+                item_name = " ".join(
+                    word for word, label in zip(tokens, labels) if label == "ITEM_NAME"
                 )
-                if item:
-                    items.append(item)
+                if item_name and price is not None:
+                    items.append({"item_name": item_name, "item_price": price})
+                elif item_name:
+                    pending_item = item_name
 
-            if not address and "ADDRESS" in labels:
+            if not address and "ADDRESS" in corrected:
                 address = line
 
-            if not date:
-                date = self.extract_date(line)
+        # The most confident date anywhere on the receipt
+        date = parse_date(text)
 
         return {
             "total": self.get_total_entities(clean_text),
-            "date": date,
+            "date": date.date if date else datetime.now(),
+            "date_confidence": date.confidence if date else 0.0,
             "address": address,
             "items": items,
         }
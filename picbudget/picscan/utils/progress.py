@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from functools import lru_cache
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+UPLOADED = "uploaded"
+PREPROCESSED = "preprocessed"
+OCR_DONE = "ocr_done"
+PARSED = "parsed"
+TRANSACTION_CREATED = "transaction_created"
+COMPLETED = "completed"
+FAILED = "failed"
+FINAL_STAGES = frozenset([COMPLETED, FAILED])
+
+
+def progress_group(job_id):
+    return f"picscan.scan.{job_id}"
+
+
+def progress_cache_key(job_id):
+    return f"picscan:progress:{job_id}"
+
+
+class ProgressPublisher:
+    """
+    Fire-and-forget delivery of scan events to the channel layer.
+
+    Sync callers (views, Celery tasks) only hand the event to a background
+    event loop owned by this process, so a slow or unreachable channel layer
+    never holds up the pipeline. Events are sent in order; when more than
+    ``maxsize`` are waiting, new ones are dropped. Callers that already run in
+    an event loop get the send scheduled on that loop instead.
+
+    The last event of every job is also cached for ``PICSCAN_PROGRESS_TTL``
+    seconds so a client that subscribes late still learns the current stage.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._queue = None
+        self._tasks = set()
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            self._queue = asyncio.Queue(self.maxsize)
+            loop.create_task(self._drain())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="picscan-progress", daemon=True).start()
+        started.wait()
+        self._loop = loop
+
+    def _ensure_started(self):
+        # A forked worker (e.g. Celery prefork) does not inherit the thread.
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._start()
+                    self._pid = os.getpid()
+        return self._loop
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(
+                "Dropped %s progress event for scan %s", event["stage"], event["job_id"]
+            )
+
+    async def _drain(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                await self.send(event)
+            finally:
+                self._queue.task_done()
+
+    async def send(self, event):
+        try:
+            await cache.aset(
+                progress_cache_key(event["job_id"]),
+                event,
+                settings.PICSCAN_PROGRESS_TTL,
+            )
+            layer = get_channel_layer()
+            if layer is not None:
+                await layer.group_send(
+                    progress_group(event["job_id"]),
+                    {"type": "scan.progress", "event": event},
+                )
+        except Exception:
+            logger.exception("Could not publish progress for scan %s", event["job_id"])
+
+    def publish(self, event):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._ensure_started().call_soon_threadsafe(self._put, event)
+        else:
+            task = loop.create_task(self.send(event))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def flush(self, timeout=None):
+        """Block until the events handed over so far have been sent."""
+        if self._pid != os.getpid():
+            return
+        asyncio.run_coroutine_threadsafe(self._queue.join(), self._loop).result(
+            timeout
+        )
+
+
+@lru_cache
+def get_progress_publisher():
+    return ProgressPublisher(settings.PICSCAN_PROGRESS_QUEUE_SIZE)
+
+
+def publish_progress(job_id, stage, **data):
+    """Announce that scan ``job_id`` reached ``stage``; returns immediately."""
+    event = {
+        "job_id": str(job_id),
+        "stage": stage,
+        "final": stage in FINAL_STAGES,
+        "at": timezone.now(),
+        "data": data,
+    }
+    # Round-trip through JSON so dates, decimals and UUIDs survive msgpack.
+    get_progress_publisher().publish(json.loads(json.dumps(event, cls=JSONEncoder)))
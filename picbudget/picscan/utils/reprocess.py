@@ -0,0 +1,150 @@
+"""
+Reprocessing of stored receipts after a PicScan pipeline change.
+
+Each ``ReceiptScan`` re-runs only the stages whose version changed (see
+``picscan.utils.pipeline``): a new NER model or parser reuses the stored OCR
+entries, an image or OCR change reads the upload again. Scans are walked in
+primary key order, so a run can resume from the last key it reached.
+
+PicScan transactions stored without a scan can be backfilled: their
+``ReceiptScan`` is created empty and filled in from the image stage.
+"""
+
+import logging
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from picbudget.transactions.models import Transaction
+
+from ..models import ReceiptScan
+from .pipeline import IMAGE, PARSE, current_versions, stale_stage
+from .scan import ocr_receipt_images, parse_receipts
+
+logger = logging.getLogger(__name__)
+
+
+def stale_scans(after=None, before=None, from_stage=None):
+    """
+    Scans with a primary key in ``(after, before]`` that are out of date, in
+    key order; with ``from_stage`` every scan in the range.
+    """
+    scans = ReceiptScan.objects.select_related("transaction").order_by("pk")
+    if after is not None:
+        scans = scans.filter(pk__gt=after)
+    if before is not None:
+        scans = scans.filter(pk__lte=before)
+    if from_stage is None:
+        scans = scans.exclude(**current_versions())
+    return scans
+
+
+def count_stale_scans():
+    """Out of date scans per stage they must be reprocessed from."""
+    versions = current_versions()
+    image_versions = {
+        "image_version": versions["image_version"],
+        "ocr_version": versions["ocr_version"],
+    }
+    return {
+        IMAGE: ReceiptScan.objects.exclude(**image_versions).count(),
+        PARSE: ReceiptScan.objects.filter(**image_versions)
+        .exclude(parser_version=versions["parser_version"])
+        .count(),
+    }
+
+
+def unscanned_transactions(after=None):
+    """
+    PicScan transactions with a stored receipt but no ``ReceiptScan``, with a
+    primary key after ``after``, in key order.
+    """
+    transactions = (
+        Transaction.objects.filter(method="picscan", scan__isnull=True)
+        .exclude(receipt__isnull=True)
+        .exclude(receipt="")
+        .order_by("pk")
+    )
+    if after is not None:
+        transactions = transactions.filter(pk__gt=after)
+    return transactions
+
+
+def backfill_scans(transactions):
+    """
+    Create and fill the missing scans of ``transactions`` from the image stage.
+
+    Scans whose receipt could not be read are deleted again rather than kept
+    empty. Returns the metrics of ``reprocess_scans``.
+    """
+    scans = ReceiptScan.objects.bulk_create(
+        ReceiptScan(transaction=transaction) for transaction in transactions
+    )
+    metrics = reprocess_scans(scans, IMAGE)
+    ReceiptScan.objects.filter(
+        pk__in=[scan.pk for scan in scans if not scan.image_version]
+    ).delete()
+    return metrics
+
+
+def reprocess_scans(scans, from_stage=None):
+    """
+    Re-run the stale stages of ``scans`` (all of them from ``from_stage`` when
+    given) and store the new output with one ``bulk_update``.
+
+    Scans whose receipt file is gone or can no longer be read are left as they
+    are. The transactions created from the scans are not changed. Returns
+    metrics for the task result.
+    """
+    versions = current_versions()
+    metrics = {"scans": len(scans), "rescanned": 0, "reparsed": 0, "missing": 0}
+
+    reparse, rescan, images = [], [], []
+    for scan in scans:
+        if (from_stage or stale_stage(scan, versions)) != IMAGE:
+            reparse.append(scan)
+            continue
+        receipt = scan.transaction.receipt
+        try:
+            if not receipt:
+                raise FileNotFoundError(scan.pk)
+            with default_storage.open(receipt.name) as file:
+                images.append(file.read())
+        except OSError:
+            metrics["missing"] += 1
+            continue
+        rescan.append(scan)
+
+    ocr_results = ocr_receipt_images(images) if images else []
+    for scan, entries in zip(rescan, ocr_results):
+        if isinstance(entries, Exception) or entries is None:
+            continue
+        scan.ocr_result = entries
+        scan.image_version = versions["image_version"]
+        scan.ocr_version = versions["ocr_version"]
+        reparse.append(scan)
+        metrics["rescanned"] += 1
+
+    now = timezone.now()
+    for scan, output in zip(reparse, parse_receipts([s.ocr_result for s in reparse])):
+        scan.text = output.text
+        scan.result = output.result
+        scan.parser_version = versions["parser_version"]
+        scan.updated_at = now
+    ReceiptScan.objects.bulk_update(
+        reparse,
+        [
+            "image_version",
+            "ocr_version",
+            "parser_version",
+            "ocr_result",
+            "text",
+            "result",
+            "updated_at",
+        ],
+    )
+    metrics["reparsed"] = len(reparse)
+    metrics["failed"] = len(rescan) - metrics["rescanned"]
+    if metrics["missing"] or metrics["failed"]:
+        logger.warning("Some receipts could not be reprocessed: %s", metrics)
+    return metrics
@@ -0,0 +1,307 @@
+import logging
+import multiprocessing
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, List, NamedTuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+
+from picbudget.core.utils.misc import apply_on_commit
+from picbudget.transactions.models.detail import TransactionDetail
+from picbudget.transactions.models.transaction import Transaction
+from picbudget.transactions.utils.item_normalizer import assign_canonical_items
+
+from ..models import ReceiptScan
+from . import workers
+from .pipeline import current_versions
+from .processors import extract_text
+from .processors.image_processing import decode_image, preprocess_image_bytes
+from .progress import (
+    COMPLETED,
+    OCR_DONE,
+    PARSED,
+    PREPROCESSED,
+    TRANSACTION_CREATED,
+    publish_progress,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ScanOutput(NamedTuple):
+    """What the pipeline read from one receipt (stored as a ``ReceiptScan``)."""
+
+    ocr_result: List[List]
+    text: str
+    result: Dict
+
+
+@lru_cache
+def get_scan_workers():
+    """The scan worker pool of this process, or None to scan in-process."""
+    # Celery prefork workers are daemonic and may not start child processes.
+    if not settings.PICSCAN_SCAN_WORKERS or multiprocessing.current_process().daemon:
+        return None
+    return workers.ScanWorkerPool(
+        settings.PICSCAN_SCAN_WORKERS, settings.PICSCAN_SCAN_WORKER_THREADS
+    )
+
+
+def replace_scan_workers():
+    # A worker died (e.g. killed for memory): start a fresh pool next time.
+    logger.warning("PicScan worker pool broke, replacing it")
+    pool = get_scan_workers()
+    get_scan_workers.cache_clear()
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def submit_scans(images):
+    """Futures for the OCR entries of ``images`` on the worker pool, or None."""
+    pool = get_scan_workers()
+    if pool is None:
+        return None
+    try:
+        return [pool.submit(data) for data in images]
+    except BrokenProcessPool:
+        replace_scan_workers()
+        return None
+
+
+def extract_with_workers(images):
+    """
+    OCR entries of each encoded image, from the worker pool when there is one
+    and in-process otherwise. Failed images yield their exception.
+    """
+    futures = submit_scans(images)
+    results = []
+    for index, image_data in enumerate(images):
+        try:
+            if futures is not None:
+                try:
+                    results.append(futures[index].result())
+                    continue
+                except BrokenProcessPool:
+                    # Finish this batch in-process.
+                    replace_scan_workers()
+                    futures = None
+            results.append(workers.extract_receipt_ocr(decode_image(image_data)))
+        except Exception as exc:
+            logger.warning("Could not scan receipt image %s: %s", index, exc)
+            results.append(exc)
+    return results
+
+
+def preprocess_images(images):
+    """Preprocess receipt images in-process; failed images yield their exception."""
+    processed = []
+    for index, image_data in enumerate(images):
+        try:
+            processed.append(preprocess_image_bytes(image_data))
+        except Exception as exc:
+            logger.warning("Could not preprocess receipt image %s: %s", index, exc)
+            processed.append(exc)
+    return processed
+
+
+def ocr_receipt_images(images, job_id=None):
+    """
+    OCR entries of each encoded image: its exception when the image could not
+    be processed, None when no text could be detected.
+
+    Receipts are spread over the scan worker pool, or without one preprocessed
+    in turn and OCR-recognised together with this process's model. With a
+    ``job_id`` the preprocessed stage is reported.
+    """
+    if get_scan_workers() is not None:
+        ocr_results = extract_with_workers(images)
+    else:
+        processed = preprocess_images(images)
+        readable = [
+            index
+            for index, image in enumerate(processed)
+            if not isinstance(image, Exception)
+        ]
+        with workers.process_ocr() as ocr:
+            batch = extract_text.TextExtractor.extract_batch(
+                [processed[index] for index in readable], ocr
+            )
+        ocr_results = list(processed)
+        for index, entries in zip(readable, batch):
+            ocr_results[index] = entries
+
+    if job_id is not None:
+        publish_progress(
+            job_id,
+            PREPROCESSED,
+            receipts=sum(not isinstance(item, Exception) for item in ocr_results),
+        )
+    return ocr_results
+
+
+def parse_receipts(ocr_results):
+    """``ScanOutput`` of each list of OCR entries, with one NER prediction."""
+    texts = [extract_text.TextExtractor.format_text(entries) for entries in ocr_results]
+    processor = apps.get_app_config("picscan").receipt_processor
+    results = processor.process_receipts(texts)
+    return [ScanOutput(*scan) for scan in zip(ocr_results, texts, results)]
+
+
+def scan_receipt_image(job_id, image_data):
+    """
+    Run image processing, OCR and NER on one receipt, reporting each stage.
+    Returns a ``ScanOutput``.
+    """
+    if get_scan_workers() is None:
+        processed_image = preprocess_image_bytes(image_data)
+        publish_progress(job_id, PREPROCESSED)
+        with workers.process_ocr() as ocr:
+            extractor = extract_text.TextExtractor(processed_image, ocr)
+        ocr_result, text = extractor.ocr_result, extractor.extracted_text
+    else:
+        [ocr_result] = extract_with_workers([image_data])
+        if isinstance(ocr_result, Exception):
+            raise ocr_result
+        # Both stages ran in the worker.
+        publish_progress(job_id, PREPROCESSED)
+        text = extract_text.TextExtractor.format_text(ocr_result)
+    publish_progress(job_id, OCR_DONE, lines=text.count("\n") + 1)
+
+    processor = apps.get_app_config("picscan").receipt_processor
+    scan = ScanOutput(ocr_result, text, processor.process_receipt(text))
+    publish_progress(job_id, PARSED, result=scan.result)
+    return scan
+
+
+def scan_receipt_images(job_id, images):
+    """
+    Batch counterpart of ``scan_receipt_image``: OCR through
+    ``ocr_receipt_images``, then one NER prediction for all receipts. Returns
+    one ``{"scan": ScanOutput}`` or ``{"error": ...}`` per image, in order.
+    """
+    outcomes = [{} for _ in images]
+    recognised = []
+    for index, entries in enumerate(ocr_receipt_images(images, job_id)):
+        if isinstance(entries, Exception):
+            outcomes[index]["error"] = "Could not process the receipt image."
+        elif entries is None:
+            outcomes[index]["error"] = "Could not read the receipt text."
+        else:
+            recognised.append((index, entries))
+    publish_progress(job_id, OCR_DONE, receipts=len(recognised))
+
+    scans = parse_receipts([entries for _, entries in recognised])
+    for (index, _), scan in zip(recognised, scans):
+        outcomes[index]["scan"] = scan
+    publish_progress(job_id, PARSED, receipts=len(scans))
+    return outcomes
+
+
+def create_scan_transactions(wallet, scans):
+    """
+    Store scanned receipts, given as ``(path, ScanOutput)`` pairs, as
+    unconfirmed transactions with their ``ReceiptScan``, using one
+    ``bulk_create`` per table.
+    """
+    # Imported here because the task module imports this one.
+    from picbudget.project.task import generate_receipt_variants
+
+    transactions = [
+        Transaction(
+            wallet=wallet,
+            amount=scan.result["total"],
+            transaction_date=scan.result["date"],
+            location=scan.result.get("location"),
+            receipt=path,
+            method="picscan",
+            status="unconfirmed",
+        )
+        for path, scan in scans
+    ]
+    Transaction.objects.bulk_create(transactions)
+
+    details = [
+        TransactionDetail(
+            transaction=transaction,
+            item_name=item["item_name"],
+            item_price=item["item_price"],
+        )
+        for transaction, (_, scan) in zip(transactions, scans)
+        for item in scan.result["items"]
+    ]
+    TransactionDetail.objects.bulk_create(
+        assign_canonical_items(details, wallet.user_id)
+    )
+
+    versions = current_versions()
+    ReceiptScan.objects.bulk_create(
+        ReceiptScan(
+            transaction=transaction,
+            ocr_result=scan.ocr_result,
+            text=scan.text,
+            result=scan.result,
+            **versions,
+        )
+        for transaction, (_, scan) in zip(transactions, scans)
+    )
+
+    transaction_ids = [str(transaction.id) for transaction in transactions]
+
+    def generate_variants():
+        for transaction_id in transaction_ids:
+            generate_receipt_variants.delay(transaction_id)
+
+    apply_on_commit(generate_variants)
+    return transactions
+
+
+def create_scan_transaction(wallet, path, scan):
+    """Store a scanned receipt as an unconfirmed transaction with its items."""
+    return create_scan_transactions(wallet, [(path, scan)])[0]
+
+
+def save_scan_results(job_id, wallet, paths, urls, outcomes):
+    """
+    Turn ``scan_receipt_images`` outcomes into the per-receipt response.
+
+    With a ``wallet``, every successful scan becomes a transaction (created in
+    bulk). The final progress events are sent once the surrounding database
+    transaction commits.
+    """
+    # Imported here because the serializer module imports the task module.
+    from picbudget.transactions.serializers.transaction import TransactionSerializer
+
+    receipts = []
+    scanned = []
+    for index, (url, outcome) in enumerate(zip(urls, outcomes)):
+        receipt = {"index": index, "path": url}
+        if "scan" in outcome:
+            receipt["result"] = outcome["scan"].result
+            scanned.append((receipt, outcome["scan"]))
+        else:
+            receipt["error"] = outcome["error"]
+        receipts.append(receipt)
+
+    if wallet is not None and scanned:
+        transactions = create_scan_transactions(
+            wallet, [(paths[receipt["index"]], scan) for receipt, scan in scanned]
+        )
+        prefetch_related_objects(transactions, "labels")
+        serialized = TransactionSerializer(transactions, many=True).data
+        for (receipt, _), data in zip(scanned, serialized):
+            data["receipt"] = receipt["path"]
+            receipt["transaction"] = data
+
+    def announce():
+        if wallet is not None and scanned:
+            publish_progress(
+                job_id,
+                TRANSACTION_CREATED,
+                transactions=[receipt["transaction"] for receipt, _ in scanned],
+            )
+        publish_progress(job_id, COMPLETED, receipts=receipts)
+
+    apply_on_commit(announce)
+    return receipts
@@ -0,0 +1,76 @@
+import io
+import mmap
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from PIL import Image
+
+from .pages import UnreadableReceipt
+
+# Leading bytes of the accepted receipt formats, with the Pillow format that
+# reads their header and the extension the upload is stored with
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": ("JPEG", ".jpg"),
+    b"\x89PNG\r\n\x1a\n": ("PNG", ".png"),
+}
+
+
+class ImageHeader(NamedTuple):
+    format: str
+    extension: str
+    width: int
+    height: int
+
+
+def read_image_header(file) -> ImageHeader:
+    """
+    Format and size of a receipt image, from its magic bytes and header only.
+
+    Only the header is parsed (Pillow opens images lazily); the pixel data is
+    not read or decoded. ``file`` is rewound afterwards.
+    """
+    file.seek(0)
+    magic = file.read(8)
+    file.seek(0)
+    for signature, (image_format, extension) in IMAGE_SIGNATURES.items():
+        if magic.startswith(signature):
+            break
+    else:
+        raise UnreadableReceipt("The file is not a JPEG or PNG image.")
+
+    try:
+        with Image.open(file, formats=[image_format]) as image:
+            width, height = image.size
+    except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise UnreadableReceipt("The image header could not be read.") from exc
+    finally:
+        file.seek(0)
+    return ImageHeader(image_format, extension, width, height)
+
+
+@contextmanager
+def upload_buffer(upload):
+    """
+    The bytes of an uploaded file as a read-only buffer, without copying them.
+
+    Uploads Django kept in memory are exposed through their ``BytesIO``;
+    uploads streamed to a temporary file are memory-mapped. Other file objects
+    are read into memory.
+    """
+    file = getattr(upload, "file", upload)
+    if isinstance(file, io.BytesIO):
+        view = file.getbuffer()
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+
+    try:
+        fileno = file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        file.seek(0)
+        yield file.read()
+        return
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
@@ -0,0 +1,140 @@
+"""
+Worker processes for the CPU-bound PicScan stages: decoding, OpenCV
+preprocessing and PaddleOCR.
+
+Each worker loads the OCR model once, in its initializer, and limits OpenCV,
+OpenMP, MKL and OpenBLAS to its share of the cores, so all workers together
+run about one thread per core. Encoded images reach the workers through shared
+memory rather than being pickled into every call.
+
+This module is imported by the spawned workers and must stay free of Django
+and of module-level numpy/OpenCV/Paddle imports.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+
+# Read by the native libraries when they load, so they are set before the
+# worker first imports numpy, OpenCV or Paddle.
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# Threads this process may use; set in workers, None (library defaults) elsewhere
+_threads = None
+_ocr_lock = threading.Lock()
+
+
+def threads_per_worker(workers, cores=None):
+    cores = cores or os.cpu_count() or 1
+    return max(1, cores // max(1, workers))
+
+
+def _initialize(threads):
+    global _threads
+    _threads = threads
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+
+    import cv2
+
+    cv2.setNumThreads(threads)
+    _load_ocr()
+
+
+@lru_cache
+def _load_ocr():
+    from .processors.extract_text import TextExtractor
+
+    if _threads is None:
+        return TextExtractor.create_ocr()
+    return TextExtractor.create_ocr(cpu_threads=_threads)
+
+
+@contextmanager
+def process_ocr():
+    """The OCR model of this process, loaded on first use, for one caller at a time."""
+    # PaddleOCR predictors are not thread-safe.
+    with _ocr_lock:
+        yield _load_ocr()
+
+
+def extract_receipt_ocr(image):
+    """
+    Preprocess one decoded (BGR) receipt image and run OCR on it, returning
+    its ``[box, [text, score]]`` entries (see ``TextExtractor.format_text``).
+    """
+    from .processors.extract_text import TextExtractor
+    from .processors.image_processing import ImageProcessor
+
+    processed = ImageProcessor(image, max_workers=_threads or 4).preprocess_image()
+    with process_ocr() as ocr:
+        return TextExtractor(processed, ocr=ocr).ocr_result
+
+
+def _extract_shared(name, size):
+    from .processors.image_processing import decode_image
+
+    shared = SharedMemory(name=name)
+    try:
+        # Decoded straight from the shared block; the view is released before
+        # anything that may fail later can keep a reference to it.
+        with shared.buf[:size] as view:
+            image = decode_image(view)
+    finally:
+        shared.close()
+    return extract_receipt_ocr(image)
+
+
+def _ready():
+    return os.getpid()
+
+
+class ScanWorkerPool:
+    """A process pool that turns encoded receipt images into OCR entries."""
+
+    def __init__(self, workers, threads=None):
+        self.workers = workers
+        self.threads = threads or threads_per_worker(workers)
+        # Spawned rather than forked: the web server process runs threads (and
+        # PaddleOCR/MKL thread pools) that a fork would copy mid-flight.
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize,
+            initargs=(self.threads,),
+        )
+
+    def submit(self, image_data):
+        """A future for the OCR entries of one encoded image (bytes or any buffer)."""
+        size = len(image_data)
+        shared = SharedMemory(create=True, size=max(size, 1))
+        shared.buf[:size] = image_data
+
+        def release(_future):
+            shared.close()
+            shared.unlink()
+
+        try:
+            future = self.executor.submit(_extract_shared, shared.name, size)
+        except BaseException:
+            release(None)
+            raise
+        future.add_done_callback(release)
+        return future
+
+    def warm_up(self):
+        """Start every worker, loading its model, ahead of the first receipt."""
+        for future in [self.executor.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait, cancel_futures=True)
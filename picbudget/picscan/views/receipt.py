@@ -1,29 +1,41 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from ..serializers.receipt import ReceiptSerializer
+from ..serializers.receipt import ReceiptBatchSerializer, ReceiptSerializer
+from ..throttles import (
+    BatchScanRateThrottle,
+    ScanRateThrottle,
+    scanner_slot,
+)
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
 from picbudget.transactions.models.transaction import Transaction
-from picbudget.transactions.models.detail import TransactionDetail
 from picbudget.wallets.models.wallet import Wallet
 from picbudget.accounts.models.accounts import User
 
 from picbudget.transactions.serializers.transaction import TransactionSerializer
+from picbudget.core.utils.misc import apply_on_commit
+from picbudget.project.task import scan_receipt, scan_receipt_batch
 
-import os
+from contextlib import nullcontext
 from uuid import uuid4
 
-from django.apps import apps
-from PIL import Image
-import numpy as np
-import cv2
-from ..utils.processors import (
-    image_processing,
-    extract_text,
+from ..routing import scan_progress_url
+from ..utils.progress import (
+    COMPLETED,
+    TRANSACTION_CREATED,
+    UPLOADED,
+    publish_progress,
+)
+from ..utils.scan import (
+    create_scan_transaction,
+    save_scan_results,
+    scan_receipt_image,
+    scan_receipt_images,
 )
+from ..utils.uploads import upload_buffer
 
 import logging
 
@@ -31,82 +43,175 @@ logger = logging.getLogger(__name__)
 
 
 class ReceiptView(APIView):
+    """
+    Scan an uploaded receipt.
+
+    Every upload gets a ``job_id`` whose stage events are streamed on
+    ``progress_url`` (see ``ScanProgressConsumer``). With ``background=true``
+    the scan runs in a Celery task and the request returns 202 right after
+    the upload; otherwise the result is returned as before.
+    """
+
     permission_classes = [AllowAny]
+    throttle_classes = [ScanRateThrottle]
 
-    def _process_image(self, image_data):
-        image = cv2.cvtColor(
-            np.array(Image.open(ContentFile(image_data))), cv2.COLOR_RGB2BGR
-        )
-        return image_processing.ImageProcessor(image).preprocess_image()
-
-    def _save_transaction_details(self, transaction, items):
-        TransactionDetail.objects.bulk_create(
-            [
-                TransactionDetail(
-                    transaction=transaction,
-                    item_name=item["item_name"],
-                    item_price=item["item_price"],
-                )
-                for item in items
-            ]
-        )
+    def _get_wallet(self, data):
+        if "user_id" not in data or "wallet_id" not in data:
+            return None
+        user = User.objects.get(id=data["user_id"])
+        return Wallet.objects.get(id=data["wallet_id"], user=user)
 
     def post(self, request):
         serializer = ReceiptSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        receipt = serializer.validated_data["receipt"]
-        image_data = receipt.read()
-
-        # Save file with UUID
-        file_ext = os.path.splitext(receipt.name)[1]
-        path = default_storage.save(
-            f"receipts/picscan/{uuid4()}{file_ext}", ContentFile(image_data)
-        )
-        url = request.build_absolute_uri(default_storage.url(path))
+        try:
+            wallet = self._get_wallet(request.data)
+        except (User.DoesNotExist, Wallet.DoesNotExist):
+            return Response(
+                {"error": "Invalid user_id or wallet_id"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        # Process image and extract text
-        processed_image = self._process_image(image_data)
-        extracted_text = extract_text.TextExtractor(processed_image).extracted_text
+        file_ext, receipt = serializer.validated_data["receipt"]
+        background = serializer.validated_data["background"]
+
+        # Take the OCR slot first, so a busy scanner leaves no upload or job
+        with nullcontext() if background else scanner_slot():
+            # Save file under the job id, streamed to storage in chunks
+            job_id = uuid4()
+            path = default_storage.save(f"receipts/picscan/{job_id}{file_ext}", receipt)
+            url = request.build_absolute_uri(default_storage.url(path))
+            publish_progress(job_id, UPLOADED, path=url)
+            progress_url = scan_progress_url(request, job_id)
+
+            if background:
+                wallet_id = str(wallet.id) if wallet else None
+                apply_on_commit(
+                    lambda: scan_receipt.delay(str(job_id), path, url, wallet_id)
+                )
+                return Response(
+                    {
+                        "data": {
+                            "job_id": job_id,
+                            "path": url,
+                            "progress_url": progress_url,
+                        }
+                    },
+                    status=status.HTTP_202_ACCEPTED,
+                )
 
-        # Process receipt
-        processor = apps.get_app_config("picscan").receipt_processor
-        result = processor.process_receipt(extracted_text)
+            with upload_buffer(receipt) as image_data:
+                scan = scan_receipt_image(job_id, image_data)
+        result = scan.result
 
-        if "user_id" not in request.data or "wallet_id" not in request.data:
+        if wallet is None:
+            apply_on_commit(lambda: publish_progress(job_id, COMPLETED, result=result))
             return Response(
-                {"path": url, "result": result}, status=status.HTTP_201_CREATED
+                {
+                    "job_id": job_id,
+                    "progress_url": progress_url,
+                    "path": url,
+                    "result": result,
+                },
+                status=status.HTTP_201_CREATED,
             )
 
         # Create transaction
-        try:
-            user = User.objects.get(id=request.data["user_id"])
-            wallet = Wallet.objects.get(id=request.data["wallet_id"], user=user)
-
-            transaction = Transaction.objects.create(
-                wallet=wallet,
-                amount=result["total"],
-                transaction_date=result["date"],
-                location=result.get("location"),
-                receipt=path,
-                method="picscan",
-                status="unconfirmed",
-            )
+        transaction = create_scan_transaction(wallet, path, scan)
+        data = TransactionSerializer(transaction).data
+        data["receipt"] = url
+
+        def announce():
+            publish_progress(job_id, TRANSACTION_CREATED, transaction=data)
+            publish_progress(job_id, COMPLETED, result=result, transaction=data)
+
+        apply_on_commit(announce)
+        return Response(
+            {"data": data, "job_id": job_id, "progress_url": progress_url},
+            status=status.HTTP_201_CREATED,
+        )
+
 
-            self._save_transaction_details(transaction, result["items"])
+class ReceiptBatchView(ReceiptView):
+    """
+    Scan several receipts in one request: multiple ``receipts`` files, or a
+    PDF / multi-page TIFF with one receipt per page.
 
-            data = TransactionSerializer(transaction).data
-            data["receipt"] = url
+    Images are preprocessed in parallel and OCR and NER run batched. The
+    response (or the ``completed`` progress event with ``background=true``)
+    lists every receipt with its ``result`` and ``transaction``, or an
+    ``error`` when that receipt could not be read.
+    """
 
-            return Response({"data": data}, status=status.HTTP_201_CREATED)
+    throttle_classes = [BatchScanRateThrottle]
 
+    def post(self, request):
+        serializer = ReceiptBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            wallet = self._get_wallet(request.data)
         except (User.DoesNotExist, Wallet.DoesNotExist):
             return Response(
                 {"error": "Invalid user_id or wallet_id"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        pages = serializer.validated_data["receipts"]
+        background = serializer.validated_data["background"]
+
+        # One scanner slot for the whole batch, taken before anything is saved
+        with nullcontext() if background else scanner_slot():
+            job_id = uuid4()
+            paths = [
+                default_storage.save(
+                    f"receipts/picscan/{job_id}-{index}{file_ext}",
+                    ContentFile(image_data),
+                )
+                for index, (file_ext, image_data) in enumerate(pages)
+            ]
+            urls = [
+                request.build_absolute_uri(default_storage.url(path)) for path in paths
+            ]
+            publish_progress(job_id, UPLOADED, paths=urls)
+            progress_url = scan_progress_url(request, job_id)
+
+            if background:
+                wallet_id = str(wallet.id) if wallet else None
+                apply_on_commit(
+                    lambda: scan_receipt_batch.delay(
+                        str(job_id), paths, urls, wallet_id
+                    )
+                )
+                return Response(
+                    {
+                        "data": {
+                            "job_id": job_id,
+                            "paths": urls,
+                            "progress_url": progress_url,
+                        }
+                    },
+                    status=status.HTTP_202_ACCEPTED,
+                )
+
+            outcomes = scan_receipt_images(
+                job_id, [image_data for _, image_data in pages]
+            )
+        receipts = save_scan_results(job_id, wallet, paths, urls, outcomes)
+        return Response(
+            {
+                "data": {
+                    "job_id": job_id,
+                    "progress_url": progress_url,
+                    "receipts": receipts,
+                }
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
 
 class ConfirmTransactionView(APIView):
 
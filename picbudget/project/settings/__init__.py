@@ -19,6 +19,7 @@ include(
     'base.py',
     'logging.py',
     'channels.py',
+    'cache.py',
     'custom.py',
     'celery.py',
     'rest_framework.py',
@@ -7,3 +7,34 @@ CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = os.getenv(
 )
 CELERY_RESULT_EXPIRES = os.getenv("CELERY_RESULT_EXPIRES")
 CELERY_TIMEZONE = os.getenv("CELERY_TIMEZONE")
+
+# Task modules outside the apps' tasks.py, so workers and beat register them
+CELERY_IMPORTS = ("picbudget.project.task",)
+
+CELERY_BEAT_SCHEDULE = {
+    # Also picks up messages whose lease expired or whose wake-up was lost
+    "flush-email-queue": {
+        "task": "picbudget.project.task.flush_email_queue",
+        "schedule": 60,
+    },
+    "sweep-sent-emails": {
+        "task": "picbudget.project.task.sweep_sent_emails",
+        "schedule": 60 * 60,
+    },
+    "flush-expired-tokens": {
+        "task": "picbudget.project.task.flush_expired_tokens",
+        "schedule": 60 * 60,
+    },
+    "sweep-expired-otps": {
+        "task": "picbudget.project.task.sweep_expired_otps",
+        "schedule": 60 * 60,
+    },
+    "sweep-unconfirmed-scans": {
+        "task": "picbudget.project.task.sweep_unconfirmed_scans",
+        "schedule": 24 * 60 * 60,
+    },
+    "collect-receipt-media": {
+        "task": "picbudget.project.task.collect_receipt_media",
+        "schedule": 24 * 60 * 60,
+    },
+}
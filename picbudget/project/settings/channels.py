@@ -1,4 +1,7 @@
 import os
+
+# Shared by the web processes and Celery workers, which publish scan progress.
+# Tests switch to the in-memory layer with override_settings.
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
@@ -3,3 +3,116 @@ Settings specific to the project (not Django or Third-Party Settings)
 """
 
 IN_DOCKER = False
+
+# Number of rows fetched per server-side cursor round-trip for CSV exports
+EXPORT_CHUNK_SIZE = 2000
+
+# Serve read-heavy GET endpoints from async-native views (no ATOMIC_REQUESTS wrapper)
+ASYNC_READ_VIEWS = True
+
+# Maximum number of database candidates re-ranked in memory per search request
+SEARCH_CANDIDATE_LIMIT = 200
+
+# Item name normalization (see picbudget.transactions.utils.item_normalizer)
+ITEM_NORMALIZER_CACHE_SIZE = 4096
+ITEM_NORMALIZER_REFRESH_SECONDS = 300
+ITEM_NORMALIZER_SCORE_CUTOFF = 85
+
+# One-time passwords (see picbudget.authentication.backends.otp), kept in the
+# cache only when it is shared between processes (Redis)
+OTP_BACKEND = (
+    "picbudget.authentication.backends.otp.CacheOTPBackend"
+    if CACHE_REDIS_URL  # type: ignore # noqa: F821
+    else "picbudget.authentication.backends.otp.ModelOTPBackend"
+)
+OTP_CACHE_ALIAS = "default"
+# At most 16 digits, the size of the OTP model's column
+OTP_LENGTH = 6
+OTP_TTL_SECONDS = 300
+
+# Defer side effects such as Celery tasks until the surrounding transaction commits
+USE_ON_COMMIT_HOOK = True
+
+# Outgoing email queue (see picbudget.authentication.utils.email);
+# sent and failed rows are deleted after the retention
+EMAIL_BATCH_SIZE = 50
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_BACKOFF_SECONDS = 30
+EMAIL_LEASE_SECONDS = 300
+EMAIL_RETENTION_SECONDS = 24 * 60 * 60
+
+# Seconds a worker keeps its pooled SMTP connection for secret emails open
+# without use before reconnecting (see PooledConnection)
+EMAIL_POOL_IDLE_SECONDS = 30
+
+# Seconds a JWT-authenticated user is served from the cache (0 disables it);
+# only on by default when the cache is shared, so invalidation reaches every process
+JWT_USER_CACHE_ALIAS = "default"
+JWT_USER_CACHE_TIMEOUT = 60 if CACHE_REDIS_URL else 0  # type: ignore # noqa: F821
+
+# Refresh token blacklist (see picbudget.authentication.utils.blacklist)
+TOKEN_BLACKLIST_BLOOM_BITS = 8 * 1024 * 1024
+TOKEN_BLACKLIST_BLOOM_HASHES = 7
+TOKEN_FLUSH_BATCH_SIZE = 1000
+
+# Resized copies of uploaded images: longest side in pixels per variant name
+IMAGE_VARIANT_SIZES = {
+    "profile": {"small": 128, "medium": 512},
+    "receipt": {"thumbnail": 320, "preview": 1280},
+}
+IMAGE_VARIANT_FORMATS = ("webp", "jpeg")
+
+# Minimum seconds between two last_login writes for the same user
+LAST_LOGIN_UPDATE_INTERVAL = 15 * 60
+
+# Seconds a user's resolved membership is cached (capped at local midnight)
+MEMBERSHIP_CACHE_TIMEOUT = 300
+
+# PicScan token buckets per membership tier: burst size and tokens regained per minute
+PICSCAN_RATE_LIMITS = {
+    "anonymous": {"capacity": 3, "refill_per_minute": 1},
+    "free": {"capacity": 5, "refill_per_minute": 2},
+    "premium": {"capacity": 20, "refill_per_minute": 10},
+}
+
+# Receipts scanned at once across all workers; further requests get 429
+PICSCAN_MAX_CONCURRENT_SCANS = 4
+PICSCAN_SCAN_LEASE_SECONDS = 120
+PICSCAN_BUSY_RETRY_AFTER = 5
+
+# Housekeeping tasks (see CELERY_BEAT_SCHEDULE): rows deleted per statement,
+# age at which unconfirmed PicScan transactions are dropped and how old an
+# unreferenced receipt file must be before it is removed
+SWEEP_BATCH_SIZE = 1000
+UNCONFIRMED_SCAN_TTL_SECONDS = 7 * 24 * 60 * 60
+MEDIA_GC_GRACE_SECONDS = 24 * 60 * 60
+
+# PicScan progress events (see picbudget.picscan.utils.progress): seconds the
+# latest event of a scan is kept for late subscribers and events buffered per
+# process before new ones are dropped
+PICSCAN_PROGRESS_TTL = 60 * 60
+PICSCAN_PROGRESS_QUEUE_SIZE = 1000
+
+# PicScan single uploads, checked from the file header before anything is
+# decoded: largest file in bytes, shortest image side and most pixels
+PICSCAN_MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+PICSCAN_MIN_IMAGE_SIDE = 200
+PICSCAN_MAX_IMAGE_PIXELS = 50_000_000
+
+# PicScan batch uploads: receipts (files or PDF/TIFF pages) per request and PDF
+# render resolution
+PICSCAN_BATCH_MAX_RECEIPTS = 20
+PICSCAN_PDF_DPI = 200
+
+# PicScan worker processes per server process for decoding, preprocessing and
+# OCR, each loading the OCR model once (0 scans in the request thread), and the
+# threads each may use (None divides the cores between the workers)
+PICSCAN_SCAN_WORKERS = 2
+PICSCAN_SCAN_WORKER_THREADS = None
+
+# Reprocessing of stored receipts after a PicScan pipeline change (see the
+# reprocess_receipts command): receipts per batch, small enough for a batch that
+# re-runs OCR to finish within the scan lease, and seconds between the batches
+# of a background task chain
+PICSCAN_REPROCESS_BATCH_SIZE = 50
+PICSCAN_REPROCESS_INTERVAL = 5
@@ -2,7 +2,7 @@ from datetime import timedelta
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "picbudget.authentication.backends.jwt.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -10,6 +10,17 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
     "EXCEPTION_HANDLER": "picbudget.core.exceptions.custom_exception_handler",
+    # Reverse proxies in front of the app. With 0, throttles identify clients by
+    # REMOTE_ADDR and ignore the spoofable X-Forwarded-For header; set it to the
+    # number of proxies when deployed behind them, e.g. with
+    # PICBUDGET_SETTING_REST_FRAMEWORK='{"NUM_PROXIES": 1}'
+    "NUM_PROXIES": 0,
+    "DEFAULT_THROTTLE_RATES": {
+        "otp_email": "10/hour",
+        "otp_ip": "30/hour",
+        "login_email": "10/minute",
+        "login_ip": "30/minute",
+    },
 }
 
 SIMPLE_JWT = {
@@ -39,7 +50,7 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
     "TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainPairSerializer",
-    "TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "picbudget.authentication.serializers.refresh.TokenRefreshSerializer",
     "TOKEN_VERIFY_SERIALIZER": "rest_framework_simplejwt.serializers.TokenVerifySerializer",
     "TOKEN_BLACKLIST_SERIALIZER": "rest_framework_simplejwt.serializers.TokenBlacklistSerializer",
     "SLIDING_TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainSlidingSerializer",
@@ -1,15 +1,260 @@
 # use celery to send email
+from datetime import timedelta
+from uuid import uuid4
+
 from celery import shared_task
-from django.core.mail import send_mail
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from picbudget.authentication.backends.jwt import invalidate_cached_user
+from picbudget.authentication.models import OTP, OutgoingEmail
+from picbudget.authentication.utils.blacklist import delete_expired_tokens
+from picbudget.authentication.utils.email import (
+    deliver_pending_emails,
+    next_retry_delay,
+    send_secret_email_now,
+)
+from picbudget.core.utils.db import delete_in_batches
+from picbudget.core.utils.images import (
+    delete_files,
+    store_image_variants,
+    variant_paths,
+)
+from picbudget.core.utils.misc import apply_on_commit
+from picbudget.picscan.throttles import get_scan_limiter
+from picbudget.picscan.utils.progress import (
+    COMPLETED,
+    FAILED,
+    TRANSACTION_CREATED,
+    publish_progress,
+)
+from picbudget.picscan.utils.reprocess import reprocess_scans, stale_scans
+from picbudget.picscan.utils.scan import (
+    create_scan_transaction,
+    save_scan_results,
+    scan_receipt_image,
+    scan_receipt_images,
+)
+from picbudget.transactions.models.transaction import Transaction
+from picbudget.transactions.utils.media import collect_orphaned_receipts
+from picbudget.wallets.models.wallet import Wallet
+
+User = get_user_model()
+
+
+def queue_email(subject, message, recipient_list, idempotency_key=None):
+    """
+    Add an email to the outbox and flush the queue once the transaction commits.
+
+    Messages with an ``idempotency_key`` that is already queued are ignored,
+    so callers can safely retry with the same key. Keys are stored in plain
+    text and must not contain secrets; without one every call queues a new
+    message. Delivered rows are deleted by ``sweep_sent_emails``.
+    """
+    email, created = OutgoingEmail.objects.get_or_create(
+        idempotency_key=idempotency_key or uuid4().hex,
+        defaults={
+            "subject": subject,
+            "message": message,
+            "recipient_list": list(recipient_list),
+        },
+    )
+    if created:
+        apply_on_commit(flush_email_queue.delay)
+    return email
+
+
+@shared_task(bind=True)
+def send_email_task(self, subject, message, recipient_list, idempotency_key=None):
+    # A redelivered task has the same id, so it does not queue the email again.
+    queue_email(
+        subject, message, recipient_list, idempotency_key or f"task:{self.request.id}"
+    )
+
+
+@shared_task(bind=True, max_retries=settings.EMAIL_MAX_ATTEMPTS - 1)
+def send_secret_email(self, subject, message, recipient_list):
+    """
+    Send an email carrying a secret, such as an OTP code or a password reset
+    link, over the worker's pooled SMTP connection.
+
+    No outbox row is written, so resends cost no database write and the secret
+    is never stored. Failed sends are retried with the outbox backoff.
+    """
+    try:
+        send_secret_email_now(subject, message, recipient_list)
+    except Exception as exc:
+        delay = settings.EMAIL_RETRY_BACKOFF_SECONDS * 2**self.request.retries
+        raise self.retry(exc=exc, countdown=delay)
 
 
 @shared_task
-def send_email_task(subject, message, recipient_list):
-    send_mail(
-        subject,
-        message,
-        settings.EMAIL_HOST_USER,
-        recipient_list,
-        fail_silently=False,
+def flush_email_queue():
+    """Send queued emails in batches over pooled SMTP connections."""
+    metrics = deliver_pending_emails()
+    if metrics["failed"]:
+        # This run scheduled retries, so it also wakes up to deliver them.
+        delay = next_retry_delay()
+        if delay is not None:
+            flush_email_queue.apply_async(countdown=delay)
+    return metrics
+
+
+@shared_task
+def flush_expired_tokens():
+    """Periodic: drop expired outstanding/blacklisted JWTs (see CELERY_BEAT_SCHEDULE)."""
+    return delete_expired_tokens()
+
+
+@shared_task
+def process_profile_photo(user_id, stale_paths=()):
+    """Build the profile photo variants, then delete the replaced files."""
+    user = User.objects.filter(pk=user_id).first()
+    keep = set()
+    if user and user.photo_url:
+        variants = store_image_variants(
+            user.photo_url,
+            f"profile/variants/{user.pk}",
+            settings.IMAGE_VARIANT_SIZES["profile"],
+        )
+        keep = set(variant_paths(variants))
+        # Skip the write if another upload replaced the photo in the meantime.
+        User.objects.filter(pk=user.pk, photo_url=user.photo_url.name).update(
+            photo_variants=variants
+        )
+        invalidate_cached_user(user.pk)
+
+    delete_files(path for path in stale_paths if path not in keep)
+
+
+@shared_task
+def generate_receipt_variants(transaction_id):
+    transaction = Transaction.objects.filter(pk=transaction_id).first()
+    if transaction and transaction.receipt:
+        variants = store_image_variants(
+            transaction.receipt,
+            f"receipts/variants/{transaction.pk}",
+            settings.IMAGE_VARIANT_SIZES["receipt"],
+        )
+        Transaction.objects.filter(
+            pk=transaction.pk, receipt=transaction.receipt.name
+        ).update(receipt_variants=variants)
+
+
+@shared_task(bind=True, max_retries=None)
+def scan_receipt(self, job_id, path, url, wallet_id=None):
+    """Background PicScan of a stored receipt, reporting progress to ``job_id``."""
+    with get_scan_limiter().slot() as acquired:
+        if not acquired:
+            raise self.retry(countdown=settings.PICSCAN_BUSY_RETRY_AFTER)
+        try:
+            with default_storage.open(path) as file:
+                scan = scan_receipt_image(job_id, file.read())
+        except Exception as exc:
+            publish_progress(job_id, FAILED, error=str(exc))
+            raise
+
+    # The serializer module imports this one.
+    from picbudget.transactions.serializers.transaction import TransactionSerializer
+
+    outcome = {"result": scan.result}
+    wallet = Wallet.objects.filter(pk=wallet_id).first() if wallet_id else None
+    if wallet is not None:
+        with db_transaction.atomic():
+            transaction = create_scan_transaction(wallet, path, scan)
+        data = TransactionSerializer(transaction).data
+        data["receipt"] = url
+        publish_progress(job_id, TRANSACTION_CREATED, transaction=data)
+        outcome["transaction"] = data
+    publish_progress(job_id, COMPLETED, **outcome)
+    return outcome.get("transaction", {}).get("id")
+
+
+@shared_task(bind=True, max_retries=None)
+def scan_receipt_batch(self, job_id, paths, urls, wallet_id=None):
+    """Background batch PicScan (see ``ReceiptBatchView``)."""
+    with get_scan_limiter().slot() as acquired:
+        if not acquired:
+            raise self.retry(countdown=settings.PICSCAN_BUSY_RETRY_AFTER)
+        try:
+            images = []
+            for path in paths:
+                with default_storage.open(path) as file:
+                    images.append(file.read())
+            outcomes = scan_receipt_images(job_id, images)
+        except Exception as exc:
+            publish_progress(job_id, FAILED, error=str(exc))
+            raise
+
+    wallet = Wallet.objects.filter(pk=wallet_id).first() if wallet_id else None
+    with db_transaction.atomic():
+        receipts = save_scan_results(job_id, wallet, paths, urls, outcomes)
+    return [receipt.get("transaction", {}).get("id") for receipt in receipts]
+
+
+@shared_task(bind=True, max_retries=None)
+def reprocess_receipt_scans(
+    self, after=None, before=None, from_stage=None, batch_size=None
+):
+    """
+    Reprocess one batch of stored receipts with a primary key in
+    ``(after, before]`` (see ``reprocess_receipts``), then queue the next one.
+
+    Every batch holds a scan slot, so reprocessing backs off while users scan,
+    and batches are ``PICSCAN_REPROCESS_INTERVAL`` seconds apart.
+    """
+    batch_size = batch_size or settings.PICSCAN_REPROCESS_BATCH_SIZE
+    with get_scan_limiter().slot() as acquired:
+        if not acquired:
+            raise self.retry(countdown=settings.PICSCAN_BUSY_RETRY_AFTER)
+        scans = list(stale_scans(after, before, from_stage)[:batch_size])
+        if not scans:
+            return None
+        metrics = reprocess_scans(scans, from_stage)
+
+    metrics["last"] = str(scans[-1].pk)
+    reprocess_receipt_scans.apply_async(
+        (metrics["last"], before, from_stage, batch_size),
+        countdown=settings.PICSCAN_REPROCESS_INTERVAL,
+    )
+    return metrics
+
+
+@shared_task
+def sweep_sent_emails():
+    """
+    Delete sent and abandoned outbox rows after ``EMAIL_RETENTION_SECONDS``,
+    with the links and their idempotency keys.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.EMAIL_RETENTION_SECONDS)
+    done = OutgoingEmail.objects.filter(
+        status__in=["sent", "failed"], updated_at__lt=cutoff
+    )
+    return delete_in_batches(done, settings.SWEEP_BATCH_SIZE)
+
+
+@shared_task
+def sweep_expired_otps():
+    expired = OTP.objects.filter(expired_at__lt=timezone.now())
+    return delete_in_batches(expired, settings.SWEEP_BATCH_SIZE)
+
+
+@shared_task
+def sweep_unconfirmed_scans():
+    """Delete PicScan transactions the user never confirmed."""
+    cutoff = timezone.now() - timezone.timedelta(
+        seconds=settings.UNCONFIRMED_SCAN_TTL_SECONDS
+    )
+    abandoned = Transaction.objects.filter(
+        method="picscan", status="unconfirmed", created_at__lt=cutoff
     )
+    return delete_in_batches(abandoned, settings.SWEEP_BATCH_SIZE)
+
+
+@shared_task
+def collect_receipt_media():
+    """Remove receipt files that no transaction references any more."""
+    return collect_orphaned_receipts()
@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.db import transaction
 from .models.transaction import Transaction
 from .models.detail import TransactionDetail
+from .models.item import CanonicalItem, ItemAlias
+from .utils.item_normalizer import forget_canonical_items
 
 
 # Register your models here.
@@ -13,7 +16,7 @@ class TransactionAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at",
     ]
-    search_fields = ["wallet__user__full_name", "type", "amount"]
+    search_fields = ["location", "=wallet__user__email"]
     list_filter = ["type", "transaction_date", "created_at", "updated_at"]
     filter_horizontal = (
         "labels",
@@ -31,12 +34,52 @@ class TransactionDetailAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at",
     ]
-    search_fields = ["transaction"]
+    search_fields = ["item_name"]
     list_filter = ["created_at", "updated_at"]
 
     class Meta:
         model = TransactionDetail
 
 
+class CanonicalItemAdmin(admin.ModelAdmin):
+    list_display = ["name", "reviewed", "created_at"]
+    search_fields = ["name"]
+    list_filter = ["reviewed"]
+    actions = ["mark_reviewed"]
+
+    @admin.action(description="Mark selected items as reviewed")
+    def mark_reviewed(self, request, queryset):
+        queryset.update(reviewed=True)
+
+    class Meta:
+        model = CanonicalItem
+
+
+class ItemAliasAdmin(admin.ModelAdmin):
+    list_display = ["alias", "canonical_item", "user", "source", "updated_at"]
+    search_fields = ["alias", "=user__email"]
+    list_filter = ["source"]
+    raw_id_fields = ["canonical_item", "user"]
+    actions = ["make_global"]
+
+    @admin.action(description="Apply selected corrections to every user")
+    def make_global(self, request, queryset):
+        for alias in queryset.exclude(user=None):
+            ItemAlias.objects.update_or_create(
+                user=None,
+                alias=alias.alias,
+                defaults={
+                    "canonical_item_id": alias.canonical_item_id,
+                    "source": "correction",
+                },
+            )
+        transaction.on_commit(forget_canonical_items)
+
+    class Meta:
+        model = ItemAlias
+
+
 admin.site.register(Transaction, TransactionAdmin)
 admin.site.register(TransactionDetail, TransactionDetailAdmin)
+admin.site.register(CanonicalItem, CanonicalItemAdmin)
+admin.site.register(ItemAlias, ItemAliasAdmin)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TransactionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "picbudget.transactions"
+
+    def ready(self):
+        import picbudget.transactions.signals
@@ -0,0 +1,79 @@
+from typing import List, NamedTuple
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+SEARCH_CONFIG = "simple"
+
+
+class SearchResults(NamedTuple):
+    objects: List
+    # True when more than ``limit`` candidates matched and the rest were dropped
+    truncated: bool
+
+
+def _postgres_candidates(queryset, field, term):
+    """
+    Match on the full-text vector or trigram similarity of ``field``.
+
+    Both conditions are served by the GIN indexes created in the
+    ``transactions`` migrations, so candidates are found without a table scan.
+    """
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+        SearchVector,
+        TrigramSimilarity,
+    )
+
+    vector = SearchVector(field, config=SEARCH_CONFIG)
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+    return (
+        queryset.annotate(
+            search=vector,
+            rank=Greatest(SearchRank(vector, query), TrigramSimilarity(field, term)),
+        )
+        .filter(Q(search=query) | Q(**{f"{field}__trigram_similar": term}))
+        .order_by("-rank", "-created_at")
+    )
+
+
+def _fallback_candidates(queryset, field, term):
+    """Substring match on any word of ``term`` for databases without pg_trgm."""
+    condition = Q()
+    for word in term.split():
+        condition |= Q(**{f"{field}__icontains": word})
+    return queryset.filter(condition).order_by("-created_at")
+
+
+def search_queryset(queryset, field, term, limit):
+    """
+    Return up to ``limit`` objects whose ``field`` matches ``term``, best first.
+
+    The database narrows the candidates; RapidFuzz then re-ranks them in memory
+    so typos and abbreviated receipt text still sort sensibly. Only the first
+    ``limit`` candidates in database order are re-ranked, and ``truncated``
+    tells whether more matched.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        candidates = _postgres_candidates(queryset, field, term)
+    else:
+        candidates = _fallback_candidates(queryset, field, term)
+
+    candidates = list(candidates[: limit + 1])
+    truncated = len(candidates) > limit
+    del candidates[limit:]
+    if not candidates:
+        return SearchResults([], truncated)
+
+    scores = process.cdist(
+        [term],
+        [getattr(candidate, field) or "" for candidate in candidates],
+        scorer=fuzz.WRatio,
+        processor=default_process,
+    )[0]
+    order = sorted(range(len(candidates)), key=lambda index: -scores[index])
+    return SearchResults([candidates[index] for index in order], truncated)
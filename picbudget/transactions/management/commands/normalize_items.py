@@ -0,0 +1,38 @@
+from itertools import groupby
+from operator import attrgetter
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from picbudget.transactions.models import TransactionDetail
+from picbudget.transactions.utils.item_normalizer import assign_canonical_items
+
+
+class Command(BaseCommand):
+    help = "Link existing transaction items without a canonical item to one, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        total = 0
+        while True:
+            details = list(
+                TransactionDetail.objects.filter(canonical_item__isnull=True)
+                .only("id", "item_name")
+                .annotate(owner_id=F("transaction__wallet__user_id"))
+                .order_by("id")[:batch_size]
+            )
+            if not details:
+                break
+
+            # Each owner's corrections apply to their own items only.
+            owner = attrgetter("owner_id")
+            for owner_id, owned in groupby(sorted(details, key=owner), owner):
+                assign_canonical_items(list(owned), owner_id)
+            TransactionDetail.objects.bulk_update(details, ["canonical_item"])
+            total += len(details)
+            self.stdout.write(f"Normalized {total} items")
+
+        self.stdout.write(self.style.SUCCESS(f"Done, {total} items normalized."))
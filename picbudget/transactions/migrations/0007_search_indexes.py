@@ -0,0 +1,53 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_INDEXES = [
+    (
+        "transaction_location_trgm_idx",
+        "transactions_transaction",
+        "location gin_trgm_ops",
+    ),
+    (
+        "transaction_location_search_idx",
+        "transactions_transaction",
+        "to_tsvector('simple'::regconfig, COALESCE(location, ''))",
+    ),
+    (
+        "transactiondetail_item_name_trgm_idx",
+        "transactions_transactiondetail",
+        "item_name gin_trgm_ops",
+    ),
+    (
+        "transactiondetail_item_name_search_idx",
+        "transactions_transactiondetail",
+        "to_tsvector('simple'::regconfig, COALESCE(item_name, ''))",
+    ),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, expression in SEARCH_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({expression})"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in SEARCH_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0006_alter_transaction_status'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0007_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='transactiondetail',
+            name='canonical_item',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='details', to='transactions.canonicalitem'),
+        ),
+        migrations.CreateModel(
+            name='ItemAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=255, unique=True)),
+                ('source', models.CharField(choices=[('matched', 'Matched'), ('correction', 'Correction')], default='matched', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('canonical_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='transactions.canonicalitem')),
+            ],
+        ),
+    ]
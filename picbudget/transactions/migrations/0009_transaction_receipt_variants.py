@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0008_canonical_items'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='receipt_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0009_transaction_receipt_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='canonicalitem',
+            name='reviewed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0010_canonicalitem_reviewed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='itemalias',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='item_aliases', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='itemalias',
+            name='alias',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='itemalias',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('alias',), name='unique_global_item_alias'),
+        ),
+        migrations.AddConstraint(
+            model_name='itemalias',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('user', 'alias'), name='unique_user_item_alias'),
+        ),
+    ]
@@ -1,2 +1,3 @@
 from .transaction import Transaction
 from .detail import TransactionDetail
+from .item import CanonicalItem, ItemAlias
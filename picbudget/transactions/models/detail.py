@@ -1,5 +1,6 @@
 from django.db import models
 from .transaction import Transaction
+from .item import CanonicalItem
 from uuid import uuid4
 
 
@@ -8,11 +9,25 @@ class TransactionDetail(models.Model):
     transaction = models.ForeignKey(Transaction, on_delete=models.CASCADE)
     item_name = models.CharField(max_length=255)
     item_price = models.DecimalField(max_digits=10, decimal_places=2)
+    canonical_item = models.ForeignKey(
+        CanonicalItem,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="details",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
 
+    def save(self, *args, **kwargs):
+        if self.canonical_item_id is None:
+            from ..utils.item_normalizer import assign_canonical_items
+
+            assign_canonical_items([self], self.transaction.wallet.user_id)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.transaction.wallet.user.full_name
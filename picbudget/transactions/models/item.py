@@ -0,0 +1,58 @@
+from django.db import models
+from uuid import uuid4
+
+
+class CanonicalItem(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    name = models.CharField(max_length=255, unique=True)
+    # Names created from unmatched OCR text stay unreviewed until an admin
+    # confirms them, so noise can be found and merged or deleted.
+    reviewed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class ItemAlias(models.Model):
+    ALIAS_SOURCE = [
+        ("matched", "Matched"),
+        ("correction", "Correction"),
+    ]
+
+    alias = models.CharField(max_length=255)
+    canonical_item = models.ForeignKey(
+        CanonicalItem, on_delete=models.CASCADE, related_name="aliases"
+    )
+    # Corrections only apply to the user who made them; aliases without a user
+    # apply to everyone and come from matching or an admin's review.
+    user = models.ForeignKey(
+        "accounts.User",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="item_aliases",
+    )
+    source = models.CharField(max_length=10, choices=ALIAS_SOURCE, default="matched")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["alias"],
+                condition=models.Q(user__isnull=True),
+                name="unique_global_item_alias",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "alias"],
+                condition=models.Q(user__isnull=False),
+                name="unique_user_item_alias",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.alias} -> {self.canonical_item.name}"
@@ -29,6 +29,7 @@ class Transaction(models.Model):
         "labels.Label", blank=True, related_name="transactions_labels"
     )
     receipt = models.ImageField(upload_to="receipts", blank=True, null=True)
+    receipt_variants = models.JSONField(default=dict, blank=True)
     method = models.CharField(max_length=10, choices=INPUT_METHOD, default="manual")
     status = models.CharField(
         max_length=12, choices=CONFIRMATION_STATUS, default="confirmed"
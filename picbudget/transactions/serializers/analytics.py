@@ -0,0 +1,51 @@
+from datetime import timedelta
+from rest_framework import serializers
+from django.utils import timezone
+
+
+class SpendingAnalyticsQuerySerializer(serializers.Serializer):
+    INTERVALS = ["day", "week", "month"]
+    GROUP_BY = ["label", "wallet", "type", "method"]
+    DEFAULT_RANGE = {
+        "day": timedelta(days=30),
+        "week": timedelta(weeks=12),
+        "month": timedelta(days=365),
+    }
+    # Longest range per interval, which bounds the periods built by zero_fill
+    MAX_RANGE = {
+        "day": timedelta(days=366),
+        "week": timedelta(weeks=157),
+        "month": timedelta(days=10 * 366),
+    }
+
+    interval = serializers.ChoiceField(choices=INTERVALS, default="day")
+    group_by = serializers.ChoiceField(choices=GROUP_BY, default="label")
+    type = serializers.ChoiceField(
+        choices=["income", "expense"], required=False, allow_null=True
+    )
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    zero_fill = serializers.BooleanField(default=True)
+
+    def validate(self, data):
+        today = timezone.localdate()
+        data.setdefault("date_to", today)
+        data.setdefault("date_from", data["date_to"] - self.DEFAULT_RANGE[data["interval"]])
+
+        if data["date_from"] > data["date_to"]:
+            raise serializers.ValidationError(
+                {"date_from": "date_from must be on or before date_to."}
+            )
+        max_range = self.MAX_RANGE[data["interval"]]
+        if data["date_to"] - data["date_from"] > max_range:
+            raise serializers.ValidationError(
+                {
+                    "date_from": f"A {data['interval']} interval may span at most "
+                    f"{max_range.days} days."
+                }
+            )
+
+        # Splitting by type already separates income from expense.
+        if data["group_by"] != "type":
+            data.setdefault("type", "expense")
+        return data
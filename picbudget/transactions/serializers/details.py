@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from ..models.detail import TransactionDetail
+from ..utils.item_normalizer import learn_correction
 
 
 class TransactionItemSerializer(serializers.ModelSerializer):
@@ -10,4 +11,13 @@ class TransactionItemSerializer(serializers.ModelSerializer):
             "id": {"read_only": True},
             "created_at": {"read_only": True},
             "updated_at": {"read_only": True},
+            "canonical_item": {"read_only": True},
         }
+
+    def update(self, instance, validated_data):
+        item_name = validated_data.get("item_name")
+        if item_name is not None and item_name != instance.item_name:
+            instance.canonical_item_id = learn_correction(
+                instance.item_name, item_name, instance.transaction.wallet.user_id
+            )
+        return super().update(instance, validated_data)
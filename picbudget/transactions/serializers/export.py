@@ -0,0 +1,92 @@
+import csv
+from datetime import date, datetime
+from itertools import islice
+from typing import Tuple
+
+from asgiref.sync import sync_to_async
+
+
+class Echo:
+    """File-like object that hands written rows back instead of buffering them."""
+
+    def write(self, value):
+        return value
+
+
+class ValuesExportSerializer:
+    """
+    Serialize ``values_list`` tuples straight to CSV lines.
+
+    Rows are fetched with ``iterator(chunk_size=...)`` so PostgreSQL uses a named
+    (server-side) cursor and only ``chunk_size`` rows are held in memory at any
+    time. Each chunk is fetched and rendered in a worker thread and yielded as
+    one piece of the response body.
+    """
+
+    fields: Tuple[str, ...] = ()
+    headers: Tuple[str, ...] = ()
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @staticmethod
+    def to_representation(row):
+        return [
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in row
+        ]
+
+    async def stream_csv(self, chunk_size: int):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.headers or self.fields)
+
+        rows = self.queryset.values_list(*self.fields).iterator(chunk_size=chunk_size)
+
+        def next_chunk():
+            return "".join(
+                writer.writerow(self.to_representation(row))
+                for row in islice(rows, chunk_size)
+            )
+
+        while True:
+            chunk = await sync_to_async(next_chunk)()
+            if not chunk:
+                break
+            yield chunk
+
+
+class TransactionExportSerializer(ValuesExportSerializer):
+    fields = (
+        "id",
+        "wallet_id",
+        "wallet__name",
+        "type",
+        "amount",
+        "transaction_date",
+        "location",
+        "method",
+        "status",
+        "created_at",
+    )
+    headers = (
+        "id",
+        "wallet_id",
+        "wallet",
+        "type",
+        "amount",
+        "transaction_date",
+        "location",
+        "method",
+        "status",
+        "created_at",
+    )
+
+
+class TransactionItemExportSerializer(ValuesExportSerializer):
+    fields = (
+        "id",
+        "transaction_id",
+        "item_name",
+        "item_price",
+        "created_at",
+    )
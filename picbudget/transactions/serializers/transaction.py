@@ -4,9 +4,14 @@ import os
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from uuid import uuid4
+from picbudget.core.utils.images import variant_urls
+from picbudget.core.utils.misc import apply_on_commit
+from picbudget.project.task import generate_receipt_variants
 
 
 class TransactionSerializer(serializers.ModelSerializer):
+    receipt_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Transaction
         fields = "__all__"
@@ -35,4 +40,24 @@ class TransactionSerializer(serializers.ModelSerializer):
         if labels:
             transaction.labels.set(labels)
 
+        if transaction.receipt:
+            apply_on_commit(
+                lambda: generate_receipt_variants.delay(str(transaction.id))
+            )
+
         return transaction
+
+    def update(self, instance, validated_data):
+        receipt_changed = "receipt" in validated_data
+        if receipt_changed:
+            # The old variants show the replaced receipt; the task rebuilds them.
+            validated_data["receipt_variants"] = {}
+
+        instance = super().update(instance, validated_data)
+
+        if receipt_changed and instance.receipt:
+            apply_on_commit(lambda: generate_receipt_variants.delay(str(instance.id)))
+        return instance
+
+    def get_receipt_variants(self, obj):
+        return variant_urls(obj.receipt_variants, self.context.get("request"))
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models.item import CanonicalItem, ItemAlias
+from .utils.item_normalizer import forget_canonical_items
+
+
+@receiver(post_delete, sender=CanonicalItem)
+@receiver(post_delete, sender=ItemAlias)
+def forget_deleted_items(sender, instance, **kwargs):
+    """Stop resolving names to canonical items or aliases that were deleted."""
+    forget_canonical_items()
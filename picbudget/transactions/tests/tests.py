@@ -1,3 +1,63 @@
+from django.db import transaction
 from django.test import TestCase
 
-# Create your tests here.
+from picbudget.accounts.models import User
+from picbudget.transactions.models import CanonicalItem, ItemAlias
+from picbudget.transactions.utils import item_normalizer
+from picbudget.transactions.utils.item_normalizer import (
+    forget_canonical_items,
+    learn_correction,
+    resolve_canonical_ids,
+)
+
+
+class ItemNormalizerTest(TestCase):
+    def setUp(self):
+        forget_canonical_items()
+        self.addCleanup(forget_canonical_items)
+        self.user = User.objects.create_user(
+            email="ani@example.com", password="password", full_name="Ani"
+        )
+        self.other = User.objects.create_user(
+            email="budi@example.com", password="password", full_name="Budi"
+        )
+
+    def resolve(self, name, user=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return resolve_canonical_ids([name], user and user.pk)[name]
+
+    def test_resolve_creates_then_matches_close_names(self):
+        created = self.resolve("INDOMIE GORENG")
+        self.assertFalse(CanonicalItem.objects.get(pk=created).reviewed)
+
+        self.assertEqual(self.resolve("INDOMIE GORENK"), created)
+        self.assertNotEqual(self.resolve("AQUA 600ML"), self.resolve("AQUA 1500ML"))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.resolve("INDOMIE GORENG"), created)
+
+    def test_correction_only_applies_to_its_user(self):
+        misread = self.resolve("TEH BOTOL SOSR0")
+        with self.captureOnCommitCallbacks(execute=True):
+            corrected = learn_correction(
+                "TEH BOTOL SOSR0", "Teh Botol Sosro", self.user.pk
+            )
+
+        self.assertEqual(self.resolve("TEH BOTOL SOSR0", self.user), corrected)
+        self.assertEqual(self.resolve("TEH BOTOL SOSR0", self.other), misread)
+        self.assertEqual(self.resolve("TEH BOTOL SOSR0"), misread)
+        alias = ItemAlias.objects.get(alias="TEH BOTOL SOSR0", user=self.user)
+        self.assertEqual(alias.source, "correction")
+
+    def test_rolled_back_items_are_not_cached(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    resolve_canonical_ids(["KOPI KAPAL API"])
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(item_normalizer._recent.get_many({"KOPI KAPAL API"}), {})
+        canonical_id = self.resolve("KOPI KAPAL API")
+        self.assertTrue(CanonicalItem.objects.filter(pk=canonical_id).exists())
@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.urls import path
 from .views.transaction import (
+    AsyncTransactionListView,
+    AsyncTransactionSummaryView,
     TransactionListCreateView,
     TransactionDetailView,
     TransactionSummaryView,
@@ -8,10 +11,20 @@ from .views.transaction import (
 from .views.details import (
     TransactionItemListCreateView,
     TransactionItemDetailView,
+    TransactionItemSummaryView,
 )
+from .views.analytics import SpendingAnalyticsView
+from .views.search import TransactionSearchView, TransactionItemSearchView
+
+if settings.ASYNC_READ_VIEWS:
+    TransactionListView = AsyncTransactionListView
+    SummaryView = AsyncTransactionSummaryView
+else:
+    TransactionListView = TransactionListCreateView
+    SummaryView = TransactionSummaryView
 
 urlpatterns = [
-    path("transactions/", TransactionListCreateView.as_view(), name="transaction-list"),
+    path("transactions/", TransactionListView.as_view(), name="transaction-list"),
     path(
         "transactions/<uuid:pk>/",
         TransactionDetailView.as_view(),
@@ -29,9 +42,29 @@ urlpatterns = [
     ),
     path(
         "transactions/summary/",
-        TransactionSummaryView.as_view(),
+        SummaryView.as_view(),
         name="transaction-summary",
     ),
+    path(
+        "transactions/search/",
+        TransactionSearchView.as_view(),
+        name="transaction-search",
+    ),
+    path(
+        "transaction-items/summary/",
+        TransactionItemSummaryView.as_view(),
+        name="transaction-item-summary",
+    ),
+    path(
+        "transaction-items/search/",
+        TransactionItemSearchView.as_view(),
+        name="transaction-item-search",
+    ),
+    path(
+        "transactions/analytics/",
+        SpendingAnalyticsView.as_view(),
+        name="transaction-analytics",
+    ),
     # New endpoint for totals based on labels
     path(
         "transactions/summary/labels/",
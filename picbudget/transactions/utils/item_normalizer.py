@@ -0,0 +1,212 @@
+import re
+import time
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from rapidfuzz import fuzz, process
+
+from picbudget.core.utils.collections import LRUCache
+from ..models.item import CanonicalItem, ItemAlias
+
+NON_WORD_PATTERN = re.compile(r"[^0-9A-Z]+")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+# Names are only fuzzy-matched against canonical names with the same first
+# characters, so each lookup compares against a bucket, not the whole table.
+PREFIX_LENGTH = 2
+
+# Recently resolved ``normalized name -> canonical item id`` lookups, without
+# user corrections
+_recent = LRUCache(maxsize=settings.ITEM_NORMALIZER_CACHE_SIZE)
+
+
+def normalize_item_name(name: str) -> str:
+    """Upper-case ``name`` and collapse punctuation and whitespace runs."""
+    return NON_WORD_PATTERN.sub(" ", (name or "").upper()).strip()
+
+
+class CanonicalChoices:
+    """
+    Process-wide snapshot of canonical names used for fuzzy matching, bucketed
+    by their first ``PREFIX_LENGTH`` characters.
+
+    Reloaded at most every ``ITEM_NORMALIZER_REFRESH_SECONDS`` so items created
+    by other workers are picked up without a query per lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self.buckets: Dict[str, Tuple[List[str], List]] = {}
+
+    def _add(self, name, canonical_id):
+        names, ids = self.buckets.setdefault(name[:PREFIX_LENGTH], ([], []))
+        names.append(name)
+        ids.append(canonical_id)
+
+    def get(self):
+        with self._lock:
+            if (
+                self._loaded_at is None
+                or time.monotonic() - self._loaded_at
+                > settings.ITEM_NORMALIZER_REFRESH_SECONDS
+            ):
+                self.buckets = {}
+                for name, canonical_id in CanonicalItem.objects.values_list(
+                    "name", "id"
+                ).iterator():
+                    self._add(name, canonical_id)
+                self._loaded_at = time.monotonic()
+            return self.buckets
+
+    def add(self, items: Dict[str, object]):
+        with self._lock:
+            for name, canonical_id in items.items():
+                self._add(name, canonical_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+
+_choices = CanonicalChoices()
+
+
+def _numbers_match(first: str, second: str) -> bool:
+    # "AQUA 600ML" and "AQUA 1500ML" are close strings but different products.
+    return NUMBER_PATTERN.findall(first) == NUMBER_PATTERN.findall(second)
+
+
+def _fuzzy_match(names: List[str]) -> Dict[str, object]:
+    buckets = _choices.get()
+    by_prefix = defaultdict(list)
+    for name in names:
+        if name[:PREFIX_LENGTH] in buckets:
+            by_prefix[name[:PREFIX_LENGTH]].append(name)
+
+    matched = {}
+    for prefix, bucket_names in by_prefix.items():
+        choices, ids = buckets[prefix]
+        scores = process.cdist(
+            bucket_names,
+            choices,
+            scorer=fuzz.ratio,
+            score_cutoff=settings.ITEM_NORMALIZER_SCORE_CUTOFF,
+            workers=1,
+        )
+        for row, name in enumerate(bucket_names):
+            for column in scores[row].argsort()[::-1]:
+                if scores[row][column] == 0:
+                    break
+                if _numbers_match(name, choices[column]):
+                    matched[name] = ids[column]
+                    break
+    return matched
+
+
+def forget_canonical_items():
+    """Drop cached lookups and the snapshot, e.g. after canonical items were deleted."""
+    _recent.clear()
+    _choices.invalidate()
+
+
+def resolve_canonical_ids(names: Iterable[str], user_id=None) -> Dict[str, object]:
+    """
+    Map each normalized name to a canonical item id in as few queries as possible.
+
+    The corrections of ``user_id`` come first. Other names go through the
+    in-process LRU, then the global aliases, then a RapidFuzz pass over the
+    canonical names sharing each name's prefix. Whatever is still unmatched
+    becomes a new, unreviewed canonical item. Every match is recorded as a
+    global alias.
+
+    The process-wide caches are only updated once the surrounding transaction
+    commits, so they never hold ids of rows that were rolled back.
+    """
+    pending = {name for name in names if name}
+    corrected = {}
+    if pending and user_id is not None:
+        corrected = dict(
+            ItemAlias.objects.filter(user_id=user_id, alias__in=pending).values_list(
+                "alias", "canonical_item_id"
+            )
+        )
+        pending -= corrected.keys()
+
+    resolved = _recent.get_many(pending)
+    pending -= resolved.keys()
+
+    if pending:
+        aliases = dict(
+            ItemAlias.objects.filter(user=None, alias__in=pending).values_list(
+                "alias", "canonical_item_id"
+            )
+        )
+        resolved.update(aliases)
+        pending -= aliases.keys()
+
+    if pending:
+        matched = _fuzzy_match(sorted(pending))
+        pending -= matched.keys()
+
+        if pending:
+            CanonicalItem.objects.bulk_create(
+                [CanonicalItem(name=name) for name in sorted(pending)],
+                ignore_conflicts=True,
+            )
+            # Re-read so names inserted concurrently by another worker keep their id.
+            created = dict(
+                CanonicalItem.objects.filter(name__in=pending).values_list("name", "id")
+            )
+            transaction.on_commit(lambda: _choices.add(created))
+            matched.update(created)
+
+        ItemAlias.objects.bulk_create(
+            [
+                ItemAlias(alias=alias, canonical_item_id=canonical_id)
+                for alias, canonical_id in matched.items()
+            ],
+            ignore_conflicts=True,
+        )
+        resolved.update(matched)
+
+    transaction.on_commit(lambda: _recent.set_many(resolved))
+    return {**resolved, **corrected}
+
+
+def assign_canonical_items(details, user_id=None):
+    """
+    Set ``canonical_item_id`` on unsaved ``TransactionDetail`` objects of
+    ``user_id`` in one batch.
+    """
+    names = [normalize_item_name(detail.item_name) for detail in details]
+    resolved = resolve_canonical_ids(names, user_id)
+    for detail, name in zip(details, names):
+        detail.canonical_item_id = resolved.get(name)
+    return details
+
+
+def learn_correction(original_name: str, corrected_name: str, user_id):
+    """
+    Remember that, for ``user_id``, ``original_name`` means the same item as
+    ``corrected_name``.
+
+    Called when a user renames a scanned line item so their next receipt with
+    the same OCR text resolves straight to the corrected item. Other users are
+    not affected until an admin makes the correction global.
+    """
+    original = normalize_item_name(original_name)
+    corrected = normalize_item_name(corrected_name)
+    canonical_id = resolve_canonical_ids([corrected], user_id).get(corrected)
+    if not original or original == corrected or canonical_id is None:
+        return canonical_id
+
+    ItemAlias.objects.update_or_create(
+        user_id=user_id,
+        alias=original,
+        defaults={"canonical_item_id": canonical_id, "source": "correction"},
+    )
+    return canonical_id
@@ -0,0 +1,78 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from picbudget.core.utils.images import variant_paths
+from picbudget.transactions.models import Transaction
+
+logger = logging.getLogger(__name__)
+
+RECEIPTS_DIRECTORY = "receipts"
+
+
+def iter_storage_files(storage, directory):
+    if not storage.exists(directory):
+        return
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield f"{directory}/{name}"
+    for name in directories:
+        yield from iter_storage_files(storage, f"{directory}/{name}")
+
+
+def get_referenced_receipts():
+    """Every storage path a transaction points at: originals and variants."""
+    chunk_size = settings.SWEEP_BATCH_SIZE
+    transactions = Transaction.objects.order_by()
+    referenced = set(
+        transactions.exclude(receipt="")
+        .exclude(receipt__isnull=True)
+        .values_list("receipt", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+    for variants in (
+        transactions.exclude(receipt_variants={})
+        .values_list("receipt_variants", flat=True)
+        .iterator(chunk_size=chunk_size)
+    ):
+        referenced.update(variant_paths(variants))
+    return referenced
+
+
+def collect_orphaned_receipts(grace_seconds=None, dry_run=False):
+    """
+    Delete receipt files no transaction references.
+
+    The storage listing is diffed against ``Transaction.receipt`` and
+    ``receipt_variants``. Files newer than ``grace_seconds`` are kept, because
+    ``ReceiptView`` saves the upload before the transaction row exists.
+    """
+    grace_seconds = grace_seconds or settings.MEDIA_GC_GRACE_SECONDS
+    cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+    started = time.perf_counter()
+    referenced = get_referenced_receipts()
+
+    scanned = deleted = freed_bytes = 0
+    for path in iter_storage_files(default_storage, RECEIPTS_DIRECTORY):
+        scanned += 1
+        if path in referenced or default_storage.get_modified_time(path) > cutoff:
+            continue
+        freed_bytes += default_storage.size(path)
+        if not dry_run:
+            default_storage.delete(path)
+        deleted += 1
+
+    metrics = {
+        "scanned": scanned,
+        "referenced": len(referenced),
+        "deleted": deleted,
+        "freed_bytes": freed_bytes,
+        "dry_run": dry_run,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info("Receipt media collected: %s", metrics)
+    return metrics
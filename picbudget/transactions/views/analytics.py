@@ -0,0 +1,118 @@
+from datetime import datetime, time, timedelta
+from dateutil.relativedelta import relativedelta
+from django.db.models import DateField, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from ..models.transaction import Transaction
+from ..serializers.analytics import SpendingAnalyticsQuerySerializer
+
+# group_by -> (key field, display name field)
+GROUP_FIELDS = {
+    "label": ("labels__id", "labels__name"),
+    "wallet": ("wallet_id", "wallet__name"),
+    "type": ("type", "type"),
+    "method": ("method", "method"),
+}
+
+PERIOD_STEP = {
+    "day": relativedelta(days=1),
+    "week": relativedelta(weeks=1),
+    "month": relativedelta(months=1),
+}
+
+
+def truncate_date(value, interval):
+    if interval == "week":
+        return value - timedelta(days=value.weekday())
+    if interval == "month":
+        return value.replace(day=1)
+    return value
+
+
+def period_range(date_from, date_to, interval):
+    period = truncate_date(date_from, interval)
+    while period <= date_to:
+        yield period
+        period += PERIOD_STEP[interval]
+
+
+class SpendingAnalyticsView(APIView):
+    """
+    Time series of confirmed spending split by label, wallet, type or method.
+
+    All series come from one ``Trunc`` + ``values().annotate()`` query. When
+    grouping by label, a transaction with several labels counts towards each of
+    them, but never twice towards the same one.
+    """
+
+    def get(self, request, *args, **kwargs):
+        params = SpendingAnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+
+        interval = params["interval"]
+        key_field, name_field = GROUP_FIELDS[params["group_by"]]
+        start = timezone.make_aware(datetime.combine(params["date_from"], time.min))
+        end = timezone.make_aware(
+            datetime.combine(params["date_to"] + timedelta(days=1), time.min)
+        )
+
+        transactions = Transaction.objects.filter(
+            wallet__user=request.user,
+            status="confirmed",
+            transaction_date__gte=start,
+            transaction_date__lt=end,
+        )
+        if params.get("type"):
+            transactions = transactions.filter(type=params["type"])
+
+        rows = (
+            transactions.annotate(
+                period=Trunc("transaction_date", interval, output_field=DateField())
+            )
+            .values("period", key_field, name_field)
+            .annotate(total=Sum("amount"))
+            .order_by("period")
+        )
+
+        periods = list(period_range(params["date_from"], params["date_to"], interval))
+        series = {}
+        for row in rows:
+            key = row[key_field]
+            entry = series.setdefault(
+                key,
+                {
+                    "key": key,
+                    "name": row[name_field] or "Unlabeled",
+                    "total": 0,
+                    "values": {},
+                },
+            )
+            entry["values"][row["period"]] = row["total"]
+            entry["total"] += row["total"]
+
+        for entry in series.values():
+            if params["zero_fill"]:
+                entry["values"] = [
+                    {"period": period, "total": entry["values"].get(period, 0)}
+                    for period in periods
+                ]
+            else:
+                entry["values"] = [
+                    {"period": period, "total": total}
+                    for period, total in entry["values"].items()
+                ]
+
+        response_data = {
+            "interval": interval,
+            "group_by": params["group_by"],
+            "date_from": params["date_from"],
+            "date_to": params["date_to"],
+            "periods": periods,
+            "series": sorted(
+                series.values(), key=lambda entry: entry["total"], reverse=True
+            ),
+        }
+        return Response({"data": response_data})
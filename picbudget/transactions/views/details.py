@@ -2,8 +2,12 @@ from rest_framework import generics, permissions
 from ..models.transaction import Transaction
 from ..models.detail import TransactionDetail
 from ..serializers.details import TransactionItemSerializer
+from ..serializers.export import TransactionItemExportSerializer
+from .export import is_export_request, export_csv_response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db.models import Count, Sum
 from ..filters.detail import TransactionItemFilter
 
 
@@ -25,6 +29,10 @@ class TransactionItemListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
+        if is_export_request(request):
+            return export_csv_response(
+                TransactionItemExportSerializer(queryset), "transaction-items.csv"
+            )
         serializer = self.get_serializer(queryset, many=True)
         return Response({"data": serializer.data})
 
@@ -41,3 +49,26 @@ class TransactionItemDetailView(generics.RetrieveUpdateDestroyAPIView):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return Response({"data": serializer.data})
+
+
+class TransactionItemSummaryView(APIView):
+    def get(self, request, *args, **kwargs):
+        totals_by_item = (
+            TransactionDetail.objects.filter(
+                transaction__wallet__user=request.user,
+                transaction__status="confirmed",
+            )
+            .values("canonical_item_id", "canonical_item__name")
+            .annotate(total_spent=Sum("item_price"), count=Count("id"))
+            .order_by("-total_spent")
+        )
+        response_data = [
+            {
+                "canonical_item": entry["canonical_item_id"],
+                "item_name": entry["canonical_item__name"] or "Unmatched",
+                "total_spent": entry["total_spent"] or 0,
+                "count": entry["count"],
+            }
+            for entry in totals_by_item
+        ]
+        return Response({"data": response_data})
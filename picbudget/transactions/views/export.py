@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+EXPORT_QUERY_PARAM = "export"
+EXPORT_FORMAT_CSV = "csv"
+
+
+def is_export_request(request):
+    return request.GET.get(EXPORT_QUERY_PARAM) == EXPORT_FORMAT_CSV
+
+
+def export_csv_response(serializer, filename):
+    """
+    Stream ``serializer`` rows as a CSV attachment.
+
+    The content is an async generator so Daphne sends it chunk by chunk instead
+    of Django collecting a synchronous iterator into a list first.
+    """
+    response = StreamingHttpResponse(
+        serializer.stream_csv(chunk_size=settings.EXPORT_CHUNK_SIZE),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,70 @@
+from django.conf import settings
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from ..models.transaction import Transaction
+from ..models.detail import TransactionDetail
+from ..serializers.transaction import TransactionSerializer
+from ..serializers.details import TransactionItemSerializer
+from ..filters.search import search_queryset
+
+SEARCH_QUERY_PARAM = "q"
+
+
+class BaseSearchView(generics.ListAPIView):
+    """
+    Fuzzy search, paginated with ``limit``/``offset``.
+
+    At most ``SEARCH_CANDIDATE_LIMIT`` matches are ranked; ``count`` is the
+    number of ranked matches and ``truncated`` is true when more matched, in
+    which case the search term should be refined.
+    """
+
+    search_field = None
+
+    def get_search_term(self):
+        term = self.request.query_params.get(SEARCH_QUERY_PARAM, "").strip()
+        if not term:
+            raise ValidationError(
+                {SEARCH_QUERY_PARAM: ["This query parameter is required."]}
+            )
+        return term
+
+    def list(self, request, *args, **kwargs):
+        found = search_queryset(
+            self.get_queryset(),
+            self.search_field,
+            self.get_search_term(),
+            settings.SEARCH_CANDIDATE_LIMIT,
+        )
+        page = self.paginate_queryset(found.objects)
+        serializer = self.get_serializer(page, many=True)
+        return Response(
+            {
+                "data": serializer.data,
+                "count": self.paginator.count,
+                "truncated": found.truncated,
+                "next": self.paginator.get_next_link(),
+                "previous": self.paginator.get_previous_link(),
+            }
+        )
+
+
+class TransactionSearchView(BaseSearchView):
+    serializer_class = TransactionSerializer
+    search_field = "location"
+
+    def get_queryset(self):
+        return Transaction.objects.filter(
+            wallet__user=self.request.user
+        ).prefetch_related("labels")
+
+
+class TransactionItemSearchView(BaseSearchView):
+    serializer_class = TransactionItemSerializer
+    search_field = "item_name"
+
+    def get_queryset(self):
+        return TransactionDetail.objects.filter(
+            transaction__wallet__user=self.request.user
+        )
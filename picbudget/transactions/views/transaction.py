@@ -2,11 +2,15 @@ from rest_framework import generics, permissions
 from ..models.transaction import Transaction
 from picbudget.wallets.models import Wallet
 from ..serializers.transaction import TransactionSerializer
+from ..serializers.export import TransactionExportSerializer
+from .export import is_export_request, export_csv_response
 from django_filters.rest_framework import DjangoFilterBackend
 from ..filters.transaction import TransactionFilter
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Sum
+from django.db.models import Q, Sum
+from picbudget.core.views import AsyncAPIView
 
 from django.utils import timezone
 from datetime import timedelta
@@ -28,10 +32,40 @@ class TransactionListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
+        if is_export_request(request):
+            return export_csv_response(
+                TransactionExportSerializer(queryset), "transactions.csv"
+            )
         serializer = self.get_serializer(queryset, many=True)
         return Response({"data": serializer.data})
 
 
+class AsyncTransactionListView(AsyncAPIView):
+    write_view_class = TransactionListCreateView
+
+    async def get(self, request, *args, **kwargs):
+        filterset = TransactionFilter(
+            request.GET,
+            queryset=Transaction.objects.filter(wallet__user=request.user),
+            request=request,
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+
+        if is_export_request(request):
+            return export_csv_response(
+                TransactionExportSerializer(filterset.qs), "transactions.csv"
+            )
+
+        transactions = [
+            transaction async for transaction in filterset.qs.prefetch_related("labels")
+        ]
+        serializer = TransactionSerializer(
+            transactions, many=True, context={"request": request}
+        )
+        return self.render({"data": serializer.data})
+
+
 class TransactionDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TransactionSerializer
 
@@ -83,6 +117,27 @@ class TransactionSummaryView(APIView):
         return Response({"data": response_data})
 
 
+class AsyncTransactionSummaryView(AsyncAPIView):
+    async def get(self, request, *args, **kwargs):
+        now = timezone.now()
+
+        totals = await Transaction.objects.filter(
+            wallet__user=request.user, status="confirmed"
+        ).aaggregate(
+            total_today=Sum("amount", filter=Q(transaction_date__date=now.date())),
+            total_week=Sum(
+                "amount", filter=Q(transaction_date__gte=now - timedelta(days=7))
+            ),
+            total_month=Sum(
+                "amount", filter=Q(transaction_date__gte=now - timedelta(days=30))
+            ),
+            total_all=Sum("amount"),
+        )
+
+        response_data = {key: value or 0 for key, value in totals.items()}
+        return self.render({"data": response_data})
+
+
 class TransactionByLabelSummaryView(APIView):
     def get(self, request, *args, **kwargs):
         user = request.user
@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.urls import path
 from .views.wallet import (
     WalletListCreateView,
     WalletDetailView,
     TotalBalanceView,
+    AsyncTotalBalanceView,
 )
 
+BalanceView = AsyncTotalBalanceView if settings.ASYNC_READ_VIEWS else TotalBalanceView
+
 urlpatterns = [
     path("wallets/", WalletListCreateView.as_view(), name="wallet-list-create"),
     path("wallets/<uuid:pk>/", WalletDetailView.as_view(), name="wallet-detail"),
-    path("wallets/total-balance/", TotalBalanceView.as_view(), name="total-balance"),
+    path("wallets/total-balance/", BalanceView.as_view(), name="total-balance"),
 ]
@@ -7,6 +7,7 @@ from picbudget.transactions.models import Transaction
 from ..serializers.wallet import WalletSerializer
 from rest_framework.response import Response
 from django.db import models
+from picbudget.core.views import AsyncAPIView
 
 
 class WalletListCreateView(generics.ListCreateAPIView):
@@ -59,3 +60,28 @@ class TotalBalanceView(APIView):
 
         total_balance = total_wallet_balance + total_transaction_amount
         return Response({"data": {"total_balance": total_balance}})
+
+
+class AsyncTotalBalanceView(AsyncAPIView):
+    async def get(self, request, *args, **kwargs):
+        user = request.user
+        total_wallet_balance = (
+            await Wallet.objects.filter(user=user).aaggregate(Sum("balance"))
+        )["balance__sum"] or 0
+        total_transaction_amount = (
+            await Transaction.objects.filter(
+                wallet__user=user, status="confirmed"
+            ).aaggregate(
+                total=Sum(
+                    Case(
+                        When(type="income", then=F("amount")),
+                        When(type="expense", then=-F("amount")),
+                        default=0,
+                        output_field=models.DecimalField(),
+                    )
+                )
+            )
+        )["total"] or 0
+
+        total_balance = total_wallet_balance + total_transaction_amount
+        return self.render({"data": {"total_balance": total_balance}})
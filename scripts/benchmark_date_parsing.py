@@ -0,0 +1,178 @@
+"""
+Speed and accuracy of receipt date parsing: ``parse_date`` against the
+previous ``strptime`` loop of ``ReceiptProcessor.extract_date``.
+
+Lines are generated the way OCR hands them to the processor (lowercase), in
+the numeric, ISO and Indonesian month-name formats found on receipts, mixed
+with item, price and total lines that contain no date::
+
+    python scripts/benchmark_date_parsing.py --lines 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from synthetic_receipts import ITEMS, STORES  # noqa: E402
+
+from picbudget.picscan.utils.processors.dates import parse_date  # noqa: E402
+
+LEGACY_PATTERN = re.compile(
+    r"\b(\d{1,2}[-/\s]\d{1,2}[-/\s]\d{2,4}|\d{4}[-/\s]\d{1,2}[-/\s]\d{1,2}"
+    r"|\d{1,2}\s+\w+\s+\d{4})\b"
+)
+LEGACY_FORMATS = [
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d %B %Y",
+    "%m-%d-%Y",
+    "%d %b %Y",
+    "%Y.%m.%d",
+    "%d-%m-%Y",
+    "%m/%d/%Y",
+    "%d %b %Y",
+    "%Y.%m.%d",
+    "%d-%m-%y",
+    "%d/%m/%y",
+    "%d.%m.%y",
+]
+INDONESIAN_MONTHS = [
+    ("jan", "januari"),
+    ("feb", "februari"),
+    ("mar", "maret"),
+    ("apr", "april"),
+    ("mei", "mei"),
+    ("jun", "juni"),
+    ("jul", "juli"),
+    ("agt", "agustus"),
+    ("sep", "september"),
+    ("okt", "oktober"),
+    ("nov", "november"),
+    ("des", "desember"),
+]
+DATE_FORMATS = {
+    "dmy_slash": lambda day: f"{day:%d/%m/%Y}",
+    "dmy_dash": lambda day: f"{day:%d-%m-%Y}",
+    "dmy_dot_short": lambda day: f"{day:%d.%m.%y}",
+    "dmy_slash_short": lambda day: f"{day:%d/%m/%y}",
+    "iso": lambda day: day.isoformat(),
+    "month_name": lambda day: f"{day.day} {INDONESIAN_MONTHS[day.month - 1][1]} "
+    f"{day.year}",
+    "month_abbreviation": lambda day: f"{day:%d}-{INDONESIAN_MONTHS[day.month - 1][0]}"
+    f"-{day:%y}",
+}
+
+
+def legacy_extract_date(text):
+    """``ReceiptProcessor.extract_date`` before the regex parser, uncached."""
+    match = LEGACY_PATTERN.search(text)
+    if match:
+        date_str = match.group(0)
+        for date_format in LEGACY_FORMATS:
+            try:
+                date_obj = datetime.strptime(date_str, date_format)
+                if (
+                    date_format in ["%d-%m-%y", "%d/%m/%y", "%d.%m.%y"]
+                    and date_obj.year < 100
+                ):
+                    current_century = datetime.now().year // 100 * 100
+                    date_obj = date_obj.replace(year=current_century + date_obj.year)
+                return date_obj
+            except ValueError:
+                continue
+    return datetime.now()
+
+
+def make_lines(count, seed):
+    """``(line, expected date or None, format)`` triples, a third with dates."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        if rng.random() < 1 / 3:
+            day = date(2023, 1, 1) + timedelta(days=rng.randrange(700))
+            name = rng.choice(sorted(DATE_FORMATS))
+            prefix = rng.choice(["tgl", "tanggal", "", "kasir 02"])
+            time_of_day = f"{rng.randint(7, 21):02d}:{rng.randint(0, 59):02d}"
+            line = f"{prefix} {DATE_FORMATS[name](day)} {time_of_day}".strip()
+            lines.append((line, day, name))
+        else:
+            item, price = rng.choice(ITEMS)
+            line = rng.choice(
+                [
+                    f"{item} {price}",
+                    f"{rng.randint(1, 3)} x {price:,}".replace(",", "."),
+                    f"total {price * rng.randint(1, 9)}",
+                    rng.choice(STORES)[1],
+                ]
+            )
+            lines.append((line.lower(), None, "no_date"))
+    return lines
+
+
+def run_parser(parse, lines, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outputs = [parse(line) for line, _, _ in lines]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return outputs, best
+
+
+def score(dates, lines):
+    by_format = {}
+    for parsed, (_, expected, name) in zip(dates, lines):
+        stats = by_format.setdefault(name, [0, 0])
+        stats[1] += 1
+        stats[0] += parsed == expected
+    return {name: round(right / total, 4) for name, (right, total) in by_format.items()}
+
+
+def run(args):
+    lines = make_lines(args.lines, args.seed)
+    today = date.today()
+
+    legacy, legacy_seconds = run_parser(legacy_extract_date, lines, args.repeat)
+    # The old parser fell back to now(); count that as "no date".
+    legacy_dates = [
+        None if value.date() == today else value.date() for value in legacy
+    ]
+
+    parsed, seconds = run_parser(parse_date, lines, args.repeat)
+    dates = [value.date.date() if value else None for value in parsed]
+    confidences = [value.confidence for value in parsed if value]
+
+    return {
+        "lines": len(lines),
+        "seed": args.seed,
+        "legacy": {
+            "seconds": round(legacy_seconds, 4),
+            "lines_per_second": round(len(lines) / legacy_seconds),
+            "accuracy": score(legacy_dates, lines),
+        },
+        "parse_date": {
+            "seconds": round(seconds, 4),
+            "lines_per_second": round(len(lines) / seconds),
+            "speedup": round(legacy_seconds / seconds, 2),
+            "accuracy": score(dates, lines),
+            "mean_confidence": (
+                round(sum(confidences) / len(confidences), 3) if confidences else None
+            ),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
@@ -0,0 +1,133 @@
+"""
+Closed-loop HTTP load generator for comparing API configurations.
+
+Each of ``--concurrency`` workers keeps one request in flight until
+``--requests`` have been sent in total, then latency percentiles and requests
+per second are printed as JSON so runs can be diffed across configurations.
+
+Example, comparing the async read views against the DRF ones::
+
+    PICBUDGET_SETTING_ASYNC_READ_VIEWS=true daphne picbudget.project.asgi:application
+    python scripts/benchmark_http.py --token $ACCESS --label async \\
+        /api/transactions/ /api/transactions/summary/ /api/wallets/total-balance/ /api/plans/
+
+    PICBUDGET_SETTING_ASYNC_READ_VIEWS=false daphne picbudget.project.asgi:application
+    python scripts/benchmark_http.py --token $ACCESS --label sync ...
+
+JWT user cache on and off for the transaction summary::
+
+    PICBUDGET_SETTING_JWT_USER_CACHE_TIMEOUT=60 daphne picbudget.project.asgi:application
+    python scripts/benchmark_http.py --token $ACCESS --label cached /api/transactions/summary/
+
+    PICBUDGET_SETTING_JWT_USER_CACHE_TIMEOUT=0 daphne picbudget.project.asgi:application
+    python scripts/benchmark_http.py --token $ACCESS --label uncached /api/transactions/summary/
+
+Logins per second under a password-guessing burst against one account (the
+statuses show how many attempts were rejected with 429 before hashing)::
+
+    python scripts/benchmark_http.py --method POST --concurrency 50 --requests 2000 \
+        --data '{"email": "victim@example.com", "password": "guess-{n}"}' \
+        /api/auth/login/
+
+Registrations per second (every request registers a new address)::
+
+    python scripts/benchmark_http.py --method POST --concurrency 50 \
+        --data '{"email": "bench{n}@example.com", "password": "Bench-pass-123"}' \
+        /api/auth/register/
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def render_body(template, number):
+    """Fill ``{n}`` in the JSON body template, e.g. to register unique emails."""
+    if template is None:
+        return None
+    return json.loads(template.replace("{n}", str(number)))
+
+
+async def run_path(client, method, path, body, total, concurrency):
+    latencies = []
+    statuses = {}
+    remaining = iter(range(total))
+
+    async def worker():
+        for number in remaining:
+            started = time.perf_counter()
+            response = await client.request(
+                method, path, json=render_body(body, number)
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": total,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2),
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+        },
+        "statuses": statuses,
+    }
+
+
+async def main(args):
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    headers.update(dict(header.split(":", 1) for header in args.header))
+    body = args.data
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, headers=headers, limits=limits, timeout=60
+    ) as client:
+        results = []
+        for path in args.paths:
+            if args.method == "GET":
+                # Warm up connections and caches before measuring.
+                await run_path(
+                    client, args.method, path, body, args.concurrency, args.concurrency
+                )
+            results.append(
+                await run_path(
+                    client, args.method, path, body, args.requests, args.concurrency
+                )
+            )
+    print(json.dumps({"label": args.label, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", help="JWT access token")
+    parser.add_argument("--header", action="append", default=[], help="Name:value")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--data", help="JSON request body, {n} is the request number")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--label", default="")
+    asyncio.run(main(parser.parse_args()))
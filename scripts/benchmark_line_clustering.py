@@ -0,0 +1,130 @@
+"""
+Accuracy and timing benchmark for OCR line clustering.
+
+Synthetic receipts (fixed seed) are rendered as PaddleOCR-style results:
+one quadrilateral per word group, rotated by a skew angle, jittered, and
+emitted in PaddleOCR's reading order or shuffled. Both the previous
+neighbour-only grouping and ``cluster_lines`` are scored on exact line
+recovery, then ``cluster_lines`` is timed on a receipt with many boxes::
+
+    python scripts/benchmark_line_clustering.py --receipts 200 --boxes 400
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from picbudget.picscan.utils.processors.layout import cluster_lines  # noqa: E402
+
+WORDS = ["indomie", "goreng", "aqua", "600ml", "teh", "botol", "roti", "tawar",
+         "susu", "ultra", "kopi", "kapal", "api", "gula", "pasir", "minyak"]
+SCENARIOS = {
+    "straight": {"skew": 0.0, "shuffle": False},
+    "skewed": {"skew": 2.5, "shuffle": False},
+    "shuffled": {"skew": 0.0, "shuffle": True},
+    "skewed+shuffled": {"skew": 2.5, "shuffle": True},
+}
+
+
+def legacy_group_inline(ocr_result, tolerance=15):
+    """The grouping this benchmark replaces: compare each box with the next one."""
+    if not ocr_result:
+        return []
+
+    def is_inline(box1, box2):
+        return (
+            abs(box1[0][1] - box2[0][1]) <= tolerance
+            and abs(box1[2][1] - box2[2][1]) <= tolerance
+        )
+
+    grouped, current = [], []
+    for i, entry in enumerate(ocr_result[:-1]):
+        current.append(entry[1][0])
+        if not is_inline(entry[0], ocr_result[i + 1][0]):
+            grouped.append(" ".join(current).lower())
+            current = []
+    current.append(ocr_result[-1][1][0])
+    grouped.append(" ".join(current).lower())
+    return grouped
+
+
+def make_receipt(rng, lines, skew_degrees, shuffle, width=600):
+    """Return ``(ocr_result, expected_lines)`` for one synthetic receipt."""
+    angle = math.radians(rng.uniform(-skew_degrees, skew_degrees))
+    cos, sin = math.cos(angle), math.sin(angle)
+    entries, expected = [], []
+    y = 40.0
+    for _ in range(lines):
+        height = rng.uniform(20, 28)
+        name = " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+        groups = [name, str(rng.randint(1, 9)), f"{rng.randint(1, 250)}.{rng.choice(['000', '500'])}"]
+        xs = [20.0, width * 0.55, width * 0.75]
+        for text, x in zip(groups, xs):
+            box_width = 11.0 * len(text)
+            corners = [(x, y), (x + box_width, y), (x + box_width, y + height), (x, y + height)]
+            box = [
+                [
+                    cx * cos - cy * sin + rng.uniform(-1.5, 1.5),
+                    cx * sin + cy * cos + rng.uniform(-1.5, 1.5),
+                ]
+                for cx, cy in corners
+            ]
+            entries.append([box, (text.upper(), 0.99)])
+        expected.append(" ".join(groups))
+        y += height + rng.uniform(8, 14)
+
+    if shuffle:
+        rng.shuffle(entries)
+    else:
+        # PaddleOCR returns boxes sorted by their top-left corner.
+        entries.sort(key=lambda entry: (round(entry[0][0][1] / 10), entry[0][0][0]))
+    return entries, expected
+
+
+def score(group, fixtures):
+    exact = lines_ok = lines_total = 0
+    for ocr_result, expected in fixtures:
+        produced = group(ocr_result)
+        exact += produced == expected
+        lines_ok += len(set(produced) & set(expected))
+        lines_total += len(expected)
+    return {
+        "receipt_accuracy": round(exact / len(fixtures), 3),
+        "line_accuracy": round(lines_ok / lines_total, 3),
+    }
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    accuracy = {}
+    for name, scenario in SCENARIOS.items():
+        fixtures = [
+            make_receipt(rng, rng.randint(10, 30), scenario["skew"], scenario["shuffle"])
+            for _ in range(args.receipts)
+        ]
+        accuracy[name] = {
+            "legacy": score(legacy_group_inline, fixtures),
+            "cluster_lines": score(cluster_lines, fixtures),
+        }
+
+    large, _ = make_receipt(rng, args.boxes // 3, 2.5, True)
+    runs = timeit.repeat(lambda: cluster_lines(large), number=100, repeat=5)
+    timing = {
+        "boxes": len(large),
+        "best_ms_per_call": round(min(runs) / 100 * 1000, 4),
+    }
+    print(json.dumps({"accuracy": accuracy, "timing": timing}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--receipts", type=int, default=200)
+    parser.add_argument("--boxes", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
@@ -0,0 +1,191 @@
+"""
+Micro-benchmark of ``ReceiptProcessor`` NER post-processing on long receipts.
+
+Times label decoding, label correction and item/price pairing
+(``_parse_receipt``) against the previous per-token dict decoding and
+``extract_items`` implementation, which rebuilt every line list per item line
+and so grew quadratically with receipt length. Predicted labels come from the
+synthetic receipts' ground truth with some noise, so no model is loaded; both
+implementations must give the same result::
+
+    python scripts/benchmark_ner_postprocessing.py --items 10 100 500
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from synthetic_receipts import ITEMS, STORES  # noqa: E402
+
+from picbudget.picscan.utils.processors.dates import parse_date  # noqa: E402
+from picbudget.picscan.utils.processors.receipt_processor import (  # noqa: E402
+    ReceiptProcessor,
+)
+
+LABELS = {"O": 1, "ITEM_NAME": 2, "PRICE": 3, "ADDRESS": 4, "DATE": 5}
+
+
+class LegacyReceiptProcessor(ReceiptProcessor):
+    """``_parse_receipt`` as it was before the single-pass rewrite."""
+
+    def extract_items(self, text_lines, label_lines, current_idx):
+        line = text_lines[current_idx].split()
+        labels = label_lines[current_idx]
+        item_name = " ".join(
+            word for word, label in zip(line, labels) if label == "ITEM_NAME"
+        )
+        if not item_name:
+            return None
+        price = None
+        for i in range(2):
+            if current_idx + i >= len(text_lines):
+                break
+            check_line = text_lines[current_idx + i].split()
+            check_labels = label_lines[current_idx + i]
+            prices = [
+                int(word)
+                for word, label in zip(check_line, check_labels)
+                if label == "PRICE" and self._is_valid_price(word)
+            ]
+            if prices:
+                price = prices[-1]
+                break
+        if price is not None:
+            return {"item_name": item_name, "item_price": price}
+        return None
+
+    def _parse_receipt(self, text, predicted_indices):
+        clean_text = self._clean_text(text)
+        token_index = 0
+        processed_lines = []
+        for line in text.strip().split("\n"):
+            tokens = line.split()
+            if not tokens:
+                continue
+            labels = [
+                self.index_to_label.get(idx, "O")
+                for idx in predicted_indices[token_index : token_index + len(tokens)]
+            ]
+            token_index += len(tokens)
+            processed_lines.append((line, tokens, labels))
+
+        items, address, date = [], None, None
+        for i, (line, tokens, labels) in enumerate(processed_lines):
+            labels = self.correct_labels(tokens, labels)
+            labels = self.correct_address_labels(tokens, labels)
+            if "ITEM_NAME" in labels:
+                item = self.extract_items(
+                    [p[0] for p in processed_lines], [p[2] for p in processed_lines], i
+                )
+                if item:
+                    items.append(item)
+            if not address and "ADDRESS" in labels:
+                address = line
+            if date is None or date.confidence < 1.0:
+                parsed = parse_date(line)
+                if parsed and (date is None or parsed.confidence > date.confidence):
+                    date = parsed
+        return {
+            "total": self.get_total_entities(clean_text),
+            "date": date.date if date else datetime.now(),
+            "address": address,
+            "items": items,
+        }
+
+
+def make_receipt(rng, item_count, noise):
+    """Lowercase OCR-like text and label indices for a receipt of ``item_count``."""
+    store, address = rng.choice(STORES)
+    lines = [
+        (store.lower(), "O"),
+        (address.lower(), "ADDRESS"),
+        ("tgl 05/06/2024", "O"),
+    ]
+    total = 0
+    for _ in range(item_count):
+        name, price = rng.choice(ITEMS)
+        total += price
+        if rng.random() < 0.2:
+            # Price on the following line, as on narrow receipts.
+            lines += [(name.lower(), "ITEM_NAME"), (f"1 x {price}", "PRICE")]
+        else:
+            lines.append((f"{name.lower()} {price}", "ITEM_NAME"))
+    lines += [(f"total {total}", "O"), ("terima kasih", "O")]
+
+    text, indices = [], []
+    for line, kind in lines:
+        text.append(line)
+        for position, word in enumerate(line.split()):
+            if kind == "ITEM_NAME" and word.isdigit():
+                label = "PRICE"
+            elif kind == "PRICE":
+                label = "PRICE" if position == len(line.split()) - 1 else "O"
+            else:
+                label = kind
+            if rng.random() < noise:
+                label = rng.choice(sorted(LABELS))
+            indices.append(LABELS[label])
+    return "\n".join(text), np.array(indices)
+
+
+def time_parse(processor, receipts, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [processor._parse_receipt(text, labels) for text, labels in receipts]
+        timings.append(time.perf_counter() - started)
+    return results, min(timings)
+
+
+def run(args):
+    label_tokenizer = SimpleNamespace(word_index=dict(LABELS))
+    current = ReceiptProcessor(None, None, label_tokenizer)
+    legacy = LegacyReceiptProcessor(None, None, label_tokenizer)
+
+    report = []
+    for item_count in args.items:
+        rng = random.Random(args.seed)
+        receipts = [
+            make_receipt(rng, item_count, args.noise) for _ in range(args.receipts)
+        ]
+        old_results, old_seconds = time_parse(legacy, receipts, args.repeat)
+        new_results, new_seconds = time_parse(current, receipts, args.repeat)
+        mismatches = sum(
+            old["date"].date() != new["date"].date()
+            or old["items"] != new["items"]
+            or old["address"] != new["address"]
+            or old["total"] != new["total"]
+            for old, new in zip(old_results, new_results)
+        )
+        report.append(
+            {
+                "items": item_count,
+                "tokens": round(statistics.fmean(len(l) for _, l in receipts)),
+                "legacy_ms_per_receipt": round(old_seconds / len(receipts) * 1000, 3),
+                "ms_per_receipt": round(new_seconds / len(receipts) * 1000, 3),
+                "speedup": round(old_seconds / new_seconds, 2),
+                "mismatches": mismatches,
+            }
+        )
+    return {"seed": args.seed, "receipts": args.receipts, "results": report}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 50, 200, 1000])
+    parser.add_argument("--receipts", type=int, default=50)
+    parser.add_argument("--noise", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
@@ -0,0 +1,84 @@
+"""
+Latency and item recall of ``ReceiptProcessor`` on receipts longer than one
+NER window.
+
+Receipts of growing length go through ``process_receipt`` with the trained
+model. Each row reports the number of token ids and windows, the median
+latency relative to a one-window receipt and the share of items recovered,
+which used to drop to zero past the 150-token cutoff::
+
+    python scripts/benchmark_ner_windows.py --items 5 20 50 100 200
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmark_picscan import load_receipt_processor, match_items  # noqa: E402
+from synthetic_receipts import ITEMS, STORES  # noqa: E402
+
+
+def make_receipt(rng, item_count):
+    """OCR-like receipt text with ``item_count`` items and its expected items."""
+    store, address = rng.choice(STORES)
+    items = [
+        {"item_name": name, "item_price": price}
+        for name, price in (rng.choice(ITEMS) for _ in range(item_count))
+    ]
+    total = sum(item["item_price"] for item in items)
+    lines = [store.lower(), address.lower(), "tgl 05/06/2024 12:30"]
+    lines += [f"{item['item_name'].lower()} {item['item_price']}" for item in items]
+    lines += [f"total {total}", f"tunai {total}", "terima kasih"]
+    return "\n".join(lines), items
+
+
+def run(args):
+    processor = load_receipt_processor()
+    rng = random.Random(args.seed)
+    processor.process_receipt(make_receipt(rng, 3)[0])
+
+    results = []
+    for item_count in args.items:
+        receipts = [make_receipt(rng, item_count) for _ in range(args.receipts)]
+        latencies, matched, expected = [], 0, 0
+        for text, items in receipts:
+            started = time.perf_counter()
+            result = processor.process_receipt(text)
+            latencies.append((time.perf_counter() - started) * 1000)
+            matched += match_items(result["items"], items)
+            expected += len(items)
+        tokens = len(processor._sequence(receipts[0][0])[0])
+        results.append(
+            {
+                "items": item_count,
+                "tokens": tokens,
+                "windows": len(processor._window_starts(tokens)),
+                "p50_ms": round(statistics.median(latencies), 2),
+                "item_recall": round(matched / expected, 4),
+            }
+        )
+
+    single_window = results[0]["p50_ms"]
+    for result in results:
+        result["latency_vs_first"] = round(result["p50_ms"] / single_window, 2)
+    return {
+        "seed": args.seed,
+        "window": processor.WINDOW,
+        "overlap": processor.WINDOW_OVERLAP,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[5, 20, 50, 100, 200])
+    parser.add_argument("--receipts", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
@@ -0,0 +1,324 @@
+"""
+Latency, throughput, memory and accuracy benchmark for the PicScan pipeline.
+
+The synthetic fixtures from ``synthetic_receipts.py`` go through each stage on
+its own and then through the whole pipeline:
+
+* ``image``: decode and ``ImageProcessor.preprocess_image``
+* ``ocr``: ``TextExtractor`` on the preprocessed images
+* ``ner``: ``ReceiptProcessor.process_receipt`` on the ground-truth text, so
+  labelling accuracy is measured without OCR errors
+* ``pipeline``: image bytes to receipt result, as ``ReceiptView`` does it
+
+Each stage reports latency percentiles, images per second of wall time and per
+CPU second (i.e. per busy core), peak RSS after the stage and, where the stage
+produces something scoreable, accuracy against the ground truth. The JSON
+output carries the commit and environment, so runs can be compared::
+
+    python scripts/benchmark_picscan.py --output before.json
+    git checkout feature-branch
+    python scripts/benchmark_picscan.py --baseline before.json --output after.json
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime
+
+import PIL
+from rapidfuzz import fuzz
+from rapidfuzz.distance import Levenshtein
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from synthetic_receipts import PROFILES, make_fixtures  # noqa: E402
+
+STAGES = ("image", "ocr", "ner", "pipeline")
+ITEM_NAME_MIN_SIMILARITY = 80
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_receipt_processor():
+    """Build the ``ReceiptProcessor`` the way ``PicscanConfig.ready`` does."""
+    from keras.models import load_model
+
+    from picbudget.picscan.apps import PicscanConfig
+    from picbudget.picscan.utils.processors.receipt_processor import ReceiptProcessor
+
+    with open(PicscanConfig.TOKENIZER_PATH, "rb") as file:
+        tokenizer = pickle.load(file)
+    with open(PicscanConfig.LABEL_TOKENIZER_PATH, "rb") as file:
+        label_tokenizer = pickle.load(file)
+    return ReceiptProcessor(
+        model=load_model(PicscanConfig.MODEL_PATH),
+        tokenizer=tokenizer,
+        label_tokenizer=label_tokenizer,
+    )
+
+
+def run_stage(function, inputs, warmup):
+    """Time ``function`` over ``inputs``; failures yield ``None`` and are counted."""
+    for value in inputs[:warmup]:
+        try:
+            function(value)
+        except Exception:
+            pass
+
+    outputs, latencies, errors = [], [], 0
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    for value in inputs:
+        started = time.perf_counter()
+        try:
+            outputs.append(function(value))
+        except Exception:
+            outputs.append(None)
+            errors += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+
+    latencies.sort()
+    return outputs, {
+        "images": len(inputs),
+        "errors": errors,
+        "seconds": round(wall, 3),
+        "images_per_second": round(len(inputs) / wall, 3),
+        "images_per_cpu_second": round(len(inputs) / cpu, 3) if cpu else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2),
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p90": round(percentile(latencies, 0.90), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(latencies[-1], 2),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def expected_text(truth):
+    """Ground-truth lines cleaned the way ``TextExtractor`` cleans OCR output."""
+    from picbudget.picscan.utils.processors.extract_text import TextExtractor
+
+    lines = (TextExtractor._preprocess_text(line) for line in truth.lines)
+    return "\n".join(line for line in lines if line)
+
+
+def score_text(texts, fixtures):
+    distances = [
+        Levenshtein.normalized_distance(
+            " ".join((text or "").split()), " ".join(expected_text(fixture.truth).split())
+        )
+        for text, fixture in zip(texts, fixtures)
+    ]
+    return {"character_error_rate": round(statistics.fmean(distances), 4)}
+
+
+def match_items(predicted, expected):
+    """Count predicted items whose price matches and name is close to a truth item."""
+    remaining = list(expected)
+    matched = 0
+    for item in predicted:
+        for candidate in remaining:
+            if item["item_price"] == candidate["item_price"] and (
+                fuzz.ratio(str(item["item_name"]).upper(), candidate["item_name"])
+                >= ITEM_NAME_MIN_SIMILARITY
+            ):
+                remaining.remove(candidate)
+                matched += 1
+                break
+    return matched
+
+
+def as_date(value):
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return None
+
+
+def score_results(results, fixtures):
+    totals = dates = matched = predicted = expected = 0
+    for result, fixture in zip(results, fixtures):
+        truth = fixture.truth
+        expected += len(truth.items)
+        if result is None:
+            continue
+        totals += result["total"] == truth.total
+        dates += as_date(result["date"]) == truth.date
+        predicted += len(result["items"])
+        matched += match_items(result["items"], truth.items)
+
+    precision = matched / predicted if predicted else 0.0
+    recall = matched / expected if expected else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if matched else 0.0
+    return {
+        "total_accuracy": round(totals / len(fixtures), 4),
+        "date_accuracy": round(dates / len(fixtures), 4),
+        "item_precision": round(precision, 4),
+        "item_recall": round(recall, 4),
+        "item_f1": round(f1, 4),
+    }
+
+
+def score_by_profile(scorer, outputs, fixtures):
+    groups = defaultdict(lambda: ([], []))
+    for output, fixture in zip(outputs, fixtures):
+        groups[fixture.profile][0].append(output)
+        groups[fixture.profile][1].append(fixture)
+    return {
+        "overall": scorer(outputs, fixtures),
+        "by_profile": {
+            profile: scorer(*groups[profile]) for profile in PROFILES if profile in groups
+        },
+    }
+
+
+def run(args):
+    from picbudget.picscan.utils.processors.extract_text import TextExtractor
+    from picbudget.picscan.utils.processors.image_processing import ImageProcessor
+
+    fixtures = make_fixtures(args.seed, args.per_profile, args.profile, args.font)
+    stages = args.stage or list(STAGES)
+    report = {}
+
+    def preprocess(fixture):
+        return ImageProcessor(fixture.to_bgr()).preprocess_image()
+
+    def extract(image):
+        return TextExtractor(image).extracted_text
+
+    processor = None
+    if "ner" in stages or "pipeline" in stages:
+        started = time.perf_counter()
+        processor = load_receipt_processor()
+        report["model_load_seconds"] = round(time.perf_counter() - started, 3)
+
+    images = None
+    if "image" in stages or "ocr" in stages:
+        images, report["image"] = run_stage(preprocess, fixtures, args.warmup)
+        if "image" not in stages:
+            del report["image"]
+
+    if "ocr" in stages:
+        texts, report["ocr"] = run_stage(extract, images, args.warmup)
+        report["ocr"]["accuracy"] = score_by_profile(score_text, texts, fixtures)
+
+    if "ner" in stages:
+        truths = [expected_text(fixture.truth) for fixture in fixtures]
+        results, report["ner"] = run_stage(processor.process_receipt, truths, args.warmup)
+        report["ner"]["accuracy"] = score_results(results, fixtures)
+
+    if "pipeline" in stages:
+
+        def pipeline(fixture):
+            return processor.process_receipt(extract(preprocess(fixture)))
+
+        results, report["pipeline"] = run_stage(pipeline, fixtures, args.warmup)
+        report["pipeline"]["accuracy"] = score_by_profile(
+            score_results, results, fixtures
+        )
+
+    return {
+        "label": args.label,
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "fixtures": {
+            "seed": args.seed,
+            "count": len(fixtures),
+            "profiles": sorted({fixture.profile for fixture in fixtures}),
+        },
+        "stages": {stage: report[stage] for stage in STAGES if stage in report},
+        "model_load_seconds": report.get("model_load_seconds"),
+    }
+
+
+def compare(baseline, current):
+    """One line per stage metric: baseline -> current (relative change)."""
+    lines = [f"{baseline.get('commit')} -> {current.get('commit')}"]
+    for stage, metrics in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+        pairs = [
+            ("p50_ms", before["latency_ms"]["p50"], metrics["latency_ms"]["p50"]),
+            ("p99_ms", before["latency_ms"]["p99"], metrics["latency_ms"]["p99"]),
+            ("images/s", before["images_per_second"], metrics["images_per_second"]),
+            ("peak_rss_mb", before["peak_rss_mb"], metrics["peak_rss_mb"]),
+        ]
+        accuracy = metrics.get("accuracy", {})
+        accuracy = accuracy.get("overall", accuracy)
+        old_accuracy = before.get("accuracy", {})
+        old_accuracy = old_accuracy.get("overall", old_accuracy)
+        pairs += [(name, old_accuracy.get(name), value) for name, value in accuracy.items()]
+        for name, old, new in pairs:
+            if old is None or new is None:
+                continue
+            change = f" ({(new - old) / old:+.1%})" if old else ""
+            lines.append(f"{stage:>8} {name:<22} {old:>10} -> {new:<10}{change}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stage", action="append", choices=STAGES)
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES))
+    parser.add_argument("--per-profile", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--font", help="TrueType font instead of Pillow's default")
+    parser.add_argument("--label", default="")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    result = run(args)
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            print(compare(json.load(file), result), file=sys.stderr)
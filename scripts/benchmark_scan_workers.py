@@ -0,0 +1,155 @@
+"""
+Throughput of the PicScan scan worker pool against its number of workers.
+
+For each worker count the synthetic fixtures from ``synthetic_receipts.py``
+are submitted to a ``ScanWorkerPool`` at once, the way a burst of uploads
+reaches one server process. Workers are started and their models loaded before
+timing. Worker count 0 is the in-process baseline: one receipt after another
+with a single OCR model::
+
+    python scripts/benchmark_scan_workers.py --workers 0 1 2 4 8
+    python scripts/benchmark_scan_workers.py --workers 4 --threads 1 --threads 2
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmark_picscan import git_commit, percentile  # noqa: E402
+from synthetic_receipts import PROFILES, make_fixtures  # noqa: E402
+
+from picbudget.picscan.utils import workers  # noqa: E402
+
+
+def run_in_process(images):
+    from picbudget.picscan.utils.processors.image_processing import decode_image
+
+    workers.extract_receipt_ocr(decode_image(images[0]))
+    latencies = []
+    started = time.perf_counter()
+    for image in images:
+        workers.extract_receipt_ocr(decode_image(image))
+        latencies.append(time.perf_counter() - started)
+    return time.perf_counter() - started, latencies
+
+
+def run_pool(images, count, threads):
+    pool = workers.ScanWorkerPool(count, threads)
+    try:
+        pool.warm_up()
+        started = time.perf_counter()
+        futures = [pool.submit(image) for image in images]
+        latencies = []
+        for future in futures:
+            future.result()
+            latencies.append(time.perf_counter() - started)
+        return time.perf_counter() - started, latencies
+    finally:
+        pool.shutdown()
+
+
+def measure(images, count, threads, repeat):
+    """Best of ``repeat`` runs; latency is submit-to-result of each receipt."""
+    runs = [
+        run_in_process(images) if count == 0 else run_pool(images, count, threads)
+        for _ in range(repeat)
+    ]
+    seconds, latencies = min(runs, key=lambda run: run[0])
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {
+        "workers": count,
+        # The in-process baseline keeps the libraries' own thread defaults.
+        "threads_per_worker": (
+            (threads or workers.threads_per_worker(count)) if count else None
+        ),
+        "seconds": round(seconds, 3),
+        "images_per_second": round(len(images) / seconds, 3),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2),
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p90": round(percentile(latencies, 0.90), 2),
+            "max": round(latencies[-1], 2),
+        },
+    }
+
+
+def run(args):
+    fixtures = make_fixtures(args.seed, args.per_profile, args.profile, args.font)
+    images = [fixture.image for fixture in fixtures]
+    results = [
+        measure(images, count, threads, args.repeat)
+        for count in args.workers
+        for threads in (args.threads if count else [None])
+    ]
+    baseline = next(
+        (result for result in results if result["workers"] == 0), results[0]
+    )
+    for result in results:
+        result["speedup"] = round(
+            result["images_per_second"] / baseline["images_per_second"], 2
+        )
+    return {
+        "label": args.label,
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "fixtures": {"seed": args.seed, "count": len(images)},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[0, 1, 2, 4, os.cpu_count()]
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        action="append",
+        help="Threads per worker; default divides the cores between the workers",
+    )
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES))
+    parser.add_argument("--per-profile", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--font", help="TrueType font instead of Pillow's default")
+    parser.add_argument("--label", default="")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    args.workers = sorted(set(args.workers))
+    args.threads = args.threads or [None]
+
+    report = run(args)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    for result in report["results"]:
+        print(
+            f"{result['workers']:>3} workers x {result['threads_per_worker'] or '-':>2}"
+            " threads"
+            f"  {result['images_per_second']:>8} images/s"
+            f"  p50 {result['latency_ms']['p50']:>9} ms"
+            f"  x{result['speedup']}",
+            file=sys.stderr,
+        )
+
+
+# The pool spawns workers that import this module again.
+if __name__ == "__main__":
+    main()
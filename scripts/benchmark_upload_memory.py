@@ -0,0 +1,143 @@
+"""
+Peak memory of ingesting one PicScan upload: validating, storing and decoding.
+
+Receipt photos of growing resolution are wrapped the way Django's upload
+handlers hand them to the view: in memory up to ``FILE_UPLOAD_MAX_MEMORY_SIZE``
+(2.5 MB), in a temporary file above. Each upload then goes through the
+previous ingest (``ImageField`` validation, ``read()``, a ``ContentFile`` save
+and decoding the bytes) and through the streaming one (header check, saving
+the upload itself and decoding its buffer). Peak memory is measured with
+``tracemalloc``, which also sees NumPy and OpenCV arrays; ``decoded_mb`` is the
+decoded image both have to hold::
+
+    python scripts/benchmark_upload_memory.py --megapixels 2 8 12 24
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from django.conf import settings  # noqa: E402
+
+from synthetic_receipts import make_fixture  # noqa: E402
+
+from picbudget.picscan.utils.processors.image_processing import (  # noqa: E402
+    decode_image,
+)
+from picbudget.picscan.utils.uploads import (  # noqa: E402
+    read_image_header,
+    upload_buffer,
+)
+
+
+def make_photo(seed, megapixels):
+    """A JPEG receipt photo of about ``megapixels``, with camera-like noise."""
+    with Image.open(io.BytesIO(make_fixture(seed, "photo").image)) as image:
+        scale = (megapixels * 1_000_000 / (image.width * image.height)) ** 0.5
+        image = image.resize((int(image.width * scale), int(image.height * scale)))
+    pixels = np.asarray(image, dtype=np.int16)
+    noise = np.random.default_rng(seed).normal(0, 6, pixels.shape)
+    pixels = np.clip(pixels + noise, 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def make_upload(data):
+    """``data`` as Django's upload handlers would pass it to the view."""
+    from django.core.files.uploadedfile import (
+        InMemoryUploadedFile,
+        TemporaryUploadedFile,
+    )
+
+    # Written in chunks like the handlers do, so the in-memory file owns its
+    # buffer instead of sharing ``data``.
+    if len(data) <= settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+        file = io.BytesIO()
+    else:
+        file = TemporaryUploadedFile("receipt.jpg", "image/jpeg", len(data), None)
+    for start in range(0, len(data), 64 * 1024):
+        file.write(data[start : start + 64 * 1024])
+    file.seek(0)
+    if isinstance(file, io.BytesIO):
+        return InMemoryUploadedFile(
+            file, "receipt", "receipt.jpg", "image/jpeg", len(data), None
+        )
+    return file
+
+
+def ingest_buffered(upload, storage):
+    from django import forms
+    from django.core.files.base import ContentFile
+
+    forms.ImageField().to_python(upload)
+    upload.seek(0)
+    data = upload.read()
+    storage.save("receipt.jpg", ContentFile(data))
+    return decode_image(data)
+
+
+def ingest_streaming(upload, storage):
+    header = read_image_header(upload)
+    storage.save(f"receipt{header.extension}", upload)
+    with upload_buffer(upload) as buffer:
+        return decode_image(buffer)
+
+
+def peak_memory(ingest, data, storage):
+    upload = make_upload(data)
+    tracemalloc.start()
+    try:
+        image = ingest(upload, storage)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        upload.close()
+    return peak, image.nbytes
+
+
+def run(args):
+    from django.core.files.storage import FileSystemStorage
+
+    megabyte = 1024 * 1024
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        storage = FileSystemStorage(location=directory)
+        for megapixels in args.megapixels:
+            data = make_photo(args.seed, megapixels)
+            row = {
+                "megapixels": megapixels,
+                "upload_mb": round(len(data) / megabyte, 2),
+            }
+            for name, ingest in (
+                ("buffered", ingest_buffered),
+                ("streaming", ingest_streaming),
+            ):
+                peak, decoded = min(
+                    peak_memory(ingest, data, storage) for _ in range(args.repeat)
+                )
+                row["decoded_mb"] = round(decoded / megabyte, 2)
+                row[f"{name}_peak_mb"] = round(peak / megabyte, 2)
+            saved = row["buffered_peak_mb"] - row["streaming_peak_mb"]
+            row["saved_mb"] = round(saved, 2)
+            results.append(row)
+    return {"seed": args.seed, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[2, 8, 12, 24])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    settings.configure()
+    print(json.dumps(run(args), indent=2))